@@ -0,0 +1,187 @@
+import math
+
+import numpy as np
+
+from batch_simulator import DEFAULT_GRAVITY, drag_acceleration
+from trajectory import Trajectory
+
+
+DEFAULT_RTOL = 1e-6
+DEFAULT_ATOL = 1e-6
+MAX_STEPS = 100_000
+
+# Dormand–Prince 5(4) tableau
+_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_B = _A[6]
+_B_LOW = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+_E = tuple(b - bl for b, bl in zip(_B + (0.0,), _B_LOW))
+
+
+class AdaptiveResult(Trajectory):
+    """Trajectory produced by an adaptive run, with step statistics.
+
+    Samples are the accepted step points plus the apex and the ground
+    impact found by interpolation inside the step, so the last sample lies
+    exactly on ``y == 0``.
+    """
+
+    def __init__(self, t, x, y, vx, vy, steps, rejected, evaluations, error_estimate):
+        super().__init__(t, x, y, vx, vy)
+        self.steps = steps
+        self.rejected = rejected
+        self.evaluations = evaluations
+        self.error_estimate = error_estimate
+
+
+class AdaptiveSimulator:
+    """Error-controlled Dormand–Prince integrator for projectile motion.
+
+    Shares the force model of ``BatchSimulator``; instead of a fixed ``dt``
+    the step size is chosen so that the estimated local error stays within
+    ``atol + rtol * |state|``.
+    """
+
+    def __init__(self, gravity=DEFAULT_GRAVITY, air_resistance_coeff=0.0,
+                 rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL):
+        self.gravity = gravity
+        self.air_resistance_coeff = air_resistance_coeff
+        self.rtol = rtol
+        self.atol = atol
+
+    def _derivative(self, state):
+        _, _, vx, vy = state
+        ax, ay = drag_acceleration(vx, vy, self.air_resistance_coeff, self.gravity)
+        return (vx, vy, ax, ay)
+
+    def _step(self, state, k1, h):
+        """One Dormand–Prince step; returns the new state, its derivative and the error vector."""
+        ks = [k1]
+        for i in range(1, 7):
+            stage = tuple(
+                s + h * sum(a * k[j] for a, k in zip(_A[i], ks))
+                for j, s in enumerate(state)
+            )
+            ks.append(self._derivative(stage))
+        # The seventh stage is evaluated at the 5th-order solution (FSAL)
+        new_state = stage
+        error = tuple(h * sum(e * k[j] for e, k in zip(_E, ks)) for j in range(4))
+        return new_state, ks[6], error
+
+    def simulate_projectile_motion_adaptive(self, v0, theta, x0=0.0, y0=0.0,
+                                            max_steps=MAX_STEPS, record=True):
+        """Integrate one launch up to the ground impact.
+
+        With ``record=False`` only the launch, apex and impact samples are
+        kept, so memory does not grow with the number of steps.
+        ``max_steps`` bounds the attempted steps, accepted or rejected.
+        """
+        if y0 < 0:
+            raise ValueError("Initial Y position cannot be negative")
+
+        theta_rad = math.radians(theta)
+        state = (float(x0), float(y0), v0 * math.cos(theta_rad), v0 * math.sin(theta_rad))
+        deriv = self._derivative(state)
+        t = 0.0
+
+        # Initial step: a small fraction of the drag-free flight time scale
+        scale = max(abs(state[3]), math.sqrt(2 * self.gravity * y0), 1e-3) / self.gravity
+        h = 1e-2 * scale
+
+        samples = [(t,) + state]
+        steps = rejected = 0
+        evaluations = 1
+        error_estimate = 0.0
+
+        while steps + rejected < max_steps:
+            new_state, new_deriv, error = self._step(state, deriv, h)
+            evaluations += 6
+            err = max(
+                abs(e) / (self.atol + self.rtol * max(abs(a), abs(b)))
+                for e, a, b in zip(error, state, new_state)
+            )
+
+            # A NaN error estimate is rejected too
+            if not err <= 1.0:
+                rejected += 1
+                h *= max(0.2, 0.9 * err ** -0.2)
+                continue
+
+            steps += 1
+            error_estimate += max(abs(error[0]), abs(error[1]))
+
+            # Apex: vertical velocity changes sign inside the step
+            if state[3] > 0 >= new_state[3]:
+                tau = _find_root(
+                    lambda s: _hermite(state, deriv, new_state, new_deriv, h, s)[3], 0.0, h
+                )
+                samples.append((t + tau,) + _hermite(state, deriv, new_state, new_deriv, h, tau))
+
+            # Ground impact: locate the crossing on the step's cubic interpolant
+            if new_state[1] < 0:
+                tau = _find_root(
+                    lambda s: _hermite(state, deriv, new_state, new_deriv, h, s)[1], 0.0, h
+                )
+                impact = _hermite(state, deriv, new_state, new_deriv, h, tau)
+                samples.append((t + tau, impact[0], 0.0, impact[2], impact[3]))
+                break
+
+            t += h
+            state, deriv = new_state, new_deriv
+            if record:
+                samples.append((t,) + state)
+            h *= min(5.0, 0.9 * err ** -0.2) if err > 0 else 5.0
+
+        columns = np.array(samples, dtype=np.float64).T
+        return AdaptiveResult(
+            *columns,
+            steps=steps,
+            rejected=rejected,
+            evaluations=evaluations,
+            error_estimate=error_estimate,
+        )
+
+
+def _hermite(state0, deriv0, state1, deriv1, h, tau):
+    """Cubic Hermite interpolant of the state at ``tau`` in ``[0, h]``."""
+    s = tau / h
+    h00 = 2 * s ** 3 - 3 * s ** 2 + 1
+    h10 = s ** 3 - 2 * s ** 2 + s
+    h01 = -2 * s ** 3 + 3 * s ** 2
+    h11 = s ** 3 - s ** 2
+    return tuple(
+        h00 * p0 + h10 * h * m0 + h01 * p1 + h11 * h * m1
+        for p0, m0, p1, m1 in zip(state0, deriv0, state1, deriv1)
+    )
+
+
+def _find_root(fn, lo, hi, tol=1e-12, max_iter=100):
+    """Bracketed root of ``fn`` on ``[lo, hi]`` by the Illinois method."""
+    f_lo, f_hi = fn(lo), fn(hi)
+    if f_lo == 0:
+        return lo
+    side = 0
+    for _ in range(max_iter):
+        mid = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        f_mid = fn(mid)
+        if abs(f_mid) < tol or hi - lo < tol:
+            return mid
+        if (f_mid > 0) == (f_lo > 0):
+            lo, f_lo = mid, f_mid
+            if side == -1:
+                f_hi /= 2
+            side = -1
+        else:
+            hi, f_hi = mid, f_mid
+            if side == 1:
+                f_lo /= 2
+            side = 1
+    return mid
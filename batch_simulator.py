@@ -0,0 +1,146 @@
+import numpy as np
+
+from trajectory import Trajectory
+
+
+DEFAULT_GRAVITY = 9.81
+DEFAULT_DT = 0.01
+MAX_STEPS = 1_000_000
+
+
+def drag_acceleration(vx, vy, air_resistance_coeff, gravity):
+    """Acceleration of a point mass under gravity and quadratic drag.
+
+    Works on scalars or NumPy arrays alike, so the scalar and batched
+    steppers share exactly the same force model.
+    """
+    speed = np.sqrt(vx * vx + vy * vy)
+    ax = -air_resistance_coeff * speed * vx
+    ay = -gravity - air_resistance_coeff * speed * vy
+    return ax, ay
+
+
+class BatchResult:
+    """Padded ``(N, T)`` trajectories for a batch of shots.
+
+    Row ``i`` holds ``lengths[i]`` valid samples; the remainder of the row
+    is NaN padding.
+    """
+
+    def __init__(self, x, y, lengths, dt):
+        self.x = x
+        self.y = y
+        self.lengths = lengths
+        self.dt = dt
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @property
+    def time_of_flight(self):
+        # Time of the last recorded sample, as Trajectory.time_of_flight
+        return np.maximum(self.lengths - 1, 0) * self.dt
+
+    def trajectory(self, i):
+        """Return shot ``i`` as a :class:`Trajectory`."""
+        n = self.lengths[i]
+        return Trajectory(np.arange(n) * self.dt, self.x[i, :n], self.y[i, :n])
+
+
+class BatchSimulator:
+    """Steps many projectile launches together with NumPy.
+
+    Uses the same settings as ``KinematicsSimulator`` (``gravity``,
+    ``air_resistance_coeff`` and ``dt``) and the same update rule: record
+    the point while it is above ground, then advance velocity and position
+    by one explicit step.
+    """
+
+    def __init__(self, gravity=DEFAULT_GRAVITY, air_resistance_coeff=0.0, dt=DEFAULT_DT):
+        self.gravity = gravity
+        self.air_resistance_coeff = air_resistance_coeff
+        self.dt = dt
+
+    @classmethod
+    def from_simulator(cls, simulator):
+        return cls(
+            gravity=simulator.gravity,
+            air_resistance_coeff=simulator.air_resistance_coeff,
+            dt=simulator.dt,
+        )
+
+    def simulate_projectile_motion(self, v0, theta, x0, y0):
+        """Single launch as a list of ``(x, y)`` tuples, like ``KinematicsSimulator``."""
+        result = self.simulate_projectile_motion_batch(v0, theta, x0, y0)
+        return list(zip(result.x[0].tolist(), result.y[0].tolist()))
+
+    def simulate_projectile_motion_batch(self, v0, theta, x0=0.0, y0=0.0,
+                                         air_resistance_coeff=None, gravity=None,
+                                         max_steps=MAX_STEPS):
+        if air_resistance_coeff is None:
+            air_resistance_coeff = self.air_resistance_coeff
+        if gravity is None:
+            gravity = self.gravity
+
+        v0, theta, x0, y0, k, g = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(a, dtype=np.float64))
+              for a in (v0, theta, x0, y0, air_resistance_coeff, gravity))
+        )
+        if v0.ndim != 1:
+            raise ValueError("Batch parameters must be scalars or 1-D arrays")
+
+        n = v0.shape[0]
+        dt = self.dt
+        theta_rad = np.radians(theta)
+
+        # Working state of the shots still in flight
+        idx = np.arange(n)
+        x = x0.copy()
+        y = y0.copy()
+        vx = v0 * np.cos(theta_rad)
+        vy = v0 * np.sin(theta_rad)
+        k = k.copy()
+        g = g.copy()
+
+        lengths = np.zeros(n, dtype=np.int64)
+        capacity = 256
+        xs = np.full((n, capacity), np.nan)
+        ys = np.full((n, capacity), np.nan)
+
+        # Shots launched below ground record nothing, as in the scalar loop
+        alive = y >= 0
+        step = 0
+        while alive.any() and step < max_steps:
+            if not alive.all():
+                idx, x, y, vx, vy, k, g = (
+                    a[alive] for a in (idx, x, y, vx, vy, k, g)
+                )
+
+            if step == capacity:
+                capacity *= 2
+                xs = _grow(xs, capacity)
+                ys = _grow(ys, capacity)
+
+            xs[idx, step] = x
+            ys[idx, step] = y
+            lengths[idx] += 1
+
+            ax, ay = drag_acceleration(vx, vy, k, g)
+            vx = vx + ax * dt
+            vy = vy + ay * dt
+            x = x + vx * dt
+            y = y + vy * dt
+
+            alive = y >= 0
+            step += 1
+
+        t = int(lengths.max()) if n else 0
+        return BatchResult(
+            np.ascontiguousarray(xs[:, :t]), np.ascontiguousarray(ys[:, :t]), lengths, dt
+        )
+
+
+def _grow(arr, capacity):
+    grown = np.full((arr.shape[0], capacity), np.nan)
+    grown[:, :arr.shape[1]] = arr
+    return grown
@@ -0,0 +1,288 @@
+"""Headless performance benchmarks.
+
+    python benchmarks.py --output bench.json
+    python benchmarks.py --baseline bench.json --threshold 0.15
+
+Measures simulator throughput, plotting and animation cost on an
+off-screen Agg canvas, save/load throughput, CSV export throughput and
+flights over a large terrain profile.
+Results are written as JSON; with ``--baseline`` every metric is compared
+against a previous results file, and the exit status is 1 if any metric
+got worse by more than the threshold (a fraction, default 10%).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from closed_form import DragFreeSolution
+from export import export_trajectories
+from kinematics_core import compute_trajectory, default_simulator, make_params
+import storage
+from terrain import Terrain, simulate_over_terrain
+
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 5
+SIMULATE_DTS = (0.01, 0.001)
+SIMULATE_DRAGS = (0.0, 0.05)
+TERRAIN_SAMPLES = 200_000
+
+
+def best_time(fn, repeat=DEFAULT_REPEAT):
+    """Fastest of ``repeat`` timed calls of ``fn``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def metric(value, unit, higher_is_better=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def sample_trajectory(points):
+    """A drag-free trajectory with ``points`` samples and velocities, for I/O benchmarks."""
+    return DragFreeSolution(50.0, 45.0).trajectory(num_points=points)
+
+
+def bench_simulate(repeat, quick=False):
+    """Steps per second of ``simulate_projectile_motion`` across ``dt`` and drag."""
+    simulator = default_simulator()
+    results = {}
+    for dt in SIMULATE_DTS[:1] if quick else SIMULATE_DTS:
+        for drag in SIMULATE_DRAGS:
+            simulator.dt = dt
+            simulator.air_resistance_coeff = drag
+            steps = len(simulator.simulate_projectile_motion(20.0, 45.0, 0.0, 0.0))
+            elapsed = best_time(lambda: simulator.simulate_projectile_motion(20.0, 45.0, 0.0, 0.0), repeat)
+            results[f"simulate[dt={dt:g},drag={drag:g}]"] = metric(steps / elapsed, "steps/s")
+    return results
+
+
+def agg_plot_view():
+    """The plotting half of ``KinematicsUI`` on an off-screen Agg figure.
+
+    Raises ``ImportError`` when the UI module cannot be imported.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from main import KinematicsUI
+
+    methods = ("plot_trajectory", "lod_indices", "lod_budget", "refresh_trajectory_lod",
+               "on_view_changed", "update_animation")
+    view_class = type("AggPlotView", (), {name: getattr(KinematicsUI, name) for name in methods})
+    view = view_class()
+    view.fig = Figure(figsize=(6, 5), dpi=100)
+    view.canvas = FigureCanvasAgg(view.fig)
+    view.ax = view.fig.add_subplot()
+    view.line, = view.ax.plot([], [], 'b-', linewidth=2)
+    view.point, = view.ax.plot([], [], 'ro', markersize=8)
+    view.terrain = None
+    view.terrain_line = None
+    return view
+
+
+def bench_rendering(repeat, quick=False):
+    """Cost of ``plot_trajectory`` and of one blitted ``update_animation`` frame."""
+    view = agg_plot_view()
+    params = make_params(air_resistance=0.02, dt=0.001)
+    trajectory = compute_trajectory(params, default_simulator())
+    view.current_simulation = {'trajectory': trajectory, 'params': params}
+
+    plot = best_time(lambda: view.plot_trajectory(trajectory), repeat)
+
+    # Blitted frames redraw only the animated artists, as FuncAnimation does
+    renderer = view.canvas.get_renderer()
+    frames = np.linspace(0, len(trajectory) - 1, 50 if quick else 200).astype(int)
+
+    def animate():
+        for frame in frames:
+            for artist in view.update_animation(frame):
+                artist.draw(renderer)
+
+    frame = best_time(animate, repeat) / len(frames)
+    return {
+        "plot_trajectory": metric(plot * 1e3, "ms", higher_is_better=False),
+        "update_animation": metric(frame * 1e3, "ms/frame", higher_is_better=False),
+    }
+
+
+def bench_storage(repeat, quick=False):
+    """Save and load throughput of the JSON and binary simulation formats."""
+    points = 20_000 if quick else 200_000
+    simulation = {'params': make_params(), 'trajectory': sample_trajectory(points)}
+    tmp_dir = tempfile.mkdtemp()
+    results = {}
+    try:
+        for fmt, extension in (("json", storage.JSON_EXTENSION), ("ksim", storage.BINARY_EXTENSION)):
+            path = os.path.join(tmp_dir, "simulation" + extension)
+            save = best_time(lambda: storage.save_simulation(path, simulation), repeat)
+            size = os.path.getsize(path)
+
+            def load():
+                # Touch every column so memory-mapped loads are really read
+                trajectory = storage.load_simulation(path)['trajectory']
+                return float(trajectory.x.sum() + trajectory.y.sum() + trajectory.t.sum())
+
+            load_time = best_time(load, repeat)
+            results[f"save[{fmt}]"] = metric(points / save, "points/s")
+            results[f"load[{fmt}]"] = metric(points / load_time, "points/s")
+            results[f"size[{fmt}]"] = metric(size / points, "bytes/point", higher_is_better=False)
+    finally:
+        shutil.rmtree(tmp_dir)
+    return results
+
+
+def bench_export(repeat, quick=False):
+    """CSV (plain and gzip) export throughput in rows per second."""
+    points = 20_000 if quick else 200_000
+    trajectory = sample_trajectory(points)
+    tmp_dir = tempfile.mkdtemp()
+    results = {}
+    try:
+        for name in ("export.csv", "export.csv.gz"):
+            path = os.path.join(tmp_dir, name)
+            elapsed = best_time(lambda: export_trajectories(path, [(0, trajectory)], run_ids=False), repeat)
+            results[f"export[{name.split('.', 1)[1]}]"] = metric(points / elapsed, "rows/s")
+    finally:
+        shutil.rmtree(tmp_dir)
+    return results
+
+
+def sample_terrain(samples):
+    """Rolling hills with fine-grained noise, ``samples`` heights over 2 km."""
+    rng = np.random.default_rng(0)
+    x = np.linspace(-100.0, 1900.0, samples)
+    heights = 15 * np.sin(x / 60) + 4 * np.sin(x / 7) + rng.normal(0, 0.05, samples)
+    return Terrain(x, heights)
+
+
+def bench_terrain(repeat, quick=False):
+    """Flights over a large profile (steps/s) and single-step impact queries per second."""
+    terrain = sample_terrain(TERRAIN_SAMPLES // 10 if quick else TERRAIN_SAMPLES)
+    results = {}
+    for drag in SIMULATE_DRAGS:
+        params = make_params(v0=60.0, theta=40.0, y0=30.0, air_resistance=drag, dt=0.001)
+        steps = len(simulate_over_terrain(params, terrain)[0])
+        elapsed = best_time(lambda: simulate_over_terrain(params, terrain), repeat)
+        results[f"terrain_flight[drag={drag:g}]"] = metric(steps / elapsed, "steps/s")
+
+    # Short steps just above and just into the ground, spread over the profile
+    rng = np.random.default_rng(1)
+    x0 = rng.uniform(terrain.x[0], terrain.x[-1], 1000 if quick else 10_000)
+    y0 = terrain.height(x0) + 1.0
+    x1, y1 = x0 + 0.5, y0 - rng.uniform(0.0, 2.0, len(x0))
+    queries = list(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()))
+
+    def query():
+        for step in queries:
+            terrain.first_impact(*step)
+
+    elapsed = best_time(query, repeat)
+    results["terrain_first_impact"] = metric(len(queries) / elapsed, "queries/s")
+    return results
+
+
+BENCHMARKS = {
+    "simulate": bench_simulate,
+    "rendering": bench_rendering,
+    "storage": bench_storage,
+    "export": bench_export,
+    "terrain": bench_terrain,
+}
+
+
+def run_benchmarks(names=None, repeat=DEFAULT_REPEAT, quick=False):
+    """Run the selected benchmark groups; returns the results document."""
+    results = {}
+    skipped = {}
+    for name in names or BENCHMARKS:
+        try:
+            results.update(BENCHMARKS[name](repeat, quick))
+        except ImportError as e:
+            skipped[name] = str(e)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "quick": quick,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare two results documents metric by metric.
+
+    Returns ``(name, change, regressed)`` tuples for the metrics present in
+    both; ``change`` is the relative improvement (negative when worse).
+    """
+    rows = []
+    for name, current in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = current["value"] / previous["value"] - 1
+        if not current["higher_is_better"]:
+            change = previous["value"] / current["value"] - 1 if current["value"] else float("inf")
+        rows.append((name, change, change < -threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless performance benchmarks")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against this results file")
+    parser.add_argument(
+        "-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"allowed slowdown as a fraction (default {DEFAULT_THRESHOLD})"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="timed runs per metric; the best is kept")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs for a fast check")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"groups to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    results = run_benchmarks(args.benchmarks, args.repeat, args.quick)
+    for name, reason in results["meta"]["skipped"].items():
+        print(f"skipped {name}: {reason}", file=sys.stderr)
+    for name, result in results["results"].items():
+        print(f"{name:32} {result['value']:14.6g} {result['unit']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+        for name, change, regressed in rows:
+            print(f"{name:32} {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+        if any(regressed for _, _, regressed in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
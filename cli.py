@@ -0,0 +1,151 @@
+"""Run simulations without the GUI.
+
+    python cli.py runs.json --summary summary.csv --trajectories runs.kcol
+
+Parameter sets are read from JSON (a list of objects, a single object or
+``{"runs": [...]}``) or CSV (one row per run) using the keys of
+``kinematics_core.DEFAULT_PARAMS``; missing keys take the command-line or
+built-in defaults. Only the headless core is imported, never tkinter or
+matplotlib.
+"""
+import argparse
+import csv
+import json
+import sys
+
+from export import export_trajectories
+from kinematics_core import (
+    ADAPTIVE, DEFAULT_PARAMS, FIXED_STEP, compute_summary, compute_trajectory,
+    default_simulator, make_params, summarize
+)
+from terrain import Terrain, read_profile
+
+
+INTEGRATOR_ALIASES = {"fixed": FIXED_STEP, "adaptive": ADAPTIVE}
+
+
+def read_param_sets(path):
+    """Return a list of parameter dicts from a JSON or CSV file."""
+    with open(path, newline='') as f:
+        if path.lower().endswith(".csv"):
+            return [
+                {key: value for key, value in row.items() if value not in (None, "")}
+                for row in csv.DictReader(f)
+            ]
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("runs", [data])
+    return data
+
+
+def run_param_sets(param_sets, defaults=None, simulator=None, summary_only=False,
+                   terrain=None):
+    """Yield ``(run_id, params, trajectory, summary)`` for each parameter set.
+
+    With ``summary_only`` no trajectory is stored (it is yielded as ``None``)
+    and the summary comes from ``compute_summary``. With ``terrain`` every
+    launch flies over it (``summary_only`` is not supported then).
+    """
+    if summary_only and terrain is not None:
+        raise ValueError("Summary-only runs cannot use terrain")
+    if simulator is None:
+        simulator = default_simulator()
+    for run_id, values in enumerate(param_sets):
+        values = {**(defaults or {}), **values}
+        if 'integrator' in values:
+            values['integrator'] = INTEGRATOR_ALIASES.get(values['integrator'], values['integrator'])
+        try:
+            params = make_params(terrain, **values)
+        except ValueError as e:
+            raise ValueError(f"run {run_id}: {e}") from None
+        if summary_only:
+            yield run_id, params, None, compute_summary(params)
+            continue
+        trajectory = compute_trajectory(params, simulator, terrain)
+        yield run_id, params, trajectory, summarize(params, trajectory, terrain)
+
+
+def write_summaries(f, summaries, as_json=False):
+    if as_json:
+        json.dump(summaries, f, indent=4)
+        f.write("\n")
+        return
+    fields = list(dict.fromkeys(key for summary in summaries for key in summary))
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(summaries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless projectile motion batch runner")
+    parser.add_argument("input", help="JSON or CSV file of parameter sets")
+    parser.add_argument(
+        "-s", "--summary",
+        help="write per-run summaries here (.json or .csv; default: CSV on stdout)"
+    )
+    parser.add_argument(
+        "-t", "--trajectories",
+        help="write all trajectories here (.csv, .csv.gz, .kcol or .kcol.gz)"
+    )
+    parser.add_argument(
+        "--summary-only", action="store_true",
+        help="keep no trajectories; adds apex time, interpolated landing and impact velocity"
+    )
+    parser.add_argument("--integrator", choices=sorted(INTEGRATOR_ALIASES), help="default integrator")
+    parser.add_argument("--dt", type=float, help=f"default time step (default {DEFAULT_PARAMS['dt']})")
+    parser.add_argument("--tolerance", type=float, help="default adaptive tolerance")
+    parser.add_argument(
+        "--terrain",
+        help="ground profile: .npy or CSV of heights (a heightmap) or of x, height pairs"
+    )
+    parser.add_argument("--terrain-spacing", type=float, default=1.0,
+                        help="sample spacing of a heightmap in metres (default 1)")
+    args = parser.parse_args(argv)
+    if args.summary_only and args.trajectories:
+        parser.error("--summary-only cannot be combined with --trajectories")
+    if args.summary_only and args.terrain:
+        parser.error("--summary-only cannot be combined with --terrain")
+
+    defaults = {
+        key: value for key, value in
+        (("integrator", args.integrator), ("dt", args.dt), ("tolerance", args.tolerance))
+        if value is not None
+    }
+
+    try:
+        terrain = None
+        if args.terrain:
+            x, heights = read_profile(args.terrain)
+            if x is None:
+                terrain = Terrain.from_heightmap(heights, args.terrain_spacing)
+            else:
+                terrain = Terrain(x, heights)
+        param_sets = read_param_sets(args.input)
+        summaries = []
+
+        def runs():
+            for run_id, params, trajectory, summary in run_param_sets(
+                param_sets, defaults, summary_only=args.summary_only, terrain=terrain
+            ):
+                summaries.append({'run_id': run_id, **params, **summary})
+                yield run_id, trajectory
+
+        if args.trajectories:
+            export_trajectories(args.trajectories, runs())
+        else:
+            for _ in runs():
+                pass
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if args.summary:
+        with open(args.summary, "w", newline='') as f:
+            write_summaries(f, summaries, as_json=args.summary.lower().endswith(".json"))
+    else:
+        write_summaries(sys.stdout, summaries)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
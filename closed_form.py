@@ -0,0 +1,78 @@
+import numpy as np
+
+from batch_simulator import DEFAULT_GRAVITY
+from trajectory import Trajectory
+
+
+class DragFreeSolution:
+    """Exact projectile motion when ``air_resistance_coeff == 0``.
+
+    Apex, range and time of flight are evaluated directly, in O(1), for
+    scalar or array launch parameters. Trajectory samples are only produced
+    on request via :meth:`sample`.
+    """
+
+    def __init__(self, v0, theta, x0=0.0, y0=0.0, gravity=DEFAULT_GRAVITY):
+        theta_rad = np.radians(theta)
+        self.x0 = x0
+        self.y0 = y0
+        self.gravity = gravity
+        self.vx = v0 * np.cos(theta_rad)
+        self.vy = v0 * np.sin(theta_rad)
+
+    def position(self, t):
+        return (
+            self.x0 + self.vx * t,
+            self.y0 + self.vy * t - 0.5 * self.gravity * t * t,
+        )
+
+    @property
+    def apex_time(self):
+        return np.maximum(self.vy, 0.0) / self.gravity
+
+    @property
+    def max_height(self):
+        return self.position(self.apex_time)[1]
+
+    @property
+    def apex(self):
+        return self.position(self.apex_time)
+
+    @property
+    def time_of_flight(self):
+        # Positive root of y0 + vy*t - g*t²/2 = 0
+        return (self.vy + np.sqrt(self.vy * self.vy + 2 * self.gravity * self.y0)) / self.gravity
+
+    @property
+    def range(self):
+        return self.vx * self.time_of_flight
+
+    @property
+    def landing(self):
+        return self.x0 + self.range, 0.0
+
+    def sample(self, dt=None, num_points=None):
+        """Return ``(t, x, y)`` arrays for a single launch.
+
+        With ``dt`` the samples sit on the fixed-step grid ``i * dt`` while
+        the projectile is above ground, like the stepping simulator. With
+        ``num_points`` they are spread evenly from launch to impact,
+        including the exact landing point.
+        """
+        if (dt is None) == (num_points is None):
+            raise ValueError("Specify exactly one of dt or num_points")
+        flight = float(self.time_of_flight)
+        if dt is not None:
+            t = np.arange(int(flight // dt) + 1) * dt
+        else:
+            t = np.linspace(0.0, flight, max(int(num_points), 2))
+        x, y = self.position(t)
+        if num_points is not None:
+            y[-1] = 0.0
+        return t, x, y
+
+    def trajectory(self, dt=None, num_points=None):
+        """Return samples, with exact velocities, as a :class:`Trajectory`."""
+        t, x, y = self.sample(dt=dt, num_points=num_points)
+        vy = self.vy - self.gravity * t
+        return Trajectory(t, x, y, np.full_like(t, self.vx), vy)
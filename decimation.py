@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def minmax_indices(y, max_points, keep=()):
+    """Pick at most ``max_points`` sample indices that preserve the curve's shape.
+
+    Samples are split into equal buckets along the index axis and the
+    lowest and highest ``y`` of each bucket are kept, so peaks never get
+    averaged away. The first and last samples, and any indices in
+    ``keep`` (e.g. the apex), are always included. Returns sorted indices.
+    """
+    n = len(y)
+    keep = np.asarray(keep, dtype=np.intp)
+    if n <= max_points:
+        return np.arange(n)
+
+    buckets = max((max_points - 2 - len(keep)) // 2, 1)
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+
+    # Trailing buckets may be partly or even entirely padding; skip the
+    # all-padding ones, which nanargmin/nanargmax would reject
+    offsets = np.arange(buckets) * size
+    valid = offsets < n
+    lows = np.nanargmin(padded[valid], axis=1) + offsets[valid]
+    highs = np.nanargmax(padded[valid], axis=1) + offsets[valid]
+
+    return np.unique(np.concatenate(([0, n - 1], keep, lows, highs)))
+
+
+def visible_range(x, lo, hi):
+    """Return the ``(start, stop)`` slice of samples inside ``[lo, hi]``.
+
+    One sample on either side is included so the line runs to the edge of
+    the view. Works for non-monotonic ``x`` by spanning the first to last
+    visible sample.
+    """
+    inside = np.flatnonzero((x >= lo) & (x <= hi))
+    if len(inside) == 0:
+        return 0, 0
+    return max(inside[0] - 1, 0), min(inside[-1] + 2, len(x))
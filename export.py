@@ -0,0 +1,143 @@
+import gzip
+import struct
+
+import numpy as np
+
+from instrumentation import INSTRUMENTATION
+
+
+DEFAULT_CHUNK_ROWS = 65536
+CSV_COLUMNS = ["Time (s)", "X-Position (m)", "Y-Position (m)"]
+RUN_ID_COLUMN = "Run ID"
+COLUMNAR_EXTENSION = ".kcol"
+COLUMNAR_MAGIC = b"KINCOL\x00\x01"
+
+
+class StreamingExporter:
+    """Write one or many trajectories to a single file in large chunks.
+
+    Rows are buffered as NumPy columns and flushed every ``chunk_rows``
+    rows, so memory stays bounded however many runs are written. CSV
+    chunks are formatted with one ``%`` operation per chunk rather than a
+    ``writerow`` call per point. With ``binary=True`` the output is a
+    columnar file of row groups (see :func:`read_columnar`). ``compress``
+    gzips either format.
+    """
+
+    def __init__(self, path, binary=False, compress=False, run_ids=True,
+                 chunk_rows=DEFAULT_CHUNK_ROWS, fmt="%.17g"):
+        self.binary = binary
+        self.run_ids = run_ids
+        self.chunk_rows = chunk_rows
+        self.fmt = fmt
+        self.rows_written = 0
+        self._pending = []
+        self._pending_rows = 0
+
+        if compress:
+            self._file = gzip.open(path, "wb" if binary else "wt", compresslevel=6)
+        elif binary:
+            self._file = open(path, "wb")
+        else:
+            self._file = open(path, "w", newline="")
+
+        if binary:
+            self._file.write(COLUMNAR_MAGIC)
+        else:
+            header = ([RUN_ID_COLUMN] if run_ids else []) + CSV_COLUMNS
+            self._file.write(",".join(header) + "\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, trajectory, run_id=0):
+        """Queue every sample of ``trajectory`` under ``run_id``."""
+        n = len(trajectory)
+        for start in range(0, n, self.chunk_rows):
+            stop = min(start + self.chunk_rows, n)
+            self._pending.append((
+                np.full(stop - start, run_id, dtype=np.int64),
+                trajectory.t[start:stop],
+                trajectory.x[start:stop],
+                trajectory.y[start:stop],
+            ))
+            self._pending_rows += stop - start
+            if self._pending_rows >= self.chunk_rows:
+                self.flush()
+
+    def write_batch(self, batch, run_ids=None):
+        """Write every shot of a ``BatchResult``; run ids default to the shot index."""
+        for i in range(len(batch)):
+            self.write(batch.trajectory(i), i if run_ids is None else run_ids[i])
+
+    def flush(self):
+        if not self._pending:
+            return
+        run_id, t, x, y = (np.concatenate(column) for column in zip(*self._pending))
+        if self.binary:
+            self._file.write(struct.pack("<Q", len(t)))
+            self._file.write(run_id.astype("<i8").tobytes())
+            for column in (t, x, y):
+                self._file.write(column.astype("<f8").tobytes())
+        else:
+            self._write_csv_block(run_id, t, x, y)
+        self.rows_written += len(t)
+        self._pending = []
+        self._pending_rows = 0
+
+    def _write_csv_block(self, run_id, t, x, y):
+        columns = [t, x, y]
+        row_fmt = ",".join([self.fmt] * 3) + "\n"
+        if self.run_ids:
+            columns.insert(0, run_id)
+            row_fmt = "%d," + row_fmt
+        # Interleave the columns into one flat tuple and format the whole block at once
+        values = np.column_stack(columns).ravel().tolist()
+        self._file.write((row_fmt * len(t)) % tuple(values))
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+def export_trajectories(path, runs, **kwargs):
+    """Export ``(run_id, trajectory)`` pairs to ``path`` in one pass.
+
+    The format follows the extension: ``.kcol`` for columnar binary,
+    anything else for CSV, with a trailing ``.gz`` enabling compression.
+    Returns the number of rows written.
+    """
+    kwargs.setdefault("compress", path.endswith(".gz"))
+    kwargs.setdefault(
+        "binary", path.endswith((COLUMNAR_EXTENSION, COLUMNAR_EXTENSION + ".gz"))
+    )
+    with INSTRUMENTATION.span("export"), StreamingExporter(path, **kwargs) as exporter:
+        for run_id, trajectory in runs:
+            exporter.write(trajectory, run_id)
+    INSTRUMENTATION.count("rows_exported", exporter.rows_written)
+    return exporter.rows_written
+
+
+def read_columnar(path):
+    """Read a columnar export back into ``run_id``/``t``/``x``/``y`` arrays."""
+    opener = gzip.open if path.endswith(".gz") else open
+    blocks = []
+    with opener(path, "rb") as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"{path} is not a columnar export")
+        while True:
+            size = f.read(8)
+            if not size:
+                break
+            (n,) = struct.unpack("<Q", size)
+            run_id = np.frombuffer(f.read(8 * n), dtype="<i8")
+            t, x, y = (np.frombuffer(f.read(8 * n), dtype="<f8") for _ in range(3))
+            blocks.append((run_id, t, x, y))
+    if not blocks:
+        return {name: np.empty(0) for name in ("run_id", "t", "x", "y")}
+    return dict(zip(("run_id", "t", "x", "y"), (np.concatenate(c) for c in zip(*blocks))))
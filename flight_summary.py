@@ -0,0 +1,218 @@
+"""Flight summaries computed during integration, without storing a trajectory.
+
+Each function returns a :class:`FlightSummary` using a constant amount of
+memory, however small ``dt`` or long the flight: apex time and height,
+landing time and position interpolated to the ground, and the impact
+velocity. :func:`fixed_step_summary_batch` does the same for arrays of
+launches at once.
+"""
+import math
+
+import numpy as np
+
+from adaptive_integrator import AdaptiveSimulator
+from batch_simulator import DEFAULT_DT, DEFAULT_GRAVITY, MAX_STEPS
+from closed_form import DragFreeSolution
+
+
+class FlightSummary:
+    """Key points of one flight, or of many when the attributes are arrays.
+
+    ``impact_angle`` is in degrees below the horizontal.
+    """
+
+    def __init__(self, x0, apex_time, apex_x, max_height, landing_time, landing_x,
+                 impact_vx, impact_vy):
+        self.x0 = x0
+        self.apex_time = apex_time
+        self.apex_x = apex_x
+        self.max_height = max_height
+        self.landing_time = landing_time
+        self.landing_x = landing_x
+        self.impact_vx = impact_vx
+        self.impact_vy = impact_vy
+
+    @property
+    def range(self):
+        return self.landing_x - self.x0
+
+    @property
+    def time_of_flight(self):
+        return self.landing_time
+
+    @property
+    def impact_speed(self):
+        return np.hypot(self.impact_vx, self.impact_vy)
+
+    @property
+    def impact_angle(self):
+        return np.degrees(np.arctan2(-self.impact_vy, self.impact_vx))
+
+    def to_dict(self):
+        return {
+            'max_height': self.max_height,
+            'range': self.range,
+            'time_of_flight': self.time_of_flight,
+            'apex_time': self.apex_time,
+            'apex_x': self.apex_x,
+            'landing_x': self.landing_x,
+            'impact_speed': self.impact_speed,
+            'impact_angle': self.impact_angle,
+        }
+
+
+def closed_form_summary(v0, theta, x0=0.0, y0=0.0, gravity=DEFAULT_GRAVITY):
+    """Exact summary of a drag-free flight (scalar or array launch parameters)."""
+    solution = DragFreeSolution(v0, theta, x0, y0, gravity)
+    apex_x, max_height = solution.apex
+    flight = solution.time_of_flight
+    return FlightSummary(
+        x0, solution.apex_time, apex_x, max_height,
+        flight, solution.landing[0], solution.vx, solution.vy - gravity * flight
+    )
+
+
+def fixed_step_summary(v0, theta, x0=0.0, y0=0.0, air_resistance_coeff=0.0,
+                       gravity=DEFAULT_GRAVITY, dt=DEFAULT_DT, max_steps=MAX_STEPS):
+    """Summary of a fixed-step flight, stepped exactly like ``BatchSimulator``.
+
+    The apex is refined with a parabola through the highest sample and its
+    neighbours; landing is interpolated linearly between the last sample
+    above ground and the first step below it, whose velocity is the impact
+    velocity.
+    """
+    if y0 < 0:
+        raise ValueError("Initial Y position cannot be negative")
+    theta_rad = math.radians(theta)
+    k, g = air_resistance_coeff, gravity
+    x, y = float(x0), float(y0)
+    vx, vy = v0 * math.cos(theta_rad), v0 * math.sin(theta_rad)
+
+    # Highest sample so far and the states either side of it
+    apex_step, apex = 0, (x, y)
+    before = after = None
+    prev = None
+    step = 0
+    while step < max_steps:
+        speed = math.sqrt(vx * vx + vy * vy)
+        vx = vx - k * speed * vx * dt
+        vy = vy + (-g - k * speed * vy) * dt
+        x_new = x + vx * dt
+        y_new = y + vy * dt
+        if apex_step == step:
+            after = (x_new, y_new)
+        if y_new < 0:
+            frac = y / (y - y_new)
+            landing_time = (step + frac) * dt
+            landing_x = x + frac * (x_new - x)
+            break
+        prev = (x, y)
+        x, y = x_new, y_new
+        step += 1
+        if y > apex[1]:
+            apex_step, apex, before = step, (x, y), prev
+    else:
+        # Cut off by max_steps: report the last state
+        landing_time, landing_x = step * dt, x
+
+    apex_time, (apex_x, max_height) = apex_step * dt, apex
+    if before is not None and after is not None:
+        curvature = before[1] - 2 * apex[1] + after[1]
+        if curvature < 0:
+            s = 0.5 * (before[1] - after[1]) / curvature
+            apex_time += s * dt
+            apex_x += s * (after[0] - before[0]) / 2
+            max_height -= 0.25 * (before[1] - after[1]) * s
+    return FlightSummary(float(x0), apex_time, apex_x, max_height, landing_time, landing_x, vx, vy)
+
+
+def adaptive_summary(v0, theta, x0=0.0, y0=0.0, air_resistance_coeff=0.0,
+                     gravity=DEFAULT_GRAVITY, tolerance=1e-6):
+    """Summary of an adaptive (Dormand–Prince) flight.
+
+    Returns the summary and the ``AdaptiveResult`` holding only the launch,
+    apex and impact samples, for its step statistics.
+    """
+    result = AdaptiveSimulator(
+        gravity=gravity, air_resistance_coeff=air_resistance_coeff,
+        rtol=tolerance, atol=tolerance
+    ).simulate_projectile_motion_adaptive(v0, theta, x0, y0, record=False)
+    apex = result.apex_index
+    summary = FlightSummary(
+        float(x0), float(result.t[apex]), float(result.x[apex]), result.max_height,
+        float(result.t[-1]), float(result.x[-1]), float(result.vx[-1]), float(result.vy[-1])
+    )
+    return summary, result
+
+
+def fixed_step_summary_batch(v0, theta, x0=0.0, y0=0.0, air_resistance_coeff=0.0,
+                             gravity=DEFAULT_GRAVITY, dt=DEFAULT_DT, max_steps=MAX_STEPS):
+    """Vectorized :func:`fixed_step_summary` over broadcast launch parameters.
+
+    Landed shots are dropped from the working set, so each step only
+    touches the shots still in flight.
+    """
+    v0, theta, x0, y0, k = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(a, dtype=np.float64))
+          for a in (v0, theta, x0, y0, air_resistance_coeff))
+    )
+    if (y0 < 0).any():
+        raise ValueError("Initial Y position cannot be negative")
+    n = len(v0)
+    theta_rad = np.radians(theta)
+    idx = np.arange(n)
+    x, y, k = x0.copy(), y0.copy(), k.copy()
+    vx, vy = v0 * np.cos(theta_rad), v0 * np.sin(theta_rad)
+
+    apex_step = np.zeros(n, dtype=np.int64)
+    apex_x, apex_y = x.copy(), y.copy()
+    before_x, before_y = np.full(n, np.nan), np.full(n, np.nan)
+    after_x, after_y = np.full(n, np.nan), np.full(n, np.nan)
+    landing_time, landing_x = np.zeros(n), x.copy()
+    impact_vx, impact_vy = vx.copy(), vy.copy()
+
+    step = 0
+    while len(idx) and step < max_steps:
+        speed = np.sqrt(vx * vx + vy * vy)
+        vx = vx - k * speed * vx * dt
+        vy = vy + (-gravity - k * speed * vy) * dt
+        x_new = x + vx * dt
+        y_new = y + vy * dt
+        at_apex = apex_step[idx] == step
+        after_x[idx[at_apex]] = x_new[at_apex]
+        after_y[idx[at_apex]] = y_new[at_apex]
+
+        landed = y_new < 0
+        if landed.any():
+            done = idx[landed]
+            frac = y[landed] / (y[landed] - y_new[landed])
+            landing_time[done] = (step + frac) * dt
+            landing_x[done] = x[landed] + frac * (x_new[landed] - x[landed])
+            impact_vx[done], impact_vy[done] = vx[landed], vy[landed]
+            alive = ~landed
+            idx, x, y, x_new, y_new, vx, vy, k = (
+                a[alive] for a in (idx, x, y, x_new, y_new, vx, vy, k)
+            )
+        prev_x, prev_y = x, y
+        x, y = x_new, y_new
+        step += 1
+        higher = y > apex_y[idx]
+        rows = idx[higher]
+        apex_step[rows] = step
+        apex_x[rows], apex_y[rows] = x[higher], y[higher]
+        before_x[rows], before_y[rows] = prev_x[higher], prev_y[higher]
+
+    # Cut off by max_steps: report the last state
+    landing_time[idx], landing_x[idx] = step * dt, x
+    impact_vx[idx], impact_vy[idx] = vx, vy
+
+    apex_time = apex_step * dt
+    max_height = apex_y.copy()
+    curvature = before_y - 2 * apex_y + after_y
+    refine = np.flatnonzero(curvature < 0)
+    s = 0.5 * (before_y[refine] - after_y[refine]) / curvature[refine]
+    apex_time[refine] += s * dt
+    apex_x[refine] += s * (after_x[refine] - before_x[refine]) / 2
+    max_height[refine] -= 0.25 * (before_y[refine] - after_y[refine]) * s
+    return FlightSummary(x0, apex_time, apex_x, max_height, landing_time, landing_x,
+                         impact_vx, impact_vy)
@@ -0,0 +1,179 @@
+"""Lightweight timing spans and counters for the hot paths.
+
+    with INSTRUMENTATION.span("integrate"):
+        ...
+    INSTRUMENTATION.count("points", len(trajectory))
+
+Collection is off by default; a disabled :meth:`Instrumentation.span`
+returns a shared no-op context manager, so instrumented code pays one
+attribute check per call. When enabled, each span adds its duration to
+per-name totals. ``begin_run``/``end_run`` delimit a user-visible
+operation and return its timings, optionally appended as one JSON line
+to a log file. A background thread working for a run binds to it with
+``bind_run``, so once that run is discarded or replaced, whatever the
+thread still records stays out of the newer run.
+"""
+import contextlib
+import json
+import threading
+import time
+from datetime import datetime
+
+
+_NULL_SPAN = contextlib.nullcontext()
+# Marks a thread not bound to any run
+_UNBOUND = object()
+
+
+class _Span:
+    __slots__ = ("owner", "name", "start")
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.owner.record(self.name, time.perf_counter() - self.start)
+
+
+class Instrumentation:
+    """Collects span timings and counters, in total and per run."""
+
+    def __init__(self, enabled=False, log_path=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._counters = {}
+        self._run = None
+        self._local = threading.local()
+
+    def span(self, name):
+        """Context manager timing the enclosed block under ``name``."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def _current_run(self):
+        """The run this thread's records count towards, if it is still the current one."""
+        bound = getattr(self._local, "run", _UNBOUND)
+        if bound is not _UNBOUND and bound is not self._run:
+            return None
+        return self._run
+
+    @contextlib.contextmanager
+    def bind_run(self, run):
+        """Count this thread's records towards ``run`` (from :meth:`begin_run`) only."""
+        previous = getattr(self._local, "run", _UNBOUND)
+        self._local.run = run
+        try:
+            yield
+        finally:
+            self._local.run = previous
+
+    def record(self, name, seconds):
+        with self._lock:
+            run = self._current_run()
+            targets = [self._totals] + ([run["spans"]] if run else [])
+            for spans in targets:
+                stats = spans.get(name)
+                if stats is None:
+                    spans[name] = [1, seconds, seconds]
+                else:
+                    stats[0] += 1
+                    stats[1] += seconds
+                    stats[2] = max(stats[2], seconds)
+
+    def count(self, name, n=1):
+        """Add ``n`` to the counter ``name``."""
+        if not self.enabled:
+            return
+        with self._lock:
+            run = self._current_run()
+            targets = [self._counters] + ([run["counters"]] if run else [])
+            for counters in targets:
+                counters[name] = counters.get(name, 0) + n
+
+    def begin_run(self, label):
+        """Start collecting a per-run record, replacing any unfinished one.
+
+        Returns the run, for :meth:`bind_run`, or ``None`` when disabled.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._run = {
+                "label": label,
+                "started": datetime.now().isoformat(timespec="milliseconds"),
+                "start": time.perf_counter(),
+                "spans": {},
+                "counters": {},
+            }
+            return self._run
+
+    def discard_run(self):
+        """Drop the current run without recording it (e.g. its job was cancelled)."""
+        with self._lock:
+            self._run = None
+
+    def end_run(self):
+        """Finish the current run; returns its record (and logs it) or ``None``."""
+        with self._lock:
+            run, self._run = self._run, None
+        if run is None:
+            return None
+        record = {
+            "label": run["label"],
+            "started": run["started"],
+            "wall_ms": (time.perf_counter() - run["start"]) * 1e3,
+            "spans": _format_spans(run["spans"]),
+            "counters": run["counters"],
+        }
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+    def snapshot(self):
+        """Cumulative span statistics and counters since the last reset."""
+        with self._lock:
+            return {"spans": _format_spans(self._totals), "counters": dict(self._counters)}
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self._counters.clear()
+            self._run = None
+
+
+def _format_spans(spans):
+    return {
+        name: {"count": count, "total_ms": total * 1e3, "max_ms": longest * 1e3}
+        for name, (count, total, longest) in spans.items()
+    }
+
+
+def format_report(record, title=None):
+    """Text table of a run record or snapshot, slowest span first."""
+    lines = []
+    if title:
+        lines.append(title)
+    if "wall_ms" in record:
+        lines.append(f"{record['label']}: {record['wall_ms']:.1f} ms wall")
+    spans = sorted(record["spans"].items(), key=lambda item: -item[1]["total_ms"])
+    for name, stats in spans:
+        lines.append(
+            f"  {name:<18} {stats['total_ms']:9.2f} ms  "
+            f"x{stats['count']:<5} max {stats['max_ms']:.2f} ms"
+        )
+    for name, value in sorted(record["counters"].items()):
+        lines.append(f"  {name:<18} {value}")
+    return lines
+
+
+# Shared by the core modules and the UI
+INSTRUMENTATION = Instrumentation()
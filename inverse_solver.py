@@ -0,0 +1,330 @@
+"""Find the launch angle or speed that hits a target.
+
+The solver treats the simulator as a black box: every shot goes through
+``kinematics_core.compute_trajectory`` with the base parameters, so
+targets are hit under the same model (closed form, fixed step or
+adaptive) the UI is showing. Shots are remembered per speed and reused
+both as function values and as warm-start brackets by later solves.
+"""
+import math
+
+import numpy as np
+
+from kinematics_core import compute_trajectory, make_params
+
+
+DEFAULT_ANGLE_TOL = 1e-6
+DEFAULT_SPEED_TOL = 1e-6
+MAX_ANGLE = 90.0
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+class AngleSolution:
+    """Launch angles (degrees) that reach a target at a fixed speed.
+
+    ``low`` and ``high`` are the flat and lofted solutions, ``None`` when
+    that arc does not exist. ``optimal_angle``/``max_range`` describe the
+    longest shot on flat ground at this speed. ``calls`` counts the
+    simulator runs this solve needed.
+    """
+
+    def __init__(self, v0, target, low, high, optimal_angle, max_range, calls):
+        self.v0 = v0
+        self.target = target
+        self.low = low
+        self.high = high
+        self.optimal_angle = optimal_angle
+        self.max_range = max_range
+        self.calls = calls
+
+    @property
+    def angles(self):
+        return [angle for angle in (self.low, self.high) if angle is not None]
+
+    @property
+    def reachable(self):
+        return bool(self.angles)
+
+
+class SpeedSolution:
+    """Smallest launch speed that reaches a target, with its angle."""
+
+    def __init__(self, target, v0, theta, calls):
+        self.target = target
+        self.v0 = v0
+        self.theta = theta
+        self.calls = calls
+
+
+class InverseSolver:
+    """Solves for launch conditions by bracketing and root finding.
+
+    ``params`` supplies everything but the speed and angle (start point,
+    drag, gravity, integrator, ``dt``). Targets are absolute ``(x, y)``
+    points in front of the launch point; ``y`` defaults to the ground.
+    """
+
+    def __init__(self, params=None, simulator=None, angle_tol=DEFAULT_ANGLE_TOL,
+                 speed_tol=DEFAULT_SPEED_TOL):
+        self.params = make_params(**(params or {}))
+        self.simulator = simulator
+        self.angle_tol = angle_tol
+        self.speed_tol = speed_tol
+        self.calls = 0
+        # v0 -> {theta: trajectory} for every shot simulated so far
+        self._shots = {}
+
+    def shoot(self, v0, theta):
+        """Trajectory for one launch, simulated at most once per solver."""
+        shots = self._shots.setdefault(float(v0), {})
+        theta = float(theta)
+        if theta not in shots:
+            params = dict(self.params, v0=float(v0), theta=theta)
+            shots[theta] = compute_trajectory(params, self.simulator)
+            self.calls += 1
+        return shots[theta]
+
+    def max_range_angle(self, v0=None):
+        """Angle of the longest shot on flat ground, and that range."""
+        v0 = self.params['v0'] if v0 is None else v0
+        x0 = self.params['x0']
+        theta = self._maximize(v0, lambda traj: _landing_x(traj), 0.0, MAX_ANGLE, self.angle_tol)
+        return theta, _landing_x(self.shoot(v0, theta)) - x0
+
+    def solve_angle(self, target_x, target_y=0.0, v0=None):
+        """Both launch angles that pass through ``(target_x, target_y)``."""
+        v0 = self.params['v0'] if v0 is None else v0
+        self.check_target(target_x, target_y)
+        calls = self.calls
+
+        def miss(traj):
+            return _height_at(traj, target_x) - target_y
+
+        # The miss is unimodal in the angle: it rises to the highest pass
+        # over the target, then falls as the shot gets too lofted
+        split = self._maximize(v0, miss, 0.0, MAX_ANGLE, self.angle_tol)
+        low = high = None
+        if miss(self.shoot(v0, split)) >= 0:
+            low = self._root(v0, miss, 0.0, split)
+            high = self._root(v0, miss, split, MAX_ANGLE)
+        optimal_angle, max_range = self.max_range_angle(v0)
+        return AngleSolution(
+            v0, (target_x, target_y), low, high, optimal_angle, max_range, self.calls - calls
+        )
+
+    def solve_speed(self, target_x, target_y=0.0, v_max=1e4):
+        """Minimum launch speed (and its angle) that reaches the target.
+
+        Raises ``ValueError`` if even ``v_max`` falls short.
+        """
+        self.check_target(target_x, target_y)
+        calls = self.calls
+        best_angle = {}
+
+        def clearance(v0):
+            # Height of the best pass over the target at this speed; the
+            # previous speed's best angle warm-starts the angle search
+            miss = lambda traj: _height_at(traj, target_x) - target_y
+            hint = best_angle.get('theta')
+            theta = self._maximize(v0, miss, 0.0, MAX_ANGLE, self.angle_tol * 100, hint)
+            best_angle['theta'] = theta
+            return miss(self.shoot(v0, theta))
+
+        # Drag-free minimum speed is a lower bound under drag
+        dx = target_x - self.params['x0']
+        dy = target_y - self.params['y0']
+        g = self.params['gravity']
+        lo = max(math.sqrt(g * (dy + math.hypot(dx, dy))), 1e-3) * 0.99
+        hi = lo * 1.5
+        f_lo, f_hi = clearance(lo), clearance(hi)
+        while f_hi < 0:
+            if hi >= v_max:
+                raise ValueError(f"Target is out of reach below {v_max:g} m/s")
+            lo, f_lo = hi, f_hi
+            hi = min(hi * 2, v_max)
+            f_hi = clearance(hi)
+        v0 = lo if f_lo >= 0 else _brent(clearance, lo, hi, f_lo, f_hi, self.speed_tol * hi)
+        clearance(v0)
+        return SpeedSolution((target_x, target_y), v0, best_angle['theta'], self.calls - calls)
+
+    def check_target(self, target_x, target_y=0.0):
+        """Raise ``ValueError`` for targets the solver cannot aim at."""
+        if target_x <= self.params['x0']:
+            raise ValueError("Target must be in front of the launch point")
+        if target_y < 0:
+            raise ValueError("Target cannot be below the ground")
+
+    def _values(self, v0, fn, lo, hi):
+        """``(theta, fn(shot))`` for the shots already taken at ``v0`` within ``[lo, hi]``."""
+        shots = self._shots.get(float(v0), {})
+        return sorted((theta, fn(traj)) for theta, traj in shots.items() if lo <= theta <= hi)
+
+    def _maximize(self, v0, fn, lo, hi, tol, hint=None):
+        """Golden-section search for the angle maximizing ``fn`` (assumed unimodal)."""
+        known = self._values(v0, fn, lo, hi)
+        if len(known) >= 3:
+            # The maximum lies between the neighbours of the best known shot
+            i = max(range(len(known)), key=lambda k: known[k][1])
+            lo = known[i - 1][0] if i > 0 else lo
+            hi = known[i + 1][0] if i < len(known) - 1 else hi
+            if hi - lo <= tol:
+                return known[i][0]
+        elif hint is not None:
+            # Try a narrow bracket around the hint; keep it only if it holds the peak
+            a, b = max(lo, hint - 2.0), min(hi, hint + 2.0)
+            ends = fn(self.shoot(v0, a)), fn(self.shoot(v0, b))
+            if fn(self.shoot(v0, hint)) >= max(ends):
+                lo, hi = a, b
+
+        value = lambda theta: fn(self.shoot(v0, theta))
+        c = hi - _GOLDEN * (hi - lo)
+        d = lo + _GOLDEN * (hi - lo)
+        f_c, f_d = value(c), value(d)
+        while hi - lo > tol:
+            if f_c >= f_d:
+                hi, d, f_d = d, c, f_c
+                c = hi - _GOLDEN * (hi - lo)
+                f_c = value(c)
+            else:
+                lo, c, f_c = c, d, f_d
+                d = lo + _GOLDEN * (hi - lo)
+                f_d = value(d)
+        return c if f_c >= f_d else d
+
+    def _root(self, v0, fn, lo, hi):
+        """Angle in ``[lo, hi]`` where ``fn`` changes sign, or ``None``.
+
+        The bracket is first tightened using shots already taken at ``v0``.
+        """
+        known = [(lo, fn(self.shoot(v0, lo)))] + self._values(v0, fn, lo, hi)
+        known.append((hi, fn(self.shoot(v0, hi))))
+        known.sort()
+        for (a, f_a), (b, f_b) in zip(known, known[1:]):
+            if f_a == 0:
+                return a
+            if (f_a < 0) != (f_b < 0):
+                return _brent(lambda theta: fn(self.shoot(v0, theta)), a, b, f_a, f_b,
+                              self.angle_tol)
+        return None
+
+
+def _tail(trajectory):
+    """Slope and curvature ``(m, c)`` of ``y = y[-1] + m*u + c*u**2`` past the last sample."""
+    x, y = trajectory.x, trajectory.y
+    h = x[-1] - x[-2]
+    if h <= 0:
+        return 0.0, 0.0
+    if trajectory.vx is None:
+        return (y[-1] - y[-2]) / h, 0.0
+    m0 = trajectory.vy[-2] / trajectory.vx[-2]
+    m1 = trajectory.vy[-1] / trajectory.vx[-1]
+    return m1, min((m1 - m0) / (2 * h), 0.0)
+
+
+def _landing_x(trajectory):
+    """Where the trajectory meets the ground, extrapolating past the last sample."""
+    x, y = trajectory.x, trajectory.y
+    if len(x) < 2 or y[-1] <= 0:
+        return float(x[-1])
+    m, c = _tail(trajectory)
+    if c < 0:
+        u = (-m - np.sqrt(m * m - 4 * c * y[-1])) / (2 * c)
+    elif m < 0:
+        u = -y[-1] / m
+    else:
+        u = 0.0
+    return float(x[-1] + u)
+
+
+def _height_at(trajectory, target_x):
+    """Height of the trajectory at ``target_x``.
+
+    Past the landing point the value keeps falling by the horizontal
+    shortfall, so shots that land short rank by how close they came.
+    """
+    x, y = trajectory.x, trajectory.y
+    if target_x <= x[-1] and len(x) > 1:
+        i = max(int(x.searchsorted(target_x)), 1)
+        h = x[i] - x[i - 1]
+        if h <= 0:
+            return float(y[i])
+        s = (target_x - x[i - 1]) / h
+        if trajectory.vx is None:
+            return float(y[i - 1] + s * (y[i] - y[i - 1]))
+        # Cubic Hermite in x using the slopes dy/dx = vy/vx at both samples
+        m0 = trajectory.vy[i - 1] / trajectory.vx[i - 1]
+        m1 = trajectory.vy[i] / trajectory.vx[i]
+        return float(
+            (2 * s ** 3 - 3 * s ** 2 + 1) * y[i - 1] + (s ** 3 - 2 * s ** 2 + s) * h * m0
+            + (-2 * s ** 3 + 3 * s ** 2) * y[i] + (s ** 3 - s ** 2) * h * m1
+        )
+    landing = _landing_x(trajectory)
+    if target_x < landing:
+        # Between the last sample and the extrapolated impact
+        m, c = _tail(trajectory)
+        u = target_x - x[-1]
+        return float(y[-1] + m * u + c * u * u)
+    return float(landing - target_x)
+
+
+def _brent(fn, a, b, f_a, f_b, tol, max_iter=100):
+    """Brent's method for a root of ``fn`` in the sign-changing bracket ``[a, b]``."""
+    if f_a == 0:
+        return a
+    if f_b == 0:
+        return b
+    if abs(f_a) < abs(f_b):
+        a, b, f_a, f_b = b, a, f_b, f_a
+    c, f_c = a, f_a
+    d = e = b - a
+    for _ in range(max_iter):
+        if f_b == 0:
+            return b
+        if (f_b > 0) == (f_c > 0):
+            c, f_c = a, f_a
+            d = e = b - a
+        if abs(f_c) < abs(f_b):
+            a, b, c = b, c, b
+            f_a, f_b, f_c = f_b, f_c, f_b
+        m = (c - b) / 2
+        if abs(m) <= tol:
+            return b
+        if abs(e) >= tol and abs(f_a) > abs(f_b):
+            # Inverse quadratic interpolation, or secant when only two points differ
+            s = f_b / f_a
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = f_a / f_c, f_b / f_c
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            d = e = m
+        a, f_a = b, f_b
+        b += d if abs(d) > tol else math.copysign(tol, m)
+        f_b = fn(b)
+    return b
+
+
+def format_solution(solution):
+    """Result lines for an :class:`AngleSolution`, as shown in the UI."""
+    x, y = solution.target
+
+    def arc(angle):
+        return "none" if angle is None else f"{angle:.4f}°"
+
+    return [
+        "Angle Solution:",
+        f"- Target: ({x:.2f}, {y:.2f}) m at {solution.v0:.2f} m/s",
+        f"- Low Arc: {arc(solution.low)}",
+        f"- High Arc: {arc(solution.high)}",
+        f"- Max-Range Angle: {solution.optimal_angle:.4f}° ({solution.max_range:.2f} m)",
+        f"- Simulator Calls: {solution.calls}",
+    ]
@@ -0,0 +1,322 @@
+"""Headless simulation and analysis shared by the GUI and the CLI.
+
+Nothing here imports tkinter or matplotlib, so it is cheap to import on
+machines without a display.
+"""
+import numpy as np
+
+from adaptive_integrator import AdaptiveResult, AdaptiveSimulator
+from batch_simulator import DEFAULT_DT, DEFAULT_GRAVITY, BatchSimulator
+from closed_form import DragFreeSolution
+from flight_summary import (
+    adaptive_summary, closed_form_summary, fixed_step_summary, fixed_step_summary_batch
+)
+from instrumentation import INSTRUMENTATION
+from result_cache import simulation_key
+from terrain import SOLVER as TERRAIN_SOLVER, simulate_over_terrain
+from trajectory import Trajectory
+
+
+FIXED_STEP = "Fixed Step"
+ADAPTIVE = "Adaptive (RK45)"
+INTEGRATORS = [FIXED_STEP, ADAPTIVE]
+
+DEFAULT_PARAMS = {
+    'v0': 20.0,
+    'theta': 45.0,
+    'x0': 0.0,
+    'y0': 0.0,
+    'air_resistance': 0.0,
+    'gravity': DEFAULT_GRAVITY,
+    'integrator': FIXED_STEP,
+    'tolerance': 1e-6,
+    'dt': DEFAULT_DT
+}
+_NUMERIC_PARAMS = ('v0', 'theta', 'x0', 'y0', 'air_resistance', 'gravity', 'tolerance', 'dt')
+
+
+def default_simulator():
+    """Return a ``KinematicsSimulator`` if available, else the equivalent ``BatchSimulator``."""
+    try:
+        from kinematics_simulator import KinematicsSimulator
+    except ImportError:
+        return BatchSimulator()
+    return KinematicsSimulator()
+
+
+def make_params(terrain=None, **values):
+    """Fill in defaults, convert numbers and validate a parameter set.
+
+    Over ``terrain`` the launch only has to be above the ground rather
+    than above y = 0. Raises ``ValueError`` with a user-facing message on
+    invalid input.
+    """
+    params = dict(DEFAULT_PARAMS)
+    params.update((key, value) for key, value in values.items() if key in DEFAULT_PARAMS)
+    for key in _NUMERIC_PARAMS:
+        params[key] = float(params[key])
+    validate_params(params, terrain)
+    return params
+
+
+def validate_params(params, terrain=None):
+    if params['v0'] <= 0:
+        raise ValueError("Initial velocity must be positive")
+    if not (0 <= params['theta'] <= 90):
+        raise ValueError("Angle must be between 0 and 90 degrees")
+    if terrain is None and params['y0'] < 0:
+        raise ValueError("Initial Y position cannot be negative")
+    if terrain is not None and params['y0'] < terrain.height(params['x0']):
+        raise ValueError("Initial Y position cannot be below the terrain")
+    if params['air_resistance'] < 0:
+        raise ValueError("Air resistance coefficient cannot be negative")
+    if params['gravity'] <= 0:
+        raise ValueError("Gravity must be positive")
+    if params['tolerance'] <= 0:
+        raise ValueError("Integrator tolerance must be positive")
+    if params['dt'] <= 0:
+        raise ValueError("Time step must be positive")
+    if params['integrator'] not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator: {params['integrator']}")
+
+
+def cache_key(params, terrain=None):
+    """Result-cache key; folds in only the settings that affect the result."""
+    if terrain is not None:
+        integrator = f"{TERRAIN_SOLVER} {terrain.digest}"
+    elif params['air_resistance'] == 0:
+        integrator = "closed form"
+    elif params['integrator'] == ADAPTIVE:
+        integrator = f"{params['integrator']} tol={params['tolerance']!r}"
+    else:
+        integrator = params['integrator']
+    return simulation_key(
+        params['v0'], params['theta'], params['x0'], params['y0'],
+        params['air_resistance'], params['gravity'], params['dt'], integrator
+    )
+
+
+def compute_trajectory(params, simulator=None, terrain=None):
+    """Simulate one launch, choosing closed form, adaptive or fixed-step integration.
+
+    ``simulator`` is the fixed-step ``KinematicsSimulator``-like object to
+    use; it is configured from ``params``. Over ``terrain`` the flight is
+    always fixed-step and ends at the impact point (see
+    ``terrain.simulate_over_terrain``).
+    """
+    with INSTRUMENTATION.span("integrate"):
+        if terrain is not None:
+            trajectory, _ = simulate_over_terrain(params, terrain)
+        else:
+            trajectory = _integrate(params, simulator)
+    INSTRUMENTATION.count("points", len(trajectory))
+    return trajectory
+
+
+def _integrate(params, simulator):
+    v0, theta, x0, y0 = params['v0'], params['theta'], params['x0'], params['y0']
+    if params['air_resistance'] == 0:
+        # Drag-free motion has an exact solution; sample it on the
+        # simulator's time grid only for plotting and animation
+        return DragFreeSolution(v0, theta, x0, y0, params['gravity']).trajectory(
+            dt=params['dt']
+        )
+    if params['integrator'] == ADAPTIVE:
+        return AdaptiveSimulator(
+            gravity=params['gravity'],
+            air_resistance_coeff=params['air_resistance'],
+            rtol=params['tolerance'],
+            atol=params['tolerance']
+        ).simulate_projectile_motion_adaptive(v0, theta, x0, y0)
+
+    if simulator is None:
+        simulator = default_simulator()
+    simulator.gravity = params['gravity']
+    simulator.air_resistance_coeff = params['air_resistance']
+    simulator.dt = params['dt']
+    return Trajectory.from_points(
+        simulator.simulate_projectile_motion(v0, theta, x0, y0),
+        params['dt']
+    )
+
+
+def compute_trajectories(param_sets):
+    """:func:`compute_trajectory` for many launches.
+
+    Fixed-step launches with drag that share a time step are integrated
+    together by one ``BatchSimulator`` run; the rest go one at a time.
+    """
+    trajectories = [None] * len(param_sets)
+    for dt, rows in _fixed_step_groups(param_sets, ('dt',)).items():
+        launches = _launch_columns(
+            param_sets, rows, ('v0', 'theta', 'x0', 'y0', 'air_resistance', 'gravity')
+        )
+        with INSTRUMENTATION.span("integrate"):
+            result = BatchSimulator(dt=dt[0]).simulate_projectile_motion_batch(*launches)
+        for i, row in enumerate(rows):
+            trajectories[row] = result.trajectory(i)
+            INSTRUMENTATION.count("points", len(trajectories[row]))
+    for row, params in enumerate(param_sets):
+        if trajectories[row] is None:
+            trajectories[row] = compute_trajectory(params)
+    return trajectories
+
+
+def summarize(params, trajectory, terrain=None):
+    """Return max height, range and time of flight (exact when drag-free).
+
+    Over ``terrain`` everything comes from the trajectory, whose last
+    sample is the impact, and the impact point and velocity are added.
+    """
+    with INSTRUMENTATION.span("summary"):
+        return _summarize(params, trajectory, terrain)
+
+
+def _summarize(params, trajectory, terrain):
+    if terrain is not None:
+        summary = {
+            'max_height': trajectory.max_height,
+            'range': trajectory.range,
+            'time_of_flight': trajectory.time_of_flight,
+            'solver': TERRAIN_SOLVER,
+            'apex_time': float(trajectory.t[trajectory.apex_index]),
+            'impact_x': float(trajectory.x[-1]),
+            'impact_y': float(trajectory.y[-1]),
+        }
+        if trajectory.vx is not None:
+            vx, vy = float(trajectory.vx[-1]), float(trajectory.vy[-1])
+            summary['impact_speed'] = float(np.hypot(vx, vy))
+            summary['impact_angle'] = float(np.degrees(np.arctan2(-vy, vx)))
+    elif params['air_resistance'] == 0:
+        closed_form = DragFreeSolution(
+            params['v0'], params['theta'], params['x0'], params['y0'], params['gravity']
+        )
+        summary = {
+            'max_height': float(closed_form.max_height),
+            'range': float(closed_form.range),
+            'time_of_flight': float(closed_form.time_of_flight),
+            'solver': "closed form"
+        }
+    else:
+        summary = {
+            'max_height': trajectory.max_height,
+            'range': trajectory.range,
+            'time_of_flight': trajectory.time_of_flight,
+            'solver': params['integrator']
+        }
+    summary['points'] = len(trajectory)
+    if isinstance(trajectory, AdaptiveResult):
+        summary.update(
+            steps=trajectory.steps,
+            rejected=trajectory.rejected,
+            evaluations=trajectory.evaluations,
+            error_estimate=trajectory.error_estimate
+        )
+    return summary
+
+
+def compute_summary(params):
+    """Summary of one launch computed during integration, without a trajectory.
+
+    Memory is constant regardless of ``dt`` and flight time. On top of the
+    keys of :func:`summarize` (except ``points``) it has ``apex_time``,
+    ``apex_x``, ``landing_x``, ``impact_speed`` and ``impact_angle``; landing
+    is interpolated to the ground.
+    """
+    with INSTRUMENTATION.span("integrate"):
+        return _compute_summary(params)
+
+
+def compute_summaries(param_sets):
+    """:func:`compute_summary` for many launches.
+
+    Fixed-step launches with drag that share gravity and time step are
+    integrated together by ``fixed_step_summary_batch``; the rest go one
+    at a time.
+    """
+    summaries = [None] * len(param_sets)
+    for (gravity, dt), rows in _fixed_step_groups(param_sets, ('gravity', 'dt')).items():
+        launches = _launch_columns(param_sets, rows, ('v0', 'theta', 'x0', 'y0', 'air_resistance'))
+        with INSTRUMENTATION.span("integrate"):
+            flight = fixed_step_summary_batch(*launches, gravity=gravity, dt=dt).to_dict()
+        for i, row in enumerate(rows):
+            summaries[row] = {key: float(values[i]) for key, values in flight.items()}
+            summaries[row]['solver'] = param_sets[row]['integrator']
+    for row, params in enumerate(param_sets):
+        if summaries[row] is None:
+            summaries[row] = compute_summary(params)
+    return summaries
+
+
+def _fixed_step_groups(param_sets, keys):
+    """Indices of the fixed-step launches with drag, grouped by the values of ``keys``."""
+    groups = {}
+    for row, params in enumerate(param_sets):
+        if params['air_resistance'] != 0 and params['integrator'] == FIXED_STEP:
+            groups.setdefault(tuple(params[key] for key in keys), []).append(row)
+    return groups
+
+
+def _launch_columns(param_sets, rows, keys):
+    return [np.array([param_sets[row][key] for row in rows], dtype=np.float64) for key in keys]
+
+
+def _compute_summary(params):
+    launch = (params['v0'], params['theta'], params['x0'], params['y0'])
+    if params['air_resistance'] == 0:
+        summary = closed_form_summary(*launch, params['gravity']).to_dict()
+        summary['solver'] = "closed form"
+        return summary
+    if params['integrator'] == ADAPTIVE:
+        flight, result = adaptive_summary(
+            *launch, params['air_resistance'], params['gravity'], params['tolerance']
+        )
+        summary = flight.to_dict()
+        summary.update(
+            solver=params['integrator'],
+            steps=result.steps,
+            rejected=result.rejected,
+            evaluations=result.evaluations,
+            error_estimate=result.error_estimate
+        )
+        return summary
+    summary = fixed_step_summary(
+        *launch, params['air_resistance'], params['gravity'], params['dt']
+    ).to_dict()
+    summary['solver'] = params['integrator']
+    return summary
+
+
+def format_results(params, summary):
+    """Human-readable result lines, as shown in the UI's results box."""
+    results = [
+        f"Simulation Parameters:",
+        f"- Initial Velocity: {params['v0']:.2f} m/s",
+        f"- Projection Angle: {params['theta']:.2f}°",
+        f"- Initial Position: ({params['x0']:.2f}, {params['y0']:.2f}) m",
+        f"- Air Resistance: {params['air_resistance']:.4f}",
+        f"- Gravity: {params['gravity']:.2f} m/s²",
+        "\nResults:",
+        f"- Max Height: {summary['max_height']:.2f} m",
+        f"- Range: {summary['range']:.2f} m",
+        f"- Time of Flight: {summary['time_of_flight']:.2f} s",
+    ]
+    if 'impact_x' in summary:
+        results.append(f"- Impact Point: ({summary['impact_x']:.2f}, {summary['impact_y']:.2f}) m")
+    if 'impact_speed' in summary:
+        results += [
+            f"- Apex: {summary['max_height']:.2f} m at t = {summary['apex_time']:.2f} s",
+            f"- Impact: {summary['impact_speed']:.2f} m/s, "
+            f"{summary['impact_angle']:.2f}° below horizontal",
+        ]
+    if summary['solver'] == "closed form":
+        results.append("- Solver: closed form (no air resistance)")
+    elif 'steps' in summary:
+        results += [
+            f"- Integrator: {params['integrator']} (tolerance {params['tolerance']:g})",
+            f"- Steps Taken: {summary['steps']} "
+            f"({summary['rejected']} rejected, "
+            f"{summary['evaluations']} evaluations)",
+            f"- Error Estimate: {summary['error_estimate']:.2e} m",
+        ]
+    return results
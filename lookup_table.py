@@ -0,0 +1,241 @@
+"""Precomputed flight summaries over a (v0, theta, drag) grid.
+
+    python lookup_table.py table.npz --gravity 9.81 --v0 1 100 100
+
+A :class:`LookupTable` holds range, apex and flight time for ground
+launches at one gravity and time step, built with the vectorized
+fixed-step summary, which steps exactly like the simulator. Queries are answered by
+multilinear or tensor-product cubic interpolation; the difference
+between the two is reported as the error estimate, a heuristic rather
+than a bound. Queries outside the grid, or whose estimate exceeds the
+tolerance, are answered by ``kinematics_core.compute_summary``, exactly
+as a direct run would be.
+"""
+import argparse
+import bisect
+import sys
+
+import numpy as np
+
+from batch_simulator import DEFAULT_DT, DEFAULT_GRAVITY
+from flight_summary import fixed_step_summary_batch
+from kinematics_core import compute_summary, make_params
+
+
+OUTPUTS = ("range", "max_height", "apex_x", "apex_time", "time_of_flight")
+LINEAR = "linear"
+CUBIC = "cubic"
+DEFAULT_MAX_ERROR = 1e-3
+DEFAULT_CHUNK_SIZE = 65536
+FORMAT_VERSION = 1
+
+
+class LookupTable:
+    """Flight summaries on a regular or irregular ``(v0, theta, drag)`` grid.
+
+    ``values`` maps each name in ``OUTPUTS`` to an array of shape
+    ``(len(v0), len(theta), len(drag))``. ``hits`` and ``fallbacks``
+    count how :meth:`query` answered.
+    """
+
+    def __init__(self, v0, theta, drag, values, gravity=DEFAULT_GRAVITY, dt=DEFAULT_DT):
+        self.axes = tuple(np.asarray(a, dtype=np.float64) for a in (v0, theta, drag))
+        for axis in self.axes:
+            if len(axis) < 2 or np.any(np.diff(axis) <= 0):
+                raise ValueError("Grid axes need at least two strictly increasing values")
+        self.values = {name: np.asarray(values[name], dtype=np.float64) for name in OUTPUTS}
+        # All outputs side by side, so one gather serves every output
+        self._stacked = np.stack([self.values[name] for name in OUTPUTS], axis=-1)
+        self._axis_lists = [axis.tolist() for axis in self.axes]
+        self.gravity = float(gravity)
+        self.dt = float(dt)
+        self.hits = 0
+        self.fallbacks = 0
+
+    @property
+    def shape(self):
+        return tuple(len(axis) for axis in self.axes)
+
+    def contains(self, v0, theta, drag):
+        """Whether each query point lies inside the grid."""
+        inside = True
+        for axis, q in zip(self.axes, (v0, theta, drag)):
+            q = np.asarray(q, dtype=np.float64)
+            inside = inside & (q >= axis[0]) & (q <= axis[-1])
+        return inside
+
+    def interpolate(self, v0, theta, drag, method=CUBIC):
+        """Interpolated outputs and their error estimates at the query points.
+
+        Returns two dicts keyed by ``OUTPUTS``. The estimate is the absolute
+        difference between the multilinear and the cubic interpolant;
+        points outside the grid are extrapolated from the edge cells.
+        """
+        if method not in (LINEAR, CUBIC):
+            raise ValueError(f"Unknown interpolation method: {method}")
+        queries = np.broadcast_arrays(
+            *(np.asarray(q, dtype=np.float64) for q in (v0, theta, drag))
+        )
+        low = _tensor(self._stacked, [_weights(axis, q, 2) for axis, q in zip(self.axes, queries)])
+        high = _tensor(self._stacked, [_weights(axis, q, 4) for axis, q in zip(self.axes, queries)])
+        chosen = high if method == CUBIC else low
+        error = np.abs(high - low)
+        return (
+            {name: chosen[..., i] for i, name in enumerate(OUTPUTS)},
+            {name: error[..., i] for i, name in enumerate(OUTPUTS)},
+        )
+
+    def query(self, v0, theta, drag, max_error=DEFAULT_MAX_ERROR, method=CUBIC):
+        """Summary of one launch from the table, or simulated when the table can't answer.
+
+        ``max_error`` is relative: every output's error estimate must be
+        within ``max_error`` times its value. The result has the keys of
+        ``OUTPUTS`` plus ``source`` (``"table"`` or ``"simulator"``) and,
+        from the table, ``error_estimate`` with the per-output estimates.
+        The simulator answer is that of :func:`kinematics_core.compute_summary`
+        (closed form when drag-free).
+        """
+        if method not in (LINEAR, CUBIC):
+            raise ValueError(f"Unknown interpolation method: {method}")
+        point = (float(v0), float(theta), float(drag))
+        if all(axis[0] <= q <= axis[-1] for axis, q in zip(self._axis_lists, point)):
+            # Scalar path: plain slices and small dot products, no fancy indexing
+            low = _point_tensor(self._stacked, [
+                _point_weights(axis, q, 2) for axis, q in zip(self._axis_lists, point)
+            ])
+            high = _point_tensor(self._stacked, [
+                _point_weights(axis, q, 4) for axis, q in zip(self._axis_lists, point)
+            ])
+            chosen = high if method == CUBIC else low
+            result = dict(zip(OUTPUTS, chosen.tolist()))
+            estimate = dict(zip(OUTPUTS, np.abs(high - low).tolist()))
+            if all(estimate[name] <= max_error * max(abs(result[name]), 1e-12) for name in OUTPUTS):
+                self.hits += 1
+                return {**result, 'source': "table", 'error_estimate': estimate}
+        self.fallbacks += 1
+        params = make_params(v0=v0, theta=theta, air_resistance=drag, gravity=self.gravity, dt=self.dt)
+        summary = compute_summary(params)
+        return {**{name: float(summary[name]) for name in OUTPUTS}, 'source': "simulator"}
+
+    def save(self, path):
+        """Write the table as a compressed ``.npz`` file."""
+        np.savez_compressed(
+            path,
+            version=FORMAT_VERSION,
+            v0=self.axes[0], theta=self.axes[1], drag=self.axes[2],
+            gravity=self.gravity, dt=self.dt,
+            **{f"values_{name}": self.values[name] for name in OUTPUTS}
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported lookup table version {int(data['version'])}")
+            return cls(
+                data['v0'], data['theta'], data['drag'],
+                {name: data[f"values_{name}"] for name in OUTPUTS},
+                gravity=float(data['gravity']), dt=float(data['dt'])
+            )
+
+
+def build_table(v0, theta, drag, gravity=DEFAULT_GRAVITY, dt=DEFAULT_DT,
+                chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Simulate every grid point and return a :class:`LookupTable`.
+
+    ``v0``, ``theta`` and ``drag`` are the grid axes. Launches are
+    integrated ``chunk_size`` at a time; ``progress(done, total)`` is
+    called after each chunk.
+    """
+    axes = [np.asarray(a, dtype=np.float64) for a in (v0, theta, drag)]
+    grid = [g.ravel() for g in np.meshgrid(*axes, indexing='ij')]
+    total = len(grid[0])
+    flat = {name: np.empty(total) for name in OUTPUTS}
+    for start in range(0, total, chunk_size):
+        stop = min(start + chunk_size, total)
+        v, th, k = (g[start:stop] for g in grid)
+        summary = fixed_step_summary_batch(v, th, air_resistance_coeff=k, gravity=gravity, dt=dt)
+        for name in OUTPUTS:
+            flat[name][start:stop] = getattr(summary, name)
+        if progress:
+            progress(stop, total)
+
+    shape = tuple(len(axis) for axis in axes)
+    values = {name: flat[name].reshape(shape) for name in OUTPUTS}
+    return LookupTable(*axes, values, gravity=gravity, dt=dt)
+
+
+def _weights(axis, q, order):
+    """Indices and Lagrange weights of the ``order`` grid nodes around each query.
+
+    Axes with fewer than ``order`` nodes use as many as they have.
+    """
+    order = min(order, len(axis))
+    cell = np.clip(np.searchsorted(axis, q, side='right') - 1, 0, len(axis) - 2)
+    first = np.clip(cell - (order // 2 - 1), 0, len(axis) - order)
+    nodes = first[..., None] + np.arange(order)
+    x = axis[nodes]
+    weights = np.ones(nodes.shape)
+    for m in range(order):
+        for j in range(order):
+            if j != m:
+                weights[..., m] *= (q - x[..., j]) / (x[..., m] - x[..., j])
+    return nodes, weights
+
+
+def _tensor(values, per_axis):
+    """Tensor-product interpolation of ``values[i, j, k, :]`` from per-axis nodes and weights."""
+    (i0, w0), (i1, w1), (i2, w2) = per_axis
+    block = values[i0[..., :, None, None], i1[..., None, :, None], i2[..., None, None, :]]
+    weights = w0[..., :, None, None] * w1[..., None, :, None] * w2[..., None, None, :]
+    return np.einsum('...abc,...abcn->...n', weights, block)
+
+
+def _point_weights(axis, q, order):
+    """Scalar :func:`_weights`: the first node index and the weights."""
+    order = min(order, len(axis))
+    cell = min(max(bisect.bisect_right(axis, q) - 1, 0), len(axis) - 2)
+    first = min(max(cell - (order // 2 - 1), 0), len(axis) - order)
+    x = axis[first:first + order]
+    weights = []
+    for m in range(order):
+        weight = 1.0
+        for j in range(order):
+            if j != m:
+                weight *= (q - x[j]) / (x[m] - x[j])
+        weights.append(weight)
+    return first, np.array(weights)
+
+
+def _point_tensor(values, per_axis):
+    (a, wa), (b, wb), (c, wc) = per_axis
+    block = values[a:a + len(wa), b:b + len(wb), c:c + len(wc)]
+    return wc @ (wb @ (wa @ block.reshape(len(wa), -1)).reshape(len(wb), -1)).reshape(len(wc), -1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a range/apex lookup table")
+    parser.add_argument("output", help="table file to write (.npz)")
+    parser.add_argument("--gravity", type=float, default=DEFAULT_GRAVITY)
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT)
+    parser.add_argument("--v0", type=float, nargs=3, default=(1.0, 100.0, 100),
+                        metavar=("MIN", "MAX", "N"), help="launch speed axis (m/s)")
+    parser.add_argument("--theta", type=float, nargs=3, default=(0.0, 90.0, 91),
+                        metavar=("MIN", "MAX", "N"), help="launch angle axis (degrees)")
+    parser.add_argument("--drag", type=float, nargs=3, default=(0.0, 0.5, 26),
+                        metavar=("MIN", "MAX", "N"), help="drag coefficient axis")
+    args = parser.parse_args(argv)
+
+    axes = [np.linspace(lo, hi, int(n)) for lo, hi, n in (args.v0, args.theta, args.drag)]
+
+    def progress(done, total):
+        print(f"\r{done}/{total} launches", end="", file=sys.stderr)
+
+    table = build_table(*axes, gravity=args.gravity, dt=args.dt, progress=progress)
+    print(file=sys.stderr)
+    table.save(args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
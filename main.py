@@ -1,17 +1,57 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import json
+import copy
+import contextlib
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.animation import FuncAnimation
 import numpy as np
-from kinematics_simulator import KinematicsSimulator
+from kinematics_core import (
+    DEFAULT_PARAMS, INTEGRATORS, cache_key, compute_trajectory, default_simulator,
+    format_results, make_params, summarize
+)
+from decimation import minmax_indices, visible_range
+from inverse_solver import InverseSolver, format_solution
+from monte_carlo import MonteCarloSimulator, Normal, format_monte_carlo
+from overlay import COLOR_BY, TrajectoryOverlay
+from sim_worker import SimulationWorker
+from instrumentation import INSTRUMENTATION, format_report
+from result_cache import SimulationCache
+from run_store import DEFAULT_PATH as RUN_STORE_PATH, RunStore, format_run, parse_conditions
+from terrain import Terrain, read_profile
+import storage
+from export import COLUMNAR_EXTENSION, export_trajectories
 import unittest
 import os
+import shutil
+import tempfile
 import csv
+import sqlite3
+import time
 from datetime import datetime
 
 
+# Target frame period for trajectory playback
+ANIMATION_INTERVAL_MS = 30
+# Trajectory vertices drawn per horizontal pixel of the axes
+LOD_POINTS_PER_PIXEL = 2
+# How often the Tk thread collects results from the simulation worker
+WORKER_POLL_MS = 15
+# Slider events closer together than this are coalesced into one run
+LIVE_DEBOUNCE_MS = 30
+# Live-mode sliders: (input field, slider label, minimum, maximum)
+LIVE_SLIDERS = [
+    ("Initial Velocity (m/s):", "Velocity", 1.0, 100.0),
+    ("Angle of Projection (degrees):", "Angle", 0.0, 90.0),
+    ("Air Resistance Coefficient:", "Drag", 0.0, 0.5),
+    ("Gravity (m/s²):", "Gravity", 0.5, 30.0),
+]
+# Launch angles of Simulation → Overlay Angle Sweep
+OVERLAY_SWEEP_ANGLES = np.linspace(5.0, 85.0, 33)
+# Runs listed at once in the run history window
+HISTORY_LIMIT = 500
+
+
 class KinematicsUI:
     def __init__(self, master):
         self.master = master
@@ -24,18 +64,50 @@ class KinematicsUI:
         self.master.grid_columnconfigure(1, weight=3)
         self.master.grid_rowconfigure(2, weight=1)
         
-        self.simulator = KinematicsSimulator()
+        self.simulator = default_simulator()
+        self.result_cache = SimulationCache()
         self.default_values = {
             "Initial Velocity (m/s):": "20",
             "Angle of Projection (degrees):": "45",
             "Initial X-Position (m):": "0",
             "Initial Y-Position (m):": "0",
             "Air Resistance Coefficient:": "0",
-            "Gravity (m/s²):": "9.81"
+            "Gravity (m/s²):": "9.81",
+            "Integrator Tolerance:": str(DEFAULT_PARAMS['tolerance']),
+            "Velocity Std Dev (m/s):": "0.5",
+            "Angle Std Dev (degrees):": "1",
+            "Air Resistance Std Dev:": "0",
+            "Monte Carlo Shots:": "100000"
         }
+        self.integrators = INTEGRATORS
+        self.simulation_filetypes = [
+            ("Binary simulation files", "*" + storage.BINARY_EXTENSION),
+            ("JSON files", "*.json"),
+            ("All files", "*.*")
+        ]
         self.current_simulation = None
         self.animation = None
         self.is_playing = False
+        self.worker = SimulationWorker()
+        self.polling = False
+        self.live_after_id = None
+        self.live_pending = False
+        self.live_background = None
+        self.timing_var = tk.BooleanVar(value=INSTRUMENTATION.enabled)
+        self.last_timing = None
+        self.performance_window = None
+        self.performance_text = None
+        self.run_store_path = RUN_STORE_PATH
+        self.run_store = None
+        self.history_window = None
+        self.history_runs = []
+        self.terrain = None
+        self.terrain_filetypes = [
+            ("CSV files", "*.csv"),
+            ("NumPy arrays", "*.npy"),
+            ("Text files", "*.txt"),
+            ("All files", "*.*")
+        ]
 
         self.create_widgets()
         self.create_plot()
@@ -50,6 +122,11 @@ class KinematicsUI:
         file_menu.add_command(label="New Simulation", command=self.clear)
         file_menu.add_command(label="Save Simulation", command=self.save_simulation)
         file_menu.add_command(label="Load Simulation", command=self.load_simulation)
+        file_menu.add_command(label="Convert Save File", command=self.convert_simulation_file)
+        file_menu.add_separator()
+        file_menu.add_command(label="Add to Run History", command=self.add_to_history)
+        file_menu.add_command(label="Browse Run History", command=self.show_run_history)
+        file_menu.add_command(label="Import Saves to History", command=self.import_to_history)
         file_menu.add_separator()
         file_menu.add_command(label="Export Plot", command=self.export_plot)
         file_menu.add_command(label="Export Data", command=self.export_data)
@@ -60,10 +137,26 @@ class KinematicsUI:
         # Simulation menu
         sim_menu = tk.Menu(menubar, tearoff=0)
         sim_menu.add_command(label="Run Simulation", command=self.simulate)
+        sim_menu.add_command(label="Solve for Angle", command=self.solve_for_angle)
+        sim_menu.add_command(label="Run Monte Carlo", command=self.run_monte_carlo)
+        sim_menu.add_command(label="Overlay Angle Sweep", command=self.overlay_angle_sweep)
+        sim_menu.add_separator()
+        sim_menu.add_command(label="Load Terrain...", command=self.load_terrain)
+        sim_menu.add_command(label="Clear Terrain", command=self.clear_terrain)
+        sim_menu.add_separator()
         sim_menu.add_command(label="Play Animation", command=self.toggle_animation)
         sim_menu.add_command(label="Reset Animation", command=self.reset_animation)
         menubar.add_cascade(label="Simulation", menu=sim_menu)
         
+        # Performance menu
+        perf_menu = tk.Menu(menubar, tearoff=0)
+        perf_menu.add_checkbutton(
+            label="Enable Timing", variable=self.timing_var, command=self.toggle_timing
+        )
+        perf_menu.add_command(label="Show Performance Panel", command=self.show_performance_panel)
+        perf_menu.add_command(label="Set Timing Log File...", command=self.set_timing_log)
+        menubar.add_cascade(label="Performance", menu=perf_menu)
+        
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="About", command=self.show_about)
@@ -83,7 +176,12 @@ class KinematicsUI:
             "Initial X-Position (m):", 
             "Initial Y-Position (m):",
             "Air Resistance Coefficient:",
-            "Gravity (m/s²):"
+            "Gravity (m/s²):",
+            "Integrator Tolerance:",
+            "Velocity Std Dev (m/s):",
+            "Angle Std Dev (degrees):",
+            "Air Resistance Std Dev:",
+            "Monte Carlo Shots:"
         ]
         self.entries = {}
 
@@ -96,10 +194,22 @@ class KinematicsUI:
                 row=i, column=1, sticky="ew", padx=5, pady=5
             )
 
+        ttk.Label(input_frame, text="Integrator:").grid(
+            row=len(labels), column=0, sticky="e", padx=5, pady=5
+        )
+        self.integrator_var = tk.StringVar()
+        ttk.Combobox(
+            input_frame,
+            textvariable=self.integrator_var,
+            values=self.integrators,
+            state="readonly",
+            width=15
+        ).grid(row=len(labels), column=1, sticky="ew", padx=5, pady=5)
+
         # Button frame with improved buttons
         button_frame = ttk.Frame(self.master)
         button_frame.grid(row=1, column=0, pady=10, sticky="ew")
-        button_frame.grid_columnconfigure((0, 1, 2), weight=1)
+        button_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
 
         ttk.Button(
             button_frame, 
@@ -119,6 +229,18 @@ class KinematicsUI:
             text="Clear", 
             command=self.clear
         ).grid(row=0, column=2, padx=5, sticky="ew")
+        
+        self.cancel_button = ttk.Button(
+            button_frame, 
+            text="Cancel", 
+            command=self.cancel_simulation,
+            state="disabled"
+        )
+        self.cancel_button.grid(row=0, column=3, padx=5, sticky="ew")
+        
+        # Busy indicator for background runs
+        self.progress = ttk.Progressbar(button_frame, mode="determinate", maximum=100)
+        self.progress.grid(row=1, column=0, columnspan=4, padx=5, pady=(8, 0), sticky="ew")
 
         # Output text with scrollbar
         output_frame = ttk.LabelFrame(self.master, text="Simulation Results", padding="10")
@@ -137,6 +259,68 @@ class KinematicsUI:
         scroll_x.grid(row=1, column=0, sticky="ew")
         self.output_text.configure(xscrollcommand=scroll_x.set)
 
+        # Sliders that re-simulate while dragged
+        live_frame = ttk.LabelFrame(self.master, text="Live Mode", padding="10")
+        live_frame.grid(row=3, column=0, padx=10, pady=(0, 10), sticky="ew")
+        live_frame.grid_columnconfigure(1, weight=1)
+        
+        self.live_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            live_frame,
+            text="Update plot while dragging",
+            variable=self.live_var,
+            command=self.toggle_live_mode
+        ).grid(row=0, column=0, columnspan=2, sticky="w")
+        
+        self.sliders = {}
+        for i, (entry_label, text, low, high) in enumerate(LIVE_SLIDERS, start=1):
+            ttk.Label(live_frame, text=text).grid(row=i, column=0, sticky="e", padx=5)
+            self.sliders[entry_label] = ttk.Scale(
+                live_frame,
+                from_=low,
+                to=high,
+                orient="horizontal",
+                command=lambda value, label=entry_label: self.on_slider(label, value)
+            )
+            self.sliders[entry_label].grid(row=i, column=1, sticky="ew", padx=5)
+
+        # Keep runs on the plot for comparison
+        overlay_frame = ttk.LabelFrame(self.master, text="Overlay", padding="10")
+        overlay_frame.grid(row=4, column=0, padx=10, pady=(0, 10), sticky="ew")
+        overlay_frame.grid_columnconfigure(1, weight=1)
+        
+        self.overlay_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            overlay_frame,
+            text="Keep runs on the plot",
+            variable=self.overlay_var,
+            command=self.toggle_overlay_mode
+        ).grid(row=0, column=0, sticky="w")
+        
+        self.color_by_var = tk.StringVar(value=COLOR_BY['theta'])
+        color_by = ttk.Combobox(
+            overlay_frame,
+            textvariable=self.color_by_var,
+            values=list(COLOR_BY.values()),
+            state="readonly",
+            width=22
+        )
+        color_by.grid(row=0, column=1, sticky="ew", padx=5)
+        color_by.bind("<<ComboboxSelected>>", self.on_color_by)
+        
+        self.overlay_list = tk.Listbox(overlay_frame, height=4, selectmode=tk.EXTENDED)
+        self.overlay_list.grid(row=1, column=0, columnspan=2, sticky="ew", pady=5)
+        self.overlay_list.bind("<<ListboxSelect>>", self.on_overlay_select)
+        
+        overlay_buttons = ttk.Frame(overlay_frame)
+        overlay_buttons.grid(row=2, column=0, columnspan=2, sticky="ew")
+        ttk.Button(
+            overlay_buttons, text="Show/Hide", command=self.toggle_overlay_runs
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(
+            overlay_buttons, text="Clear Runs", command=self.clear_overlay
+        ).pack(side=tk.LEFT, padx=5)
+
     def create_plot(self):
         self.fig, self.ax = plt.subplots(figsize=(6, 5), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.master)
@@ -155,12 +339,37 @@ class KinematicsUI:
         self.ax.grid(True)
         self.line, = self.ax.plot([], [], 'b-', linewidth=2)  # For animation
         self.point, = self.ax.plot([], [], 'ro', markersize=8)  # For animation
+        self.trajectory_line = None
+        self.terrain_line = None
+        self.terrain_fill = None
+        self.impact_label = None
+        self.overlay = TrajectoryOverlay(self.ax)
+        self.overlay_colorbar = None
+        
+        # Re-cache the live-mode background after every full redraw
+        self.canvas.mpl_connect('draw_event', self.on_draw)
         self.canvas.draw()
 
     def set_default_values(self):
         for label, value in self.default_values.items():
             self.entries[label].delete(0, tk.END)
             self.entries[label].insert(0, value)
+        self.integrator_var.set(self.integrators[0])
+
+    def read_params(self):
+        """Validated parameters from the input fields; raises ``ValueError``."""
+        return make_params(
+            self.terrain,
+            v0=self.entries["Initial Velocity (m/s):"].get(),
+            theta=self.entries["Angle of Projection (degrees):"].get(),
+            x0=self.entries["Initial X-Position (m):"].get(),
+            y0=self.entries["Initial Y-Position (m):"].get(),
+            air_resistance=self.entries["Air Resistance Coefficient:"].get(),
+            gravity=self.entries["Gravity (m/s²):"].get(),
+            integrator=self.integrator_var.get(),
+            tolerance=self.entries["Integrator Tolerance:"].get(),
+            dt=self.simulator.dt
+        )
 
     def simulate(self):
         try:
@@ -168,116 +377,411 @@ class KinematicsUI:
             self.stop_animation()
             
             # Get input values with validation
-            v0 = float(self.entries["Initial Velocity (m/s):"].get())
-            theta = float(self.entries["Angle of Projection (degrees):"].get())
-            x0 = float(self.entries["Initial X-Position (m):"].get())
-            y0 = float(self.entries["Initial Y-Position (m):"].get())
-            air_resistance = float(self.entries["Air Resistance Coefficient:"].get())
-            gravity = float(self.entries["Gravity (m/s²):"].get())
-            
-            # Validate inputs
-            if v0 <= 0:
-                raise ValueError("Initial velocity must be positive")
-            if not (0 <= theta <= 90):
-                raise ValueError("Angle must be between 0 and 90 degrees")
-            if y0 < 0:
-                raise ValueError("Initial Y position cannot be negative")
-            if air_resistance < 0:
-                raise ValueError("Air resistance coefficient cannot be negative")
-            if gravity <= 0:
-                raise ValueError("Gravity must be positive")
-
-            # Configure simulator
-            self.simulator.gravity = gravity
-            self.simulator.air_resistance_coeff = air_resistance
-
-            # Run simulation
-            trajectory = self.simulator.simulate_projectile_motion(v0, theta, x0, y0)
-            self.current_simulation = {
-                'trajectory': trajectory,
-                'params': {
-                    'v0': v0,
-                    'theta': theta,
-                    'x0': x0,
-                    'y0': y0,
-                    'air_resistance': air_resistance,
-                    'gravity': gravity
-                }
-            }
+            params = self.read_params()
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+        self.run_simulation(params)
 
-            # Calculate and display results
-            self.output_text.delete(1.0, tk.END)
-            y_values = [y for _, y in trajectory]
-            x_values = [x for x, _ in trajectory]
+    def run_simulation(self, params, analysis=None, on_done=None, label="simulate"):
+        """Simulate ``params`` on the worker thread and show the results.
+
+        A cached trajectory is shown straight away. ``analysis(job,
+        trajectory)`` runs on the worker after the integration, and
+        ``on_done`` receives its result on the Tk thread once the nominal
+        results are shown.
+        """
+        terrain = self.terrain
+        key = cache_key(params, terrain)
+        cached = self.result_cache.get(key)
+        if cached is not None and analysis is None:
+            # Supersede any job in flight, or its result would replace this one
+            self.cancel_simulation()
+            with self.timed_run(label):
+                self.show_simulation(params, cached, terrain=terrain)
+            return
+        # The worker configures its own copy, so a superseded run cannot
+        # change the settings under a newer one
+        simulator = copy.copy(self.simulator)
+
+        def work(job):
+            trajectory = cached
+            if trajectory is None:
+                trajectory = compute_trajectory(params, simulator, terrain)
+            job.check()
+            summary = summarize(params, trajectory, terrain)
+            return trajectory, summary, analysis(job, trajectory) if analysis else None
+
+        def done(result):
+            trajectory, summary, extra = result
+            if cached is None:
+                self.result_cache.put(key, trajectory)
+            self.show_simulation(params, trajectory, summary, terrain)
+            if on_done:
+                on_done(extra)
+
+        self.start_job(work, done, label)
+
+    def show_simulation(self, params, trajectory, summary=None, terrain=None):
+        self.current_simulation = {
+            'trajectory': trajectory,
+            'params': params,
+            'terrain': terrain
+        }
+        self.show_results(self.current_simulation, summary)
+
+    def start_job(self, work, on_done, label):
+        """Run ``work(job)`` in the background; ``on_done(result)`` runs on the Tk thread.
+
+        Starting a job supersedes any job still in flight: it is cancelled
+        and whatever it returns is dropped. With timing enabled, the job is
+        recorded as a run named ``label``; a superseded job's thread may
+        run on for a while, but its timings stay out of later runs.
+        """
+        run = INSTRUMENTATION.begin_run(label)
+
+        def timed_work(job):
+            with INSTRUMENTATION.bind_run(run):
+                return work(job)
+
+        def done(result):
+            on_done(result)
+            self.finish_timing()
+            self.run_pending_live_update()
+
+        self.worker.submit(timed_work, done, self.on_job_error, self.on_job_progress)
+        self.cancel_button.state(["!disabled"])
+        self.progress.configure(mode="indeterminate", value=0)
+        self.progress.start()
+        if not self.polling:
+            self.polling = True
+            self.master.after(WORKER_POLL_MS, self.poll_worker)
+
+    def poll_worker(self):
+        self.worker.poll()
+        if self.worker.busy:
+            self.master.after(WORKER_POLL_MS, self.poll_worker)
+        else:
+            self.polling = False
+            self.progress.stop()
+            self.progress.configure(mode="determinate", value=0)
+            self.cancel_button.state(["disabled"])
+
+    def wait_for_job(self):
+        """Block until the background job is done and deliver its results."""
+        self.worker.wait()
+
+    def on_job_progress(self, fraction):
+        self.progress.stop()
+        self.progress.configure(mode="determinate", value=fraction * 100)
+
+    def on_job_error(self, error):
+        self.finish_timing()
+        messagebox.showerror("Error", f"Simulation failed: {error}")
+        self.run_pending_live_update()
+
+    def cancel_simulation(self):
+        # Slider moves that were waiting for the cancelled job are dropped too
+        self.live_pending = False
+        if self.worker.busy:
+            # A cancelled job's timings are partial
+            INSTRUMENTATION.discard_run()
+        self.worker.cancel()
+
+    @contextlib.contextmanager
+    def timed_run(self, label):
+        """Record the enclosed block as one run when timing is enabled.
+
+        While a background job is in flight its run stays open, and the
+        block's spans count towards it instead.
+        """
+        if self.worker.busy:
+            yield
+            return
+        INSTRUMENTATION.begin_run(label)
+        try:
+            yield
+        finally:
+            self.finish_timing()
+
+    def finish_timing(self):
+        record = INSTRUMENTATION.end_run()
+        if record is not None:
+            self.last_timing = record
+            self.update_performance_panel()
+
+    def toggle_timing(self):
+        INSTRUMENTATION.enabled = bool(self.timing_var.get())
+        if not INSTRUMENTATION.enabled:
+            INSTRUMENTATION.end_run()
+
+    def set_timing_log(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines files", "*.jsonl"), ("All files", "*.*")],
+            title="Append Run Timings To"
+        )
+        if file_path:
+            INSTRUMENTATION.log_path = file_path
+            self.timing_var.set(True)
+            self.toggle_timing()
+
+    def show_performance_panel(self):
+        """Open (or raise) a window with the last run's timings and the running totals."""
+        if self.performance_window is not None:
+            self.performance_window.lift()
+            self.update_performance_panel()
+            return
+        window = tk.Toplevel(self.master)
+        window.title("Performance")
+        window.protocol("WM_DELETE_WINDOW", self.close_performance_panel)
+        self.performance_text = tk.Text(window, width=64, height=24, wrap=tk.NONE)
+        self.performance_text.pack(fill=tk.BOTH, expand=True)
+        ttk.Button(window, text="Reset Totals", command=self.reset_timings).pack(pady=5)
+        self.performance_window = window
+        self.update_performance_panel()
+
+    def close_performance_panel(self):
+        self.performance_window.destroy()
+        self.performance_window = None
+        self.performance_text = None
+
+    def reset_timings(self):
+        INSTRUMENTATION.reset()
+        self.last_timing = None
+        self.update_performance_panel()
+
+    def update_performance_panel(self):
+        if self.performance_text is None:
+            return
+        if not INSTRUMENTATION.enabled:
+            lines = ["Timing is off; enable it from the Performance menu."]
+        else:
+            lines = []
+        if self.last_timing:
+            lines += format_report(self.last_timing, "Last run:") + [""]
+        lines += format_report(INSTRUMENTATION.snapshot(), "Totals since reset:")
+        if INSTRUMENTATION.log_path:
+            lines += ["", f"Logging runs to {INSTRUMENTATION.log_path}"]
+        self.performance_text.delete(1.0, tk.END)
+        self.performance_text.insert(tk.END, "\n".join(lines))
+
+    def solve_for_angle(self, target=None):
+        """Find the launch angles that hit a target point and plot the low arc."""
+        if self.terrain is not None:
+            messagebox.showwarning("Terrain", "Solve for Angle assumes flat ground; clear the terrain first")
+            return
+        try:
+            self.stop_animation()
+            params = self.read_params()
+            if target is None:
+                answer = simpledialog.askstring(
+                    "Solve for Angle",
+                    "Target point as x or x, y (m):",
+                    parent=self.master
+                )
+                if not answer:
+                    return
+                target = answer.replace(",", " ").split()
+            if not 1 <= len(target) <= 2:
+                raise ValueError("Enter the target as x or x, y")
+            target = [float(value) for value in target]
+            solver = InverseSolver(params, copy.copy(self.simulator))
+            solver.check_target(*target)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        def work(job):
+            solution = solver.solve_angle(*target)
+            if not solution.reachable:
+                return solution, None, None
+            # The low arc (or the only one) was simulated during the solve
+            trajectory = solver.shoot(solution.v0, solution.angles[0])
+            return solution, trajectory, summarize(solver.params, trajectory)
+
+        def done(result):
+            solution, trajectory, summary = result
+            if trajectory is None:
+                messagebox.showinfo(
+                    "No Solution",
+                    f"The target is out of reach at {solution.v0:.2f} m/s.\n"
+                    f"Maximum range is {solution.max_range:.2f} m "
+                    f"at {solution.optimal_angle:.2f}°."
+                )
+                return
+            
+            angle = solution.angles[0]
+            angle_entry = self.entries["Angle of Projection (degrees):"]
+            angle_entry.delete(0, tk.END)
+            angle_entry.insert(0, f"{angle:.6g}")
+            solved = dict(params, theta=angle)
+            self.result_cache.put(cache_key(solved), trajectory)
+            self.show_simulation(solved, trajectory, summary)
             
-            max_height = max(y_values)
-            range_x = max(x_values) - x0
-            time_of_flight = len(trajectory) * self.simulator.dt
-
-            results = [
-                f"Simulation Parameters:",
-                f"- Initial Velocity: {v0:.2f} m/s",
-                f"- Projection Angle: {theta:.2f}°",
-                f"- Initial Position: ({x0:.2f}, {y0:.2f}) m",
-                f"- Air Resistance: {air_resistance:.4f}",
-                f"- Gravity: {gravity:.2f} m/s²",
-                "\nResults:",
-                f"- Max Height: {max_height:.2f} m",
-                f"- Range: {range_x:.2f} m",
-                f"- Time of Flight: {time_of_flight:.2f} s",
-                "\nTrajectory (first 10 points):"
+            self.output_text.insert(tk.END, "\n\n" + "\n".join(format_solution(solution)))
+            self.ax.plot(*solution.target, 'k*', markersize=12, label='Target')
+            self.ax.legend()
+            self.canvas.draw()
+
+        self.start_job(work, done, "solve")
+
+    def run_monte_carlo(self):
+        """Propagate the input uncertainties and plot their spread around the nominal shot."""
+        if self.terrain is not None:
+            messagebox.showwarning("Terrain", "Monte Carlo assumes flat ground; clear the terrain first")
+            return
+        try:
+            self.stop_animation()
+            params = self.read_params()
+            spreads = [
+                float(self.entries[label].get()) for label in (
+                    "Velocity Std Dev (m/s):",
+                    "Angle Std Dev (degrees):",
+                    "Air Resistance Std Dev:"
+                )
             ]
+            shots = int(float(self.entries["Monte Carlo Shots:"].get()))
+            if min(spreads) < 0:
+                raise ValueError("Standard deviations cannot be negative")
+            if shots <= 0:
+                raise ValueError("Number of Monte Carlo shots must be positive")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        def analysis(job, trajectory):
+            return MonteCarloSimulator(gravity=params['gravity'], dt=params['dt']).run(
+                Normal(params['v0'], spreads[0]),
+                Normal(params['theta'], spreads[1]),
+                Normal(params['air_resistance'], spreads[2]),
+                params['x0'], params['y0'],
+                shots=shots,
+                progress=job.report
+            )
+
+        def done(result):
+            # Nominal results are already shown; add the dispersion on top
+            self.output_text.insert(tk.END, "\n\n" + "\n".join(format_monte_carlo(result)))
+            self.plot_dispersion(result)
+
+        self.run_simulation(params, analysis, done, "monte_carlo")
+
+    def plot_dispersion(self, result):
+        """Draw ±1σ/±2σ height bands and an inset landing-point histogram."""
+        bands = result.bands
+        # Skip the sparse tail reached by only a few shots
+        valid = bands.count >= max(result.shots // 100, 1)
+        x, mean, std = bands.x[valid], bands.mean[valid], bands.std[valid]
+        self.ax.fill_between(
+            x, np.maximum(mean - 2 * std, 0), mean + 2 * std,
+            color='tab:blue', alpha=0.15, linewidth=0, label='±2σ'
+        )
+        self.ax.fill_between(
+            x, np.maximum(mean - std, 0), mean + std,
+            color='tab:blue', alpha=0.3, linewidth=0, label='±1σ'
+        )
+        
+        histogram = result.histograms['landing_x']
+        hist_ax = self.ax.inset_axes([0.6, 0.6, 0.37, 0.33])
+        hist_ax.bar(
+            histogram.centers, histogram.counts,
+            width=np.diff(histogram.edges), color='tab:orange'
+        )
+        if self.current_simulation:
+            hist_ax.axvline(self.current_simulation['trajectory'].x[-1], color='r', linewidth=1)
+        hist_ax.set_title("Landing X (m)", fontsize=8)
+        hist_ax.tick_params(labelsize=7)
+        hist_ax.set_yticks([])
+        
+        self.ax.legend(loc='upper left')
+        self.canvas.draw()
+
+    def show_results(self, simulation, summary=None):
+        trajectory = simulation['trajectory']
+        params = simulation['params']
+        # The ground the run was made over, not whatever is loaded now
+        terrain = simulation.get('terrain')
+        if summary is None:
+            summary = summarize(params, trajectory, terrain)
+
+        # Calculate and display results
+        with INSTRUMENTATION.span("render_text"):
+            self.output_text.delete(1.0, tk.END)
+            results = format_results(params, summary)
+            cache = self.result_cache
+            results.append(f"- Result Cache: {cache.hits} hits, {cache.misses} misses")
+            results.append("\nTrajectory (first 10 points):")
             
             self.output_text.insert(tk.END, "\n".join(results) + "\n")
-            for x, y in trajectory[:10]:
-                self.output_text.insert(tk.END, f"({x:.2f}, {y:.2f})\n")
+            self.output_text.insert(tk.END, "".join(
+                f"({x:.2f}, {y:.2f})\n"
+                for x, y in zip(trajectory.x[:10], trajectory.y[:10])
+            ))
             
             if len(trajectory) > 10:
                 self.output_text.insert(tk.END, f"\n... and {len(trajectory)-10} more points")
 
+        if self.overlay_var.get():
+            self.add_to_overlay(params, trajectory, terrain)
+            return
+        with INSTRUMENTATION.span("plot_trajectory"):
             self.plot_trajectory(trajectory)
 
-        except ValueError as e:
-            messagebox.showerror("Input Error", str(e))
-
     def plot_trajectory(self, trajectory):
         self.ax.clear()
-        x_vals, y_vals = zip(*trajectory)
+        self.plotted_trajectory = trajectory
+        x_vals, y_vals = trajectory.x, trajectory.y
+        lod = self.lod_indices()
         
-        # Enhanced plot with markers and styling
-        self.ax.plot(
-            x_vals, y_vals, 
+        # Enhanced plot with markers and styling; only a decimated set of
+        # vertices is drawn, refreshed from full-resolution data on zoom/pan
+        self.trajectory_line, = self.ax.plot(
+            x_vals[lod], y_vals[lod], 
             'b-',  # blue solid line
             linewidth=2,
             marker='o', 
             markersize=4,
             markerfacecolor='red',
-            markevery=int(len(x_vals)/10) or 1  # show ~10 markers
+            markevery=int(len(lod)/10) or 1  # show ~10 markers
         )
         
         # Mark important points
-        self.ax.plot(
+        self.start_marker, = self.ax.plot(
             x_vals[0], y_vals[0], 
             'go',  # green dot for start
             markersize=8,
             label='Start'
         )
         
-        self.ax.plot(
+        self.landing_marker, = self.ax.plot(
             x_vals[-1], y_vals[-1], 
             'ro',  # red dot for end
             markersize=8,
-            label='Landing'
+            label='Landing' if self.terrain is None else 'Impact'
         )
         
-        max_idx = y_vals.index(max(y_vals))
-        self.ax.plot(
+        max_idx = trajectory.apex_index
+        self.apex_marker, = self.ax.plot(
             x_vals[max_idx], y_vals[max_idx], 
             'yo',  # yellow dot for max height
             markersize=8,
             label='Max Height'
         )
         
+        # Ground under the flight, plus a label at the impact point
+        self.terrain_line = self.terrain_fill = self.impact_label = None
+        if self.terrain is not None:
+            x_pad = 0.05 * (np.ptp(x_vals) or 1.0)
+            self.terrain_line, = self.ax.plot(
+                [], [], '-', color='saddlebrown', linewidth=1.5, label='Terrain'
+            )
+            self.refresh_terrain_lod(float(x_vals.min()) - x_pad, float(x_vals.max()) + x_pad)
+            self.impact_label = self.ax.annotate(
+                "", (0, 0), xytext=(-8, 8), textcoords='offset points', ha='right', fontsize=8
+            )
+            self.update_impact_label(trajectory)
+        
         self.ax.set_xlabel("Distance (m)")
         self.ax.set_ylabel("Height (m)")
         self.ax.set_title("Projectile Trajectory")
@@ -285,29 +789,402 @@ class KinematicsUI:
         self.ax.legend()
         
         # Set equal aspect ratio if x and y scales are similar
-        x_range = max(x_vals) - min(x_vals)
-        y_range = max(y_vals) - min(y_vals)
-        if 0.5 < x_range/y_range < 2:
+        x_range = np.ptp(x_vals)
+        y_range = np.ptp(y_vals)
+        if y_range > 0 and 0.5 < x_range/y_range < 2:
             self.ax.set_aspect('equal', adjustable='box')
         
-        # Initialize animation components
+        # Initialize animation components (ax.clear() detached them)
         self.line.set_data([], [])
         self.point.set_data([], [])
+        self.ax.add_line(self.line)
+        self.ax.add_line(self.point)
         
+        # ax.clear() also drops callbacks, so reconnect on every plot
+        self.ax.callbacks.connect('xlim_changed', self.on_view_changed)
+        with INSTRUMENTATION.span("canvas_draw"):
+            self.canvas.draw()
+
+    def lod_indices(self, start=0, stop=None, dpi=None):
+        """Indices of the samples to draw for ``trajectory[start:stop]``.
+
+        The vertex budget follows the axes' width in pixels (at ``dpi`` if
+        given, e.g. for export). Start, apex and landing are always kept.
+        """
+        trajectory = self.plotted_trajectory
+        if stop is None:
+            stop = len(trajectory)
+        budget = self.lod_budget(dpi)
+        keep = [
+            i - start for i in (0, trajectory.apex_index, len(trajectory) - 1)
+            if start <= i < stop
+        ]
+        return start + minmax_indices(trajectory.y[start:stop], budget, keep)
+
+    def lod_budget(self, dpi=None):
+        """Vertices to draw per trajectory: proportional to the axes' width in pixels."""
+        width = self.ax.bbox.width
+        if dpi:
+            width *= dpi / self.fig.dpi
+        return max(int(width) * LOD_POINTS_PER_PIXEL, 16)
+
+    def refresh_trajectory_lod(self, dpi=None):
+        """Re-decimate the visible x-range of the plotted trajectory."""
+        trajectory = self.plotted_trajectory
+        start, stop = visible_range(trajectory.x, *self.ax.get_xlim())
+        lod = self.lod_indices(start, stop, dpi)
+        self.trajectory_line.set_data(trajectory.x[lod], trajectory.y[lod])
+        self.trajectory_line.set_markevery(int(len(lod)/10) or 1)
+
+    def refresh_terrain_lod(self, lo=None, hi=None, dpi=None):
+        """Redraw the ground between ``lo`` and ``hi`` (default: the view) from a decimated profile."""
+        if lo is None:
+            lo, hi = self.ax.get_xlim()
+        terrain = self.terrain
+        # The samples bracketing the view, even when it falls between two of them
+        start = max(int(np.searchsorted(terrain.x, lo, side='right')) - 1, 0)
+        stop = min(int(np.searchsorted(terrain.x, hi)) + 1, len(terrain))
+        lod = start + minmax_indices(terrain.heights[start:stop], self.lod_budget(dpi))
+        x, y = terrain.x[lod], terrain.heights[lod]
+        # The ground stays level past the ends of the profile
+        if lo < terrain.x[0]:
+            x, y = np.append(lo, x), np.append(terrain.heights[0], y)
+        if hi > terrain.x[-1]:
+            x, y = np.append(x, hi), np.append(y, terrain.heights[-1])
+        self.terrain_line.set_data(x, y)
+        floor = float(y.min()) - 0.05 * (float(np.ptp(y)) or 1.0)
+        if self.terrain_fill is None:
+            self.terrain_fill = self.ax.fill_between(
+                x, y, floor, color='saddlebrown', alpha=0.25, linewidth=0
+            )
+        else:
+            # Updating in place leaves the data limits (and autoscaling) alone
+            self.terrain_fill.set_verts([np.concatenate((
+                np.column_stack((x, y)), [[x[-1], floor], [x[0], floor]]
+            ))])
+
+    def update_impact_label(self, trajectory):
+        x, y = float(trajectory.x[-1]), float(trajectory.y[-1])
+        self.impact_label.xy = (x, y)
+        self.impact_label.set_text(f"Impact ({x:.2f}, {y:.2f}) m")
+
+    def on_view_changed(self, ax):
+        self.refresh_trajectory_lod()
+        if self.terrain_line is not None:
+            self.refresh_terrain_lod()
+        self.canvas.draw_idle()
+
+    def toggle_overlay_mode(self):
+        if self.overlay_var.get():
+            if self.live_var.get():
+                self.live_var.set(False)
+                self.toggle_live_mode()
+            if self.current_simulation and not len(self.overlay):
+                params = self.current_simulation['params']
+                self.overlay.add(
+                    params, self.current_simulation['trajectory'],
+                    key=cache_key(params, self.current_simulation.get('terrain'))
+                )
+                self.overlay_list.insert(tk.END, self.overlay.runs[-1].label)
+            self.plot_overlay()
+            return
+        if self.overlay_colorbar is not None:
+            self.overlay_colorbar.remove()
+            self.overlay_colorbar = None
+        self.redraw_plot()
+
+    def redraw_plot(self):
+        """Redraw for the current mode: the kept runs in overlay mode, else the current run."""
+        if self.overlay_var.get():
+            self.plot_overlay()
+            return
+        if self.current_simulation:
+            self.plot_trajectory(self.current_simulation['trajectory'])
+            return
+        # Nothing to plot, but the ground of an earlier run may still be drawn
+        for artist in (self.terrain_line, self.terrain_fill, self.impact_label):
+            if artist is not None and artist.axes is not None:
+                artist.remove()
+        self.terrain_line = self.terrain_fill = self.impact_label = None
         self.canvas.draw()
 
+    def add_to_overlay(self, params, trajectories, terrain=None):
+        """Add one trajectory (or a list of them with a list of params) and redraw.
+
+        Runs already in the overlay (same cache key, over the same
+        ``terrain``) are not added again.
+        """
+        if not isinstance(trajectories, list):
+            params, trajectories = [params], [trajectories]
+        for run_params, trajectory in zip(params, trajectories):
+            key = cache_key(run_params, terrain)
+            if self.overlay.find(key) is not None:
+                continue
+            self.overlay.add(run_params, trajectory, key=key)
+            self.overlay_list.insert(tk.END, self.overlay.runs[-1].label)
+        self.plot_overlay()
+
+    def plot_overlay(self):
+        """Redraw the axes with every kept run in one colour-mapped collection."""
+        self.ax.clear()
+        self.trajectory_line = None
+        self.terrain_line = self.terrain_fill = self.impact_label = None
+        self.overlay.budget = self.lod_budget()
+        self.overlay.attach()
+        self.overlay.refresh()
+        self.overlay.fit_view()
+        self.overlay.update_view()
+        self.ax.set_xlabel("Distance (m)")
+        self.ax.set_ylabel("Height (m)")
+        self.ax.set_title(f"Projectile Trajectories ({len(self.overlay)} runs)")
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        
+        label = COLOR_BY[self.overlay.color_by]
+        if self.overlay_colorbar is None:
+            self.overlay_colorbar = self.fig.colorbar(self.overlay.collection, ax=self.ax)
+        self.overlay_colorbar.set_label(label)
+        
+        # Animation artists go back on top, as in plot_trajectory
+        self.line.set_data([], [])
+        self.point.set_data([], [])
+        self.ax.add_line(self.line)
+        self.ax.add_line(self.point)
+        self.ax.callbacks.connect('xlim_changed', self.on_overlay_view_changed)
+        with INSTRUMENTATION.span("canvas_draw"):
+            self.canvas.draw()
+
+    def on_overlay_view_changed(self, ax):
+        self.overlay.update_view(self.lod_budget())
+        self.canvas.draw_idle()
+
+    def on_overlay_select(self, event=None):
+        selection = self.overlay_list.curselection()
+        self.highlight_overlay_run(selection[0] if selection else None)
+
+    def highlight_overlay_run(self, index):
+        self.overlay.highlight(index)
+        self.canvas.draw_idle()
+
+    def toggle_overlay_runs(self, indices=None):
+        """Hide or show the selected runs (or ``indices``)."""
+        if indices is None:
+            indices = self.overlay_list.curselection()
+        for index in indices:
+            self.overlay.toggle(index)
+            run = self.overlay.runs[index]
+            self.overlay_list.delete(index)
+            self.overlay_list.insert(index, run.label if run.visible else f"({run.label})")
+        self.overlay.refresh()
+        self.canvas.draw_idle()
+
+    def on_color_by(self, event=None):
+        name = next(key for key, label in COLOR_BY.items() if label == self.color_by_var.get())
+        self.overlay.set_color_by(name)
+        self.overlay.refresh()
+        if self.overlay_colorbar is not None:
+            self.overlay_colorbar.set_label(COLOR_BY[name])
+        self.canvas.draw_idle()
+
+    def clear_overlay(self):
+        self.overlay.clear()
+        self.overlay_list.delete(0, tk.END)
+        if self.overlay_var.get():
+            self.plot_overlay()
+
+    def overlay_angle_sweep(self):
+        """Simulate the current inputs over a fan of launch angles and overlay them."""
+        try:
+            self.stop_animation()
+            params = self.read_params()
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+        simulator = copy.copy(self.simulator)
+        terrain = self.terrain
+        runs = [dict(params, theta=float(theta)) for theta in OVERLAY_SWEEP_ANGLES]
+
+        def work(job):
+            trajectories = []
+            for i, run in enumerate(runs):
+                trajectories.append(compute_trajectory(run, simulator, terrain))
+                job.report(i + 1, len(runs))
+            return trajectories
+
+        def done(trajectories):
+            if not self.overlay_var.get():
+                self.overlay_var.set(True)
+                self.toggle_overlay_mode()
+            self.add_to_overlay(runs, trajectories, terrain)
+
+        self.start_job(work, done, "overlay_sweep")
+
+    def toggle_live_mode(self):
+        if self.live_var.get():
+            if self.overlay_var.get():
+                self.overlay_var.set(False)
+                self.toggle_overlay_mode()
+            self.stop_animation()
+            # Start the sliders from the typed-in values
+            for label, slider in self.sliders.items():
+                try:
+                    slider.set(float(self.entries[label].get()))
+                except ValueError:
+                    pass
+            self.schedule_live_update()
+        else:
+            if self.live_after_id is not None:
+                self.master.after_cancel(self.live_after_id)
+                self.live_after_id = None
+            self.live_background = None
+            # Back to a regular, fully drawn plot
+            if self.current_simulation:
+                self.plot_trajectory(self.current_simulation['trajectory'])
+
+    def on_slider(self, label, value):
+        entry = self.entries[label]
+        entry.delete(0, tk.END)
+        entry.insert(0, f"{float(value):.4g}")
+        if self.live_var.get():
+            self.schedule_live_update()
+
+    def schedule_live_update(self):
+        """Debounce slider events: only the last one in a burst triggers a run."""
+        if self.live_after_id is not None:
+            self.master.after_cancel(self.live_after_id)
+        self.live_after_id = self.master.after(LIVE_DEBOUNCE_MS, self.live_update)
+
+    def live_update(self):
+        self.live_after_id = None
+        if self.worker.busy:
+            # Coalesce: run once more with the latest values when this one lands
+            self.live_pending = True
+            return
+        try:
+            params = self.read_params()
+        except ValueError:
+            return
+        simulator = copy.copy(self.simulator)
+        terrain = self.terrain
+
+        def work(job):
+            trajectory = compute_trajectory(params, simulator, terrain)
+            return trajectory, summarize(params, trajectory, terrain)
+
+        def done(result):
+            trajectory, summary = result
+            self.current_simulation = {
+                'trajectory': trajectory,
+                'params': params,
+                'terrain': terrain
+            }
+            self.show_live_results(params, trajectory, summary)
+
+        self.start_job(work, done, "live")
+
+    def run_pending_live_update(self):
+        """Run the live update for slider moves made while the last job was busy."""
+        if self.live_pending:
+            self.live_pending = False
+            if self.live_var.get():
+                self.live_update()
+
+    def live_artists(self):
+        artists = [self.trajectory_line, self.start_marker, self.landing_marker, self.apex_marker]
+        if self.impact_label is not None:
+            artists.append(self.impact_label)
+        return artists
+
+    def is_live_drawing(self):
+        return (
+            self.live_var.get()
+            and self.trajectory_line is not None
+            and self.trajectory_line.get_animated()
+        )
+
+    def show_live_results(self, params, trajectory, summary):
+        """Update the text and the existing artists in place, then blit."""
+        with INSTRUMENTATION.span("render_text"):
+            self.output_text.delete(1.0, tk.END)
+            self.output_text.insert(tk.END, "\n".join(format_results(params, summary)) + "\n")
+        
+        if not self.is_live_drawing():
+            # First live frame: build the artists once and mark them animated
+            # so full redraws leave them out of the cached background
+            self.plot_trajectory(trajectory)
+            for artist in self.live_artists():
+                artist.set_animated(True)
+            self.canvas.draw()
+            return
+        
+        self.plotted_trajectory = trajectory
+        lod = self.lod_indices()
+        self.trajectory_line.set_data(trajectory.x[lod], trajectory.y[lod])
+        self.trajectory_line.set_markevery(int(len(lod)/10) or 1)
+        self.start_marker.set_data(trajectory.x[:1], trajectory.y[:1])
+        self.landing_marker.set_data(trajectory.x[-1:], trajectory.y[-1:])
+        apex = trajectory.apex_index
+        self.apex_marker.set_data(trajectory.x[apex:apex+1], trajectory.y[apex:apex+1])
+        if self.impact_label is not None:
+            self.update_impact_label(trajectory)
+        
+        # Grow the view (with headroom) when the trajectory leaves it; that
+        # needs a full draw, the common case is a blit
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        x_lo, x_hi = float(trajectory.x.min()), float(trajectory.x.max())
+        y_hi = float(trajectory.y.max())
+        if x_lo < x_min or x_hi > x_max or y_hi > y_max:
+            self.ax.set_xlim(min(x_min, x_lo), max(x_max, x_lo + (x_hi - x_lo) * 1.3))
+            self.ax.set_ylim(y_min, max(y_max, y_hi * 1.3))
+            self.canvas.draw()
+            return
+        self.blit_live()
+
+    def blit_live(self):
+        if self.live_background is None:
+            self.canvas.draw()
+            return
+        with INSTRUMENTATION.span("blit"):
+            self.canvas.restore_region(self.live_background)
+            for artist in self.live_artists():
+                self.ax.draw_artist(artist)
+            self.canvas.blit(self.ax.bbox)
+
+    def on_draw(self, event):
+        if not self.is_live_drawing():
+            self.live_background = None
+            return
+        self.live_background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self.live_artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
     def init_animation(self):
         self.line.set_data([], [])
         self.point.set_data([], [])
         return self.line, self.point
 
     def update_animation(self, frame):
-        x_vals, y_vals = zip(*self.current_simulation['trajectory'][:frame+1])
-        self.line.set_data(x_vals, y_vals)
-        if frame < len(x_vals):
-            self.point.set_data(x_vals[frame], y_vals[frame])
+        # frame is a sample index; slicing the arrays only creates views
+        trajectory = self.current_simulation['trajectory']
+        self.line.set_data(trajectory.x[:frame+1], trajectory.y[:frame+1])
+        self.point.set_data(trajectory.x[frame:frame+1], trajectory.y[frame:frame+1])
         return self.line, self.point
 
+    def animation_frames(self):
+        """Yield the sample index matching the elapsed wall-clock time.
+
+        Samples that fall between two frames are skipped, so playback
+        follows the physical time of flight however fine the time step.
+        """
+        t = self.current_simulation['trajectory'].t
+        last = len(t) - 1
+        frame = 0
+        while frame < last:
+            elapsed = t[0] + time.perf_counter() - self.animation_start
+            frame = min(int(np.searchsorted(t, elapsed, side='right')) - 1, last)
+            yield max(frame, 0)
+
     def toggle_animation(self):
         if not self.current_simulation:
             messagebox.showwarning("No Simulation", "Please run a simulation first")
@@ -321,19 +1198,20 @@ class KinematicsUI:
     def start_animation(self):
         if not self.current_simulation:
             return
+        from matplotlib.animation import FuncAnimation
             
         self.is_playing = True
-        frames = len(self.current_simulation['trajectory'])
-        interval = max(10, int(self.simulator.dt * 1000))
+        self.animation_start = time.perf_counter()
         
         self.animation = FuncAnimation(
             self.fig,
             self.update_animation,
-            frames=frames,
+            frames=self.animation_frames,
             init_func=self.init_animation,
-            interval=interval,
+            interval=ANIMATION_INTERVAL_MS,
             blit=True,
-            repeat=False
+            repeat=False,
+            cache_frame_data=False
         )
         self.canvas.draw()
 
@@ -344,8 +1222,11 @@ class KinematicsUI:
 
     def reset_animation(self):
         self.stop_animation()
-        if self.current_simulation:
-            self.plot_trajectory(self.current_simulation['trajectory'])
+        self.redraw_plot()
+
+    def serialize_simulation(self):
+        """Return the current simulation in the JSON save format."""
+        return storage.simulation_to_json(self.current_simulation)
 
     def save_simulation(self):
         if not self.current_simulation:
@@ -353,63 +1234,265 @@ class KinematicsUI:
             return
             
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            defaultextension=storage.BINARY_EXTENSION,
+            filetypes=self.simulation_filetypes,
             title="Save Simulation Data"
         )
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(self.current_simulation, f, indent=4)
+                with self.timed_run("save"):
+                    storage.save_simulation(file_path, self.current_simulation)
                 messagebox.showinfo("Success", "Simulation saved successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {str(e)}")
 
-    def load_simulation(self):
-        file_path = filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
-            title="Load Simulation Data"
-        )
+    def load_simulation(self, file_path=None):
+        if file_path is None:
+            file_path = filedialog.askopenfilename(
+                filetypes=self.simulation_filetypes,
+                title="Load Simulation Data"
+            )
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                
-                # Convert lists back to tuples if needed (JSON saves them as lists)
-                data['trajectory'] = [tuple(point) for point in data['trajectory']]
-                
-                self.current_simulation = data
-                params = data['params']
-                
-                # Update UI fields
-                self.entries["Initial Velocity (m/s):"].delete(0, tk.END)
-                self.entries["Initial Velocity (m/s):"].insert(0, str(params['v0']))
-                
-                self.entries["Angle of Projection (degrees):"].delete(0, tk.END)
-                self.entries["Angle of Projection (degrees):"].insert(0, str(params['theta']))
-                
-                self.entries["Initial X-Position (m):"].delete(0, tk.END)
-                self.entries["Initial X-Position (m):"].insert(0, str(params['x0']))
-                
-                self.entries["Initial Y-Position (m):"].delete(0, tk.END)
-                self.entries["Initial Y-Position (m):"].insert(0, str(params['y0']))
-                
-                self.entries["Air Resistance Coefficient:"].delete(0, tk.END)
-                self.entries["Air Resistance Coefficient:"].insert(0, str(params['air_resistance']))
-                
-                self.entries["Gravity (m/s²):"].delete(0, tk.END)
-                self.entries["Gravity (m/s²):"].insert(0, str(params['gravity']))
-                
-                # Update plot and results
-                self.plot_trajectory(data['trajectory'])
-                self.simulate()  # This will update the results display
+                INSTRUMENTATION.begin_run("load")
+                # Binary files are memory-mapped rather than read in full
+                data = storage.load_simulation(file_path, dt=self.simulator.dt)
+                self.open_simulation(data)
+                self.finish_timing()
                 
                 messagebox.showinfo("Success", "Simulation loaded successfully")
             except Exception as e:
+                self.finish_timing()
                 messagebox.showerror("Error", f"Failed to load file: {str(e)}")
 
+    def open_simulation(self, data):
+        """Show a saved simulation and put its parameters and terrain back in place."""
+        params = data['params']
+        params.setdefault('integrator', self.integrators[0])
+        params.setdefault('tolerance', float(self.default_values["Integrator Tolerance:"]))
+        params.setdefault('dt', self.simulator.dt)
+        # Runs saved before terrain support were all made on flat ground
+        terrain = data.setdefault('terrain', None)
+        self.cancel_simulation()
+        self.stop_animation()
+        self.current_simulation = data
+        self.terrain = terrain
+        
+        # Seed the cache so re-running these inputs is instant
+        self.result_cache.put(cache_key(params, terrain), data['trajectory'])
+        
+        # Update UI fields
+        self.entries["Initial Velocity (m/s):"].delete(0, tk.END)
+        self.entries["Initial Velocity (m/s):"].insert(0, str(params['v0']))
+        
+        self.entries["Angle of Projection (degrees):"].delete(0, tk.END)
+        self.entries["Angle of Projection (degrees):"].insert(0, str(params['theta']))
+        
+        self.entries["Initial X-Position (m):"].delete(0, tk.END)
+        self.entries["Initial X-Position (m):"].insert(0, str(params['x0']))
+        
+        self.entries["Initial Y-Position (m):"].delete(0, tk.END)
+        self.entries["Initial Y-Position (m):"].insert(0, str(params['y0']))
+        
+        self.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+        self.entries["Air Resistance Coefficient:"].insert(0, str(params['air_resistance']))
+        
+        self.entries["Gravity (m/s²):"].delete(0, tk.END)
+        self.entries["Gravity (m/s²):"].insert(0, str(params['gravity']))
+        
+        self.entries["Integrator Tolerance:"].delete(0, tk.END)
+        self.entries["Integrator Tolerance:"].insert(0, str(params['tolerance']))
+        self.integrator_var.set(params['integrator'])
+        
+        # Show the saved results without simulating again
+        self.simulator.gravity = params['gravity']
+        self.simulator.air_resistance_coeff = params['air_resistance']
+        self.show_results(data)
+
+    def convert_simulation_file(self):
+        src = filedialog.askopenfilename(
+            filetypes=self.simulation_filetypes,
+            title="Select Simulation File to Convert"
+        )
+        if not src:
+            return
+        
+        # Offer the other format as the default target
+        if storage.is_binary(src):
+            extension = storage.JSON_EXTENSION
+        else:
+            extension = storage.BINARY_EXTENSION
+        dst = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            initialfile=os.path.splitext(os.path.basename(src))[0] + extension,
+            filetypes=self.simulation_filetypes,
+            title="Save Converted File"
+        )
+        
+        if dst:
+            try:
+                storage.convert(src, dst, dt=self.simulator.dt)
+                messagebox.showinfo("Success", "Simulation file converted successfully")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to convert file: {str(e)}")
+
+    def get_run_store(self):
+        """The run history store, opened on first use."""
+        if self.run_store is None:
+            self.run_store = RunStore(self.run_store_path)
+        return self.run_store
+
+    def add_to_history(self):
+        if not self.current_simulation:
+            messagebox.showwarning("No Data", "No simulation data to add")
+            return
+        try:
+            run_id, added = self.get_run_store().add(self.current_simulation)
+        except (sqlite3.Error, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to add run to history: {str(e)}")
+            return
+        if added:
+            messagebox.showinfo("Success", f"Run saved to history as #{run_id}")
+        else:
+            messagebox.showinfo("Run History", f"This run is already in the history as #{run_id}")
+        self.search_history()
+
+    def import_to_history(self):
+        paths = filedialog.askopenfilenames(
+            filetypes=self.simulation_filetypes,
+            title="Import Saves to Run History"
+        )
+        if not paths:
+            return
+        try:
+            with self.timed_run("import"):
+                result = self.get_run_store().import_files(paths)
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Failed to import files: {str(e)}")
+            return
+        message = f"{result['added']} runs added, {result['duplicates']} already in the history"
+        if result['errors']:
+            message += f"\n{len(result['errors'])} files could not be read:\n" + "\n".join(
+                f"{os.path.basename(path)}: {error}" for path, error in result['errors'][:10]
+            )
+        messagebox.showinfo("Run History", message)
+        self.search_history()
+
+    def show_run_history(self):
+        """Open (or raise) a window for searching and loading stored runs."""
+        if self.history_window is not None:
+            self.history_window.lift()
+            self.search_history()
+            return
+        window = tk.Toplevel(self.master)
+        window.title("Run History")
+        window.protocol("WM_DELETE_WINDOW", self.close_run_history)
+        
+        filter_frame = ttk.Frame(window, padding=5)
+        filter_frame.pack(fill=tk.X)
+        ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+        self.history_filter = ttk.Entry(filter_frame, width=50)
+        self.history_filter.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.history_filter.bind("<Return>", lambda event: self.search_history())
+        ttk.Button(filter_frame, text="Search", command=self.search_history).pack(side=tk.LEFT)
+        ttk.Label(window, text="e.g. theta>=40 theta<=50 drag>0.05").pack(anchor=tk.W, padx=5)
+        
+        self.history_list = tk.Listbox(window, width=110, height=20, font=("Courier", 9))
+        self.history_list.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.history_list.bind("<Double-Button-1>", lambda event: self.load_history_run())
+        self.history_status = ttk.Label(window, text="")
+        self.history_status.pack(anchor=tk.W, padx=5)
+        ttk.Button(window, text="Load Selected Run", command=self.load_history_run).pack(pady=5)
+        self.history_window = window
+        self.search_history()
+
+    def close_run_history(self):
+        self.history_window.destroy()
+        self.history_window = None
+        self.history_runs = []
+
+    def search_history(self, text=None):
+        """List the newest stored runs matching the filter conditions."""
+        if self.history_window is None:
+            return
+        if text is not None:
+            self.history_filter.delete(0, tk.END)
+            self.history_filter.insert(0, text)
+        try:
+            filters = parse_conditions(self.history_filter.get())
+            store = self.get_run_store()
+            total = store.count(**filters)
+            self.history_runs = store.query(order_by="-id", limit=HISTORY_LIMIT, **filters)
+        except (sqlite3.Error, ValueError) as e:
+            self.history_status.config(text=str(e))
+            return
+        self.history_list.delete(0, tk.END)
+        for run in self.history_runs:
+            self.history_list.insert(tk.END, format_run(run))
+        status = f"{total} matching runs"
+        if total > len(self.history_runs):
+            status += f", showing the newest {len(self.history_runs)}"
+        self.history_status.config(text=status)
+
+    def load_history_run(self, index=None):
+        if index is None:
+            selection = self.history_list.curselection()
+            if not selection:
+                return
+            index = selection[0]
+        try:
+            with self.timed_run("load"):
+                run = self.get_run_store().get(self.history_runs[index]['id'])
+                self.open_simulation({
+                    'params': run['params'], 'trajectory': run['trajectory'],
+                    'terrain': run['terrain']
+                })
+        except (sqlite3.Error, KeyError) as e:
+            messagebox.showerror("Error", f"Failed to load run: {str(e)}")
+
+    def load_terrain(self, file_path=None, spacing=None):
+        """Load a ground profile: heights on a uniform grid, or x, height pairs."""
+        if file_path is None:
+            file_path = filedialog.askopenfilename(
+                filetypes=self.terrain_filetypes,
+                title="Load Terrain Profile"
+            )
+        if not file_path:
+            return
+        try:
+            x, heights = read_profile(file_path)
+            if x is None:
+                if spacing is None:
+                    spacing = simpledialog.askfloat(
+                        "Terrain", "Heightmap sample spacing (m):",
+                        initialvalue=1.0, minvalue=1e-9, parent=self.master
+                    )
+                    if spacing is None:
+                        return
+                terrain = Terrain.from_heightmap(heights, spacing)
+            else:
+                terrain = Terrain(x, heights)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load terrain: {str(e)}")
+            return
+        self.terrain = terrain
+        # Put the launch on the ground if it would start underneath it
+        try:
+            x0 = float(self.entries["Initial X-Position (m):"].get())
+            y0 = float(self.entries["Initial Y-Position (m):"].get())
+        except ValueError:
+            return
+        ground = float(terrain.height(x0))
+        if y0 < ground:
+            self.entries["Initial Y-Position (m):"].delete(0, tk.END)
+            self.entries["Initial Y-Position (m):"].insert(0, str(ground))
+
+    def clear_terrain(self):
+        self.terrain = None
+        self.redraw_plot()
+
     def export_plot(self):
         if not self.current_simulation:
             messagebox.showwarning("No Data", "No plot to export")
@@ -428,7 +1511,15 @@ class KinematicsUI:
         
         if file_path:
             try:
-                self.fig.savefig(file_path, dpi=300, bbox_inches='tight')
+                # Use a vertex budget that matches the export resolution
+                if self.overlay_var.get():
+                    self.overlay.update_view(self.lod_budget(dpi=300))
+                    self.fig.savefig(file_path, dpi=300, bbox_inches='tight')
+                    self.overlay.update_view(self.lod_budget())
+                else:
+                    self.refresh_trajectory_lod(dpi=300)
+                    self.fig.savefig(file_path, dpi=300, bbox_inches='tight')
+                    self.refresh_trajectory_lod()
                 messagebox.showinfo("Success", "Plot exported successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export plot: {str(e)}")
@@ -440,37 +1531,51 @@ class KinematicsUI:
             
         file_path = filedialog.asksaveasfilename(
             defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[
+                ("CSV files", "*.csv"),
+                ("Compressed CSV files", "*.csv.gz"),
+                ("Columnar binary files", "*" + COLUMNAR_EXTENSION),
+                ("All files", "*.*")
+            ],
             title="Export Data"
         )
         
         if file_path:
             try:
-                with open(file_path, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(["Time (s)", "X-Position (m)", "Y-Position (m)"])
-                    
-                    for i, (x, y) in enumerate(self.current_simulation['trajectory']):
-                        time = i * self.simulator.dt
-                        writer.writerow([time, x, y])
+                # Format follows the extension; a single run needs no run-id column
+                with self.timed_run("export"):
+                    export_trajectories(
+                        file_path,
+                        [(0, self.current_simulation['trajectory'])],
+                        run_ids=False
+                    )
                 
                 messagebox.showinfo("Success", "Data exported successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export data: {str(e)}")
 
     def clear(self):
+        self.cancel_simulation()
         self.stop_animation()
         for entry in self.entries.values():
             entry.delete(0, tk.END)
         self.output_text.delete(1.0, tk.END)
+        self.current_simulation = None
+        self.overlay.clear()
+        self.overlay_list.delete(0, tk.END)
         self.ax.clear()
+        self.trajectory_line = None
+        self.terrain_line = None
+        self.terrain_fill = None
+        self.impact_label = None
         self.ax.set_xlabel("Distance (m)")
         self.ax.set_ylabel("Height (m)")
         self.ax.set_title("Projectile Trajectory")
         self.ax.grid(True)
+        if self.overlay_var.get():
+            self.overlay.attach()
         self.canvas.draw()
         self.set_default_values()
-        self.current_simulation = None
 
     def show_about(self):
         about_text = (
@@ -489,7 +1594,10 @@ class KinematicsUI:
 class TestKinematicsSimulator(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.root = tk.Tk()
+        try:
+            cls.root = tk.Tk()
+        except tk.TclError as e:
+            raise unittest.SkipTest(f"no display for the UI tests: {e}")
         cls.app = KinematicsUI(cls.root)
         cls.root.withdraw()  # Hide the GUI window during tests
 
@@ -502,11 +1610,14 @@ class TestKinematicsSimulator(unittest.TestCase):
 
     def test_simulation_basic(self):
         # Set basic parameters
+        self.app.entries["Initial Velocity (m/s):"].delete(0, tk.END)
         self.app.entries["Initial Velocity (m/s):"].insert(0, "20")
+        self.app.entries["Angle of Projection (degrees):"].delete(0, tk.END)
         self.app.entries["Angle of Projection (degrees):"].insert(0, "45")
         
         # Run simulation
         self.app.simulate()
+        self.app.wait_for_job()
         
         # Check results
         output = self.app.output_text.get("1.0", tk.END)
@@ -520,28 +1631,313 @@ class TestKinematicsSimulator(unittest.TestCase):
 
     def test_air_resistance(self):
         # Set parameters with air resistance
+        self.app.entries["Initial Velocity (m/s):"].delete(0, tk.END)
         self.app.entries["Initial Velocity (m/s):"].insert(0, "20")
+        self.app.entries["Angle of Projection (degrees):"].delete(0, tk.END)
         self.app.entries["Angle of Projection (degrees):"].insert(0, "45")
+        self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
         self.app.entries["Air Resistance Coefficient:"].insert(0, "0.1")
         
         # Run simulation
         self.app.simulate()
+        self.app.wait_for_job()
         
         # Check results mention air resistance
         output = self.app.output_text.get("1.0", tk.END)
         self.assertIn("Air Resistance: 0.1000", output)
 
+    def test_animation_frames(self):
+        self.app.simulate()
+        self.app.wait_for_job()
+        trajectory = self.app.current_simulation['trajectory']
+        
+        # Frames index straight into the trajectory arrays
+        self.app.update_animation(5)
+        x_vals, y_vals = self.app.line.get_data()
+        self.assertEqual(len(x_vals), 6)
+        self.assertEqual(self.app.point.get_data()[0][0], trajectory.x[5])
+        
+        # Playback that is already past the flight time ends on the landing point
+        self.app.animation_start = time.perf_counter() - trajectory.time_of_flight - 1
+        self.assertEqual(list(self.app.animation_frames()), [len(trajectory) - 1])
+
+    def test_solve_for_angle(self):
+        self.app.solve_for_angle(["30"])
+        self.app.wait_for_job()
+        
+        # The low arc is filled in and simulated
+        theta = float(self.app.entries["Angle of Projection (degrees):"].get())
+        self.assertLess(theta, 45)
+        output = self.app.output_text.get("1.0", tk.END)
+        self.assertIn("High Arc", output)
+        self.assertIn("Simulator Calls", output)
+
+    def test_monte_carlo(self):
+        self.app.entries["Monte Carlo Shots:"].delete(0, tk.END)
+        self.app.entries["Monte Carlo Shots:"].insert(0, "2000")
+        self.app.run_monte_carlo()
+        self.app.wait_for_job()
+        
+        output = self.app.output_text.get("1.0", tk.END)
+        self.assertIn("Monte Carlo (2000 shots)", output)
+        self.assertEqual(len(self.app.ax.child_axes), 1)
+
+    def test_new_run_supersedes_old(self):
+        velocity = self.app.entries["Initial Velocity (m/s):"]
+        self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+        self.app.entries["Air Resistance Coefficient:"].insert(0, "0.05")
+        for v0 in ("20", "30"):
+            velocity.delete(0, tk.END)
+            velocity.insert(0, v0)
+            self.app.simulate()
+        self.app.wait_for_job()
+        
+        # Only the newest run reaches the screen
+        self.assertEqual(self.app.current_simulation['params']['v0'], 30.0)
+        self.assertFalse(self.app.worker.busy)
+
+    def test_cache_hit_supersedes_running_job(self):
+        velocity = self.app.entries["Initial Velocity (m/s):"]
+        self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+        self.app.entries["Air Resistance Coefficient:"].insert(0, "0.05")
+        self.app.simulate()
+        self.app.wait_for_job()
+        
+        # An uncached run is still in flight when a cached one is shown
+        velocity.delete(0, tk.END)
+        velocity.insert(0, "37")
+        self.app.simulate()
+        velocity.delete(0, tk.END)
+        velocity.insert(0, "20")
+        self.app.simulate()
+        self.app.wait_for_job()
+        
+        self.assertEqual(self.app.current_simulation['params']['v0'], 20.0)
+        self.assertFalse(self.app.worker.busy)
+
+    def test_live_mode(self):
+        self.app.live_var.set(True)
+        self.app.toggle_live_mode()
+        self.app.live_update()
+        self.app.wait_for_job()
+        self.assertTrue(self.app.trajectory_line.get_animated())
+        line = self.app.trajectory_line
+        
+        # A burst of slider events collapses into one run that reuses the artists
+        for angle in (30, 31, 32):
+            self.app.on_slider("Angle of Projection (degrees):", angle)
+        self.app.live_update()
+        self.app.wait_for_job()
+        self.assertEqual(self.app.current_simulation['params']['theta'], 32.0)
+        self.assertIs(self.app.trajectory_line, line)
+        
+        self.app.live_var.set(False)
+        self.app.toggle_live_mode()
+        self.assertFalse(self.app.trajectory_line.get_animated())
+
+    def test_live_update_waits_for_any_job(self):
+        # Regular runs must really go to the worker
+        self.app.result_cache.clear()
+        self.app.live_var.set(True)
+        self.app.toggle_live_mode()
+        try:
+            # A slider move during a regular run is picked up when it lands
+            self.app.simulate()
+            self.app.on_slider("Angle of Projection (degrees):", 33)
+            self.app.live_update()
+            self.app.wait_for_job()
+            self.app.wait_for_job()
+            self.assertEqual(self.app.current_simulation['params']['theta'], 33.0)
+            
+            # Cancelling drops the waiting update
+            self.app.simulate()
+            self.app.live_update()
+            self.assertTrue(self.app.live_pending)
+            self.app.cancel_simulation()
+            self.assertFalse(self.app.live_pending)
+        finally:
+            self.app.live_var.set(False)
+            self.app.toggle_live_mode()
+
+    def test_overlay(self):
+        self.app.overlay_var.set(True)
+        self.app.toggle_overlay_mode()
+        try:
+            for drag in ("0", "0.05"):
+                self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+                self.app.entries["Air Resistance Coefficient:"].insert(0, drag)
+                self.app.simulate()
+                self.app.wait_for_job()
+            self.app.overlay_angle_sweep()
+            self.app.wait_for_job()
+            
+            # Every run is one segment of a single collection; the sweep's
+            # 45 degree run repeats the last simulation and is not added twice
+            runs = 2 + len(OVERLAY_SWEEP_ANGLES) - 1
+            self.assertEqual(len(self.app.overlay), runs)
+            self.assertEqual(len(self.app.overlay.collection.get_segments()), runs)
+            # Repeating a run (a cache hit) does not add it again
+            self.app.simulate()
+            self.app.wait_for_job()
+            self.assertEqual(len(self.app.overlay), runs)
+            # Resetting the animation keeps the overlay on screen
+            self.app.reset_animation()
+            self.assertIn(self.app.overlay.collection, self.app.ax.collections)
+            self.assertEqual(len(self.app.overlay.collection.get_segments()), runs)
+            self.app.toggle_overlay_runs([0])
+            self.assertEqual(len(self.app.overlay.collection.get_segments()), runs - 1)
+            self.app.highlight_overlay_run(1)
+            self.assertGreater(len(self.app.overlay.highlight_line.get_xdata()), 0)
+        finally:
+            self.app.overlay_var.set(False)
+            self.app.toggle_overlay_mode()
+
+    def test_run_history(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        store_path = self.app.run_store_path
+        self.app.run_store_path = os.path.join(tmp_dir, "runs.sqlite")
+        try:
+            self.app.simulate()
+            self.app.wait_for_job()
+            self.app.add_to_history()
+            self.app.add_to_history()
+            self.assertEqual(len(self.app.run_store), 1)
+            
+            self.app.show_run_history()
+            self.app.search_history("theta>=40 theta<=50 drag=0")
+            self.assertEqual(len(self.app.history_runs), 1)
+            self.app.search_history("theta>50")
+            self.assertEqual(len(self.app.history_runs), 0)
+            
+            self.app.search_history("")
+            self.app.clear()
+            self.app.load_history_run(0)
+            self.assertIsNotNone(self.app.current_simulation)
+            self.app.close_run_history()
+        finally:
+            self.app.run_store.close()
+            self.app.run_store = None
+            self.app.run_store_path = store_path
+
+    def test_terrain(self):
+        test_file = "test_terrain.csv"
+        x = np.linspace(-10, 100, 5001)
+        with open(test_file, 'w') as f:
+            f.write("x,height\n")
+            f.writelines(f"{xi},{2 * np.sin(xi / 5) + 1}\n" for xi in x)
+        try:
+            self.app.load_terrain(test_file)
+            self.assertIsNotNone(self.app.terrain)
+            # The launch was lifted onto the ground
+            self.assertAlmostEqual(
+                float(self.app.entries["Initial Y-Position (m):"].get()),
+                float(self.app.terrain.height(0.0))
+            )
+            self.app.simulate()
+            self.app.wait_for_job()
+            trajectory = self.app.current_simulation['trajectory']
+            self.assertAlmostEqual(
+                trajectory.y[-1], float(self.app.terrain.height(trajectory.x[-1])), places=9
+            )
+            self.assertIsNotNone(self.app.terrain_line)
+            self.assertIn("Impact", self.app.impact_label.get_text())
+            self.assertIn("Impact Point", self.app.output_text.get(1.0, tk.END))
+        finally:
+            self.app.clear_terrain()
+            os.remove(test_file)
+        self.assertIsNone(self.app.terrain_line)
+
+    def test_saved_terrain_run(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        profile = os.path.join(tmp_dir, "hill.csv")
+        with open(profile, 'w') as f:
+            f.write("x,height\n0,0\n20,6\n60,2\n")
+        try:
+            self.app.load_terrain(profile)
+            self.app.simulate()
+            self.app.wait_for_job()
+            saved = os.path.join(tmp_dir, "hill_run.ksim")
+            storage.save_simulation(saved, self.app.current_simulation)
+            over_hill = self.app.current_simulation['trajectory']
+
+            self.app.clear_terrain()
+            self.app.clear()
+            self.app.open_simulation(storage.load_simulation(saved))
+            # The run comes back with its ground and the summary made over it
+            self.assertEqual(self.app.terrain.digest, self.app.current_simulation['terrain'].digest)
+            self.assertIn("Impact Point", self.app.output_text.get(1.0, tk.END))
+
+            # The same inputs on flat ground simulate afresh rather than
+            # reusing the flight that ended on the hill
+            self.app.clear_terrain()
+            self.app.simulate()
+            self.app.wait_for_job()
+            flat = self.app.current_simulation['trajectory']
+            self.assertIsNone(self.app.current_simulation['terrain'])
+            self.assertGreater(flat.range, over_hill.range)
+            np.testing.assert_array_equal(
+                flat.x, compute_trajectory(self.app.current_simulation['params']).x
+            )
+        finally:
+            self.app.clear_terrain()
+
+    def test_timing(self):
+        self.app.timing_var.set(True)
+        self.app.toggle_timing()
+        try:
+            # A cached result would skip the integration
+            self.app.result_cache.clear()
+            self.app.simulate()
+            self.app.wait_for_job()
+            record = self.app.last_timing
+            self.assertEqual(record['label'], "simulate")
+            for name in ("integrate", "summary", "render_text", "plot_trajectory", "canvas_draw"):
+                self.assertIn(name, record['spans'])
+            
+            # A timed block during a job leaves the job's run in place
+            self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+            self.app.entries["Air Resistance Coefficient:"].insert(0, "0.05")
+            self.app.simulate()
+            with self.app.timed_run("save"):
+                pass
+            self.app.wait_for_job()
+            self.assertEqual(self.app.last_timing['label'], "simulate")
+            self.assertIn("integrate", self.app.last_timing['spans'])
+            
+            # A superseded job's integration stays out of the run that replaced it
+            for drag in ("0.09", "0.11"):
+                self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+                self.app.entries["Air Resistance Coefficient:"].insert(0, drag)
+                self.app.simulate()
+            self.app.wait_for_job()
+            self.assertEqual(self.app.last_timing['spans']['integrate']['count'], 1)
+            
+            # Cancelling a job drops its partial run
+            self.app.entries["Air Resistance Coefficient:"].delete(0, tk.END)
+            self.app.entries["Air Resistance Coefficient:"].insert(0, "0.07")
+            self.app.simulate()
+            self.app.cancel_simulation()
+            self.assertIsNone(INSTRUMENTATION.end_run())
+        finally:
+            self.app.timing_var.set(False)
+            self.app.toggle_timing()
+
     def test_save_load(self):
         # Run a basic simulation
+        self.app.entries["Initial Velocity (m/s):"].delete(0, tk.END)
         self.app.entries["Initial Velocity (m/s):"].insert(0, "20")
+        self.app.entries["Angle of Projection (degrees):"].delete(0, tk.END)
         self.app.entries["Angle of Projection (degrees):"].insert(0, "45")
         self.app.simulate()
+        self.app.wait_for_job()
         
         # Save to temporary file
         test_file = "test_simulation.json"
         self.app.current_simulation['test'] = True  # Add marker for verification
         with open(test_file, 'w') as f:
-            json.dump(self.app.current_simulation, f)
+            json.dump(self.app.serialize_simulation(), f)
         
         # Clear and load
         self.app.clear()
@@ -556,9 +1952,12 @@ class TestKinematicsSimulator(unittest.TestCase):
 
     def test_export(self):
         # Run a basic simulation
+        self.app.entries["Initial Velocity (m/s):"].delete(0, tk.END)
         self.app.entries["Initial Velocity (m/s):"].insert(0, "20")
+        self.app.entries["Angle of Projection (degrees):"].delete(0, tk.END)
         self.app.entries["Angle of Projection (degrees):"].insert(0, "45")
         self.app.simulate()
+        self.app.wait_for_job()
         
         # Test plot export
         test_plot = "test_plot.png"
@@ -0,0 +1,321 @@
+"""Monte Carlo propagation of launch uncertainty to the landing point.
+
+Shots are integrated in vectorized chunks with the fixed-step update
+rule of ``BatchSimulator``, but only running summaries are kept: online
+mean/variance and histograms of landing x, apex height and time of
+flight, plus mean/std of the height at fixed x positions for dispersion
+bands. Memory therefore depends on the chunk size, not on the number of
+shots.
+"""
+import numpy as np
+
+from batch_simulator import DEFAULT_DT, DEFAULT_GRAVITY, MAX_STEPS, drag_acceleration
+
+
+DEFAULT_SHOTS = 100_000
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_BINS = 50
+DEFAULT_BAND_POINTS = 200
+OUTPUTS = ("landing_x", "max_height", "time_of_flight")
+
+
+class Normal:
+    """Gaussian input, ``mean`` ± ``std``."""
+
+    def __init__(self, mean, std):
+        self.mean = float(mean)
+        self.std = float(std)
+
+    def sample(self, rng, n):
+        if self.std == 0:
+            return np.full(n, self.mean)
+        return rng.normal(self.mean, self.std, n)
+
+
+class Uniform:
+    """Input spread evenly over ``[low, high]``."""
+
+    def __init__(self, low, high):
+        self.low = float(low)
+        self.high = float(high)
+        self.mean = (self.low + self.high) / 2
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, n)
+
+
+def _sample(value, rng, n):
+    if hasattr(value, "sample"):
+        return value.sample(rng, n)
+    return np.full(n, float(value))
+
+
+def _nominal(value):
+    return value.mean if hasattr(value, "sample") else float(value)
+
+
+class RunningStats:
+    """Streaming count, mean, variance, min and max (Chan et al. merge)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        mean = float(values.mean())
+        m2 = float(((values - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram whose range is set from the first batch.
+
+    The first batch's spread (widened by half on each side) fixes the
+    edges; later values outside them are counted in ``underflow`` and
+    ``overflow``.
+    """
+
+    def __init__(self, bins=DEFAULT_BINS):
+        self.bins = bins
+        self.edges = None
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        if self.edges is None:
+            lo, hi = float(values.min()), float(values.max())
+            pad = (hi - lo) / 2 or max(abs(lo) * 1e-3, 1e-9)
+            self.edges = np.linspace(lo - pad, hi + pad, self.bins + 1)
+        counts, _ = np.histogram(values, self.edges)
+        self.counts += counts
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+
+    @property
+    def centers(self):
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    def quantile(self, q):
+        """Approximate quantile, interpolated within the bins."""
+        cdf = np.concatenate(([self.underflow], self.underflow + np.cumsum(self.counts)))
+        total = cdf[-1] + self.overflow
+        return float(np.interp(q * total, cdf, self.edges))
+
+
+class DispersionBands:
+    """Mean and standard deviation of the height where shots cross fixed x positions."""
+
+    def __init__(self, x):
+        self.x = np.asarray(x, dtype=np.float64)
+        if len(self.x) < 2:
+            raise ValueError("Dispersion bands need at least two x positions")
+        self.count = np.zeros(len(self.x), dtype=np.int64)
+        self._sum = np.zeros(len(self.x))
+        self._sum_sq = np.zeros(len(self.x))
+
+    def cell(self, x):
+        """Index of the last grid line at or before each ``x``."""
+        return np.floor((x - self.x[0]) / (self.x[1] - self.x[0])).astype(np.int64)
+
+    def add_crossings(self, x_prev, y_prev, x_new, y_new, cell_prev, cell_new):
+        """Accumulate the heights where segments ``prev -> new`` cross grid lines.
+
+        ``cell_prev``/``cell_new`` are the :meth:`cell` indices of the end
+        points; only segments that change cell are interpolated.
+        """
+        n = len(self.x)
+        rows = np.flatnonzero(cell_new > cell_prev)
+        line = np.maximum(cell_prev[rows] + 1, 0)
+        last = np.minimum(cell_new[rows], n - 1)
+        while len(rows):
+            keep = line <= last
+            rows, line, last = rows[keep], line[keep], last[keep]
+            if not len(rows):
+                break
+            xp, yp = x_prev[rows], y_prev[rows]
+            y = yp + (self.x[line] - xp) / (x_new[rows] - xp) * (y_new[rows] - yp)
+            above = y >= 0
+            at, y = line[above], y[above]
+            self.count += np.bincount(at, minlength=n)
+            self._sum += np.bincount(at, weights=y, minlength=n)
+            self._sum_sq += np.bincount(at, weights=y * y, minlength=n)
+            line = line + 1
+
+    @property
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._sum / self.count
+
+    @property
+    def std(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = self._sum_sq / self.count - self.mean ** 2
+        return np.sqrt(np.maximum(var, 0.0))
+
+
+class MonteCarloResult:
+    """Streaming statistics of a Monte Carlo run.
+
+    ``stats`` and ``histograms`` are keyed by ``OUTPUTS``; ``bands`` holds
+    the height dispersion along x.
+    """
+
+    def __init__(self, shots, stats, histograms, bands, nominal):
+        self.shots = shots
+        self.stats = stats
+        self.histograms = histograms
+        self.bands = bands
+        self.nominal = nominal
+
+
+class MonteCarloSimulator:
+    """Samples launch conditions and propagates them through a vectorized integrator.
+
+    ``v0``, ``theta`` and ``air_resistance_coeff`` given to :meth:`run` may
+    be plain numbers or distributions (:class:`Normal`, :class:`Uniform`,
+    or anything with ``mean`` and ``sample(rng, n)``).
+    """
+
+    def __init__(self, gravity=DEFAULT_GRAVITY, dt=DEFAULT_DT, chunk_size=DEFAULT_CHUNK_SIZE,
+                 bins=DEFAULT_BINS, band_points=DEFAULT_BAND_POINTS, seed=None):
+        if band_points < 2:
+            raise ValueError("band_points must be at least 2")
+        self.gravity = gravity
+        self.dt = dt
+        self.chunk_size = chunk_size
+        self.bins = bins
+        self.band_points = band_points
+        self.rng = np.random.default_rng(seed)
+
+    def run(self, v0, theta, air_resistance_coeff=0.0, x0=0.0, y0=0.0,
+            shots=DEFAULT_SHOTS, band_range=None, progress=None):
+        """Propagate ``shots`` samples; returns a :class:`MonteCarloResult`.
+
+        ``band_range`` is the ``(x_min, x_max)`` span of the dispersion
+        bands, by default from the launch point to 1.5 times the nominal
+        drag-free range. ``progress(done, total)`` is called per chunk.
+        """
+        if y0 < 0:
+            raise ValueError("Initial Y position cannot be negative")
+        nominal = {
+            'v0': _nominal(v0),
+            'theta': _nominal(theta),
+            'air_resistance': _nominal(air_resistance_coeff),
+        }
+        if band_range is None:
+            reach = nominal['v0'] ** 2 / self.gravity + y0
+            band_range = (x0, x0 + 1.5 * reach)
+        bands = DispersionBands(np.linspace(band_range[0], band_range[1], self.band_points))
+        stats = {name: RunningStats() for name in OUTPUTS}
+        histograms = {name: StreamingHistogram(self.bins) for name in OUTPUTS}
+
+        done = 0
+        while done < shots:
+            n = min(self.chunk_size, shots - done)
+            outputs = self._propagate(
+                _sample(v0, self.rng, n),
+                _sample(theta, self.rng, n),
+                # A negative drag coefficient is unphysical; clip the tail
+                np.maximum(_sample(air_resistance_coeff, self.rng, n), 0.0),
+                x0, y0, bands
+            )
+            for name, values in zip(OUTPUTS, outputs):
+                stats[name].update(values)
+                histograms[name].update(values)
+            done += n
+            if progress:
+                progress(done, shots)
+        return MonteCarloResult(shots, stats, histograms, bands, nominal)
+
+    def _propagate(self, v0, theta, k, x0, y0, bands):
+        """Integrate one chunk, keeping only per-shot summaries."""
+        n = len(v0)
+        dt, g = self.dt, self.gravity
+        theta_rad = np.radians(theta)
+        idx = np.arange(n)
+        x = np.full(n, float(x0))
+        y = np.full(n, float(y0))
+        vx = v0 * np.cos(theta_rad)
+        vy = v0 * np.sin(theta_rad)
+
+        landing_x = x.copy()
+        max_height = y.copy()
+        steps = np.zeros(n, dtype=np.int64)
+
+        # Running apex of the shots still in flight; landed shots are
+        # written out once, when they leave the working set
+        apex = y.copy()
+        cell = bands.cell(x)
+        step = 0
+        while len(idx) and step < MAX_STEPS:
+            ax, ay = drag_acceleration(vx, vy, k, g)
+            vx = vx + ax * dt
+            vy = vy + ay * dt
+            x_new = x + vx * dt
+            y_new = y + vy * dt
+            cell_new = bands.cell(x_new)
+            bands.add_crossings(x, y, x_new, y_new, cell, cell_new)
+
+            landed = y_new < 0
+            if landed.any():
+                # Their last recorded sample is the one before this step
+                done = idx[landed]
+                landing_x[done] = x[landed]
+                max_height[done] = apex[landed]
+                steps[done] = step
+                alive = ~landed
+                idx, x_new, y_new, vx, vy, k, apex, cell_new = (
+                    a[alive] for a in (idx, x_new, y_new, vx, vy, k, apex, cell_new)
+                )
+            x, y, cell = x_new, y_new, cell_new
+            np.maximum(apex, y, out=apex)
+            step += 1
+
+        # Shots cut off by MAX_STEPS report their last state
+        landing_x[idx] = x
+        max_height[idx] = apex
+        steps[idx] = step
+        return landing_x, max_height, steps * dt
+
+
+def format_monte_carlo(result):
+    """Result lines for a :class:`MonteCarloResult`, as shown in the UI."""
+    labels = {
+        'landing_x': ("Landing X", "m"),
+        'max_height': ("Max Height", "m"),
+        'time_of_flight': ("Time of Flight", "s"),
+    }
+    lines = [f"Monte Carlo ({result.shots} shots):"]
+    for name in OUTPUTS:
+        label, unit = labels[name]
+        stats, histogram = result.stats[name], result.histograms[name]
+        lines.append(
+            f"- {label}: {stats.mean:.2f} ± {stats.std:.2f} {unit} "
+            f"(5%-95%: {histogram.quantile(0.05):.2f} to {histogram.quantile(0.95):.2f})"
+        )
+    return lines
@@ -0,0 +1,152 @@
+"""Many trajectories on one axes, drawn as a single ``LineCollection``.
+
+One collection renders every visible run in a single draw call, coloured
+by a launch parameter through a colormap. Each run keeps its full
+trajectory plus a decimated copy of its vertices; toggling a run only
+rebuilds the list of segments, and highlighting moves one extra line.
+"""
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+from matplotlib.lines import Line2D
+
+from decimation import minmax_indices, visible_range
+
+
+# Launch parameters a run can be coloured by, with their axis labels
+COLOR_BY = {
+    'theta': "Angle (degrees)",
+    'v0': "Initial Velocity (m/s)",
+    'air_resistance': "Air Resistance Coefficient",
+    'gravity': "Gravity (m/s²)",
+}
+DEFAULT_BUDGET = 1000
+
+
+class OverlayRun:
+    def __init__(self, label, params, trajectory, key=None):
+        self.label = label
+        self.params = params
+        self.trajectory = trajectory
+        self.key = key
+        self.visible = True
+        self.vertices = None
+
+
+class TrajectoryOverlay:
+    """Keeps runs, their visibility and the highlighted run for one axes."""
+
+    def __init__(self, ax, color_by='theta', cmap='viridis', budget=DEFAULT_BUDGET):
+        self.ax = ax
+        self.color_by = color_by
+        self.budget = budget
+        self.runs = []
+        self.highlighted = None
+        self.norm = Normalize()
+        self.collection = LineCollection([], cmap=cmap, norm=self.norm, linewidths=1.5)
+        self.highlight_line = Line2D([], [], color='red', linewidth=3, zorder=3)
+
+    def __len__(self):
+        return len(self.runs)
+
+    def attach(self):
+        """Add the collection and highlight line to the axes (e.g. after ``ax.clear()``)."""
+        self.ax.add_collection(self.collection, autolim=False)
+        self.ax.add_line(self.highlight_line)
+
+    def add(self, params, trajectory, label=None, key=None):
+        """Add a run; returns its index. ``key`` identifies it for :meth:`find`."""
+        if label is None:
+            label = run_label(params)
+        run = OverlayRun(label, params, trajectory, key)
+        run.vertices = self._decimate(run.trajectory)
+        self.runs.append(run)
+        return len(self.runs) - 1
+
+    def find(self, key):
+        """Index of the run added with ``key``, or ``None``."""
+        for index, run in enumerate(self.runs):
+            if run.key is not None and run.key == key:
+                return index
+        return None
+
+    def set_visible(self, index, visible):
+        self.runs[index].visible = visible
+        if not visible and self.highlighted == index:
+            self.highlighted = None
+
+    def toggle(self, index):
+        self.set_visible(index, not self.runs[index].visible)
+
+    def highlight(self, index):
+        """Draw run ``index`` (or nothing, for ``None``) on top of the others."""
+        self.highlighted = index
+        if index is None or not self.runs[index].visible:
+            self.highlight_line.set_data([], [])
+            return
+        vertices = self.runs[index].vertices
+        self.highlight_line.set_data(vertices[:, 0], vertices[:, 1])
+
+    def set_color_by(self, name):
+        if name not in COLOR_BY:
+            raise ValueError(f"Cannot colour by {name!r}")
+        self.color_by = name
+
+    def clear(self):
+        self.runs = []
+        self.highlighted = None
+        self.refresh()
+
+    def refresh(self):
+        """Push the visible runs, their colours and the highlight to the artists."""
+        visible = [run for run in self.runs if run.visible]
+        self.collection.set_segments([run.vertices for run in visible])
+        # Scale over every run so colours don't shift when runs are hidden
+        values = np.array([run.params[self.color_by] for run in self.runs], dtype=np.float64)
+        if len(values):
+            self.norm.vmin, self.norm.vmax = values.min(), values.max()
+            if self.norm.vmin == self.norm.vmax:
+                self.norm.vmin, self.norm.vmax = values[0] - 0.5, values[0] + 0.5
+        self.collection.set_array(
+            np.array([run.params[self.color_by] for run in visible], dtype=np.float64)
+        )
+        self.highlight(self.highlighted)
+
+    def fit_view(self, margin=0.05):
+        """Set the axes limits to the visible runs."""
+        visible = [run.trajectory for run in self.runs if run.visible]
+        if not visible:
+            return
+        x_lo = min(float(t.x.min()) for t in visible)
+        x_hi = max(float(t.x.max()) for t in visible)
+        y_lo = min(float(t.y.min()) for t in visible)
+        y_hi = max(float(t.y.max()) for t in visible)
+        x_pad = (x_hi - x_lo) * margin or 1.0
+        y_pad = (y_hi - y_lo) * margin or 1.0
+        self.ax.set_xlim(x_lo - x_pad, x_hi + x_pad)
+        self.ax.set_ylim(y_lo - y_pad, y_hi + y_pad)
+
+    def update_view(self, budget=None):
+        """Re-decimate every run to the visible x-range with ``budget`` vertices each."""
+        if budget is not None:
+            self.budget = budget
+        lo, hi = self.ax.get_xlim()
+        for run in self.runs:
+            run.vertices = self._decimate(run.trajectory, lo, hi)
+        self.refresh()
+
+    def _decimate(self, trajectory, lo=None, hi=None):
+        start, stop = 0, len(trajectory)
+        if lo is not None:
+            start, stop = visible_range(trajectory.x, lo, hi)
+        if stop - start < 2:
+            return np.empty((0, 2))
+        lod = start + minmax_indices(trajectory.y[start:stop], self.budget)
+        return np.column_stack((trajectory.x[lod], trajectory.y[lod]))
+
+
+def run_label(params):
+    return (
+        f"v0={params['v0']:g} θ={params['theta']:g}° "
+        f"k={params['air_resistance']:g} g={params['gravity']:g}"
+    )
@@ -0,0 +1,133 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from storage import BINARY_EXTENSION, read_trajectory, write_trajectory
+
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def simulation_key(v0, theta, x0, y0, drag, gravity, dt, integrator):
+    """Normalized cache key for one set of simulation parameters."""
+    return (
+        float(v0), float(theta), float(x0), float(y0),
+        float(drag), float(gravity), float(dt), str(integrator),
+    )
+
+
+def trajectory_nbytes(trajectory):
+    return sum(
+        column.nbytes
+        for column in (trajectory.t, trajectory.x, trajectory.y, trajectory.vx, trajectory.vy)
+        if column is not None
+    )
+
+
+class SimulationCache:
+    """Bounded LRU cache of simulated trajectories.
+
+    Entries are evicted least-recently-used first once either
+    ``max_entries`` or ``max_bytes`` (summed array sizes) is exceeded.
+    With ``cache_dir`` set, every stored trajectory is also written there
+    in the binary save format and memory misses fall back to the
+    (memory-mapped) files, so results survive across sessions.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES,
+                 cache_dir=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        trajectory = self._entries.get(key)
+        if trajectory is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return trajectory
+
+        trajectory = self._load(key) if self.cache_dir else None
+        if trajectory is not None:
+            self.disk_hits += 1
+            self._insert(key, trajectory)
+            return trajectory
+
+        self.misses += 1
+        return None
+
+    def put(self, key, trajectory):
+        self._insert(key, trajectory)
+        if self.cache_dir:
+            self._store(key, trajectory)
+
+    def get_or_compute(self, key, compute):
+        trajectory = self.get(key)
+        if trajectory is None:
+            trajectory = compute()
+            self.put(key, trajectory)
+        return trajectory
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _insert(self, key, trajectory):
+        # Cached trajectories are shared between callers, so freeze them
+        for column in (trajectory.t, trajectory.x, trajectory.y, trajectory.vx, trajectory.vy):
+            if column is not None:
+                column.flags.writeable = False
+
+        if key in self._entries:
+            self.nbytes -= trajectory_nbytes(self._entries.pop(key))
+        self._entries[key] = trajectory
+        self.nbytes += trajectory_nbytes(trajectory)
+
+        # Always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= trajectory_nbytes(evicted)
+            self.evictions += 1
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + BINARY_EXTENSION)
+
+    def _store(self, key, trajectory):
+        write_trajectory(self._path(key), trajectory, {"key": list(key)})
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        trajectory, meta = read_trajectory(path)
+        if tuple(meta["key"]) != key:
+            return None
+        return trajectory
@@ -0,0 +1,358 @@
+"""Searchable history of simulation runs in a local SQLite database.
+
+    python run_store.py runs.sqlite import saves/*.json
+    python run_store.py runs.sqlite query "theta>=40" "theta<=50" "drag>0.05"
+
+Launch parameters and the flight summary live in an indexed ``runs``
+table; each trajectory is kept in a separate table as one blob in the
+binary save format, so range queries only touch the compact metadata
+rows. Runs made over terrain record the profile's digest in the
+``terrain`` column (``NULL`` for flat ground) and keep the profile itself
+with the trajectory. Runs are identified by a hash of their parameters,
+terrain and trajectory, and storing the same run twice keeps the first
+copy.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+import storage
+from kinematics_core import make_params, summarize
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".kinematics_runs.sqlite")
+SCHEMA_VERSION = 2
+
+# Columns that can be filtered and sorted on, and their aliases
+PARAM_COLUMNS = ("v0", "theta", "x0", "y0", "air_resistance", "gravity", "dt",
+                 "integrator", "tolerance")
+SUMMARY_COLUMNS = ("max_height", "range", "time_of_flight", "points")
+COLUMNS = ("id", "label", "created", "terrain") + PARAM_COLUMNS + SUMMARY_COLUMNS
+_INSERT_COLUMNS = ("hash", "label", "created", "terrain") + PARAM_COLUMNS + SUMMARY_COLUMNS
+ALIASES = {'drag': "air_resistance", 'k': "air_resistance", 'g': "gravity"}
+INDEXED = ("v0", "theta", "air_resistance", "gravity", "dt")
+
+_OPERATORS = {'eq': "=", 'ne': "!=", 'lt': "<", 'le': "<=", 'gt': ">", 'ge': ">="}
+_SYMBOLS = {"=": 'eq', "==": 'eq', "!=": 'ne', "<": 'lt', "<=": 'le', ">": 'gt', ">=": 'ge'}
+_CONDITION = re.compile(r"(\w+)\s*(<=|>=|==|!=|=|<|>)\s*([^\s,]+)")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    label TEXT,
+    created REAL NOT NULL,
+    terrain TEXT,
+    v0 REAL NOT NULL,
+    theta REAL NOT NULL,
+    x0 REAL NOT NULL,
+    y0 REAL NOT NULL,
+    air_resistance REAL NOT NULL,
+    gravity REAL NOT NULL,
+    dt REAL NOT NULL,
+    integrator TEXT NOT NULL,
+    tolerance REAL NOT NULL,
+    max_height REAL,
+    range REAL,
+    time_of_flight REAL,
+    points INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trajectories (
+    run_id INTEGER PRIMARY KEY REFERENCES runs(id) ON DELETE CASCADE,
+    data BLOB NOT NULL
+);
+{"".join(f"CREATE INDEX IF NOT EXISTS runs_{name} ON runs({name});" for name in INDEXED)}
+CREATE INDEX IF NOT EXISTS runs_theta_drag ON runs(theta, air_resistance);
+"""
+# Version 1 stores predate terrain; their runs are all on flat ground
+_MIGRATIONS = {1: "ALTER TABLE runs ADD COLUMN terrain TEXT"}
+
+
+def run_hash(params, trajectory, terrain=None):
+    """Content hash of a run from its parameters, terrain and sampled positions.
+
+    Velocities are left out, so a JSON save (which has none) and a binary
+    save of the same run hash alike.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    identity = {key: params[key] for key in PARAM_COLUMNS}
+    if terrain is not None:
+        identity["terrain"] = terrain.digest
+    digest.update(json.dumps(identity, sort_keys=True).encode())
+    for column in (trajectory.t, trajectory.x, trajectory.y):
+        digest.update(np.ascontiguousarray(column, dtype="<f8").tobytes())
+    return digest.hexdigest()
+
+
+def parse_conditions(text):
+    """Turn ``"theta>=40 theta<=50 drag>0.05"`` into :meth:`RunStore.query` filters.
+
+    Raises ``ValueError`` for text that is not a list of conditions.
+    """
+    filters = {}
+    matches = list(_CONDITION.finditer(text))
+    leftover = _CONDITION.sub("", text).replace(",", " ").strip()
+    if leftover:
+        raise ValueError(f"Cannot parse condition: {leftover}")
+    for match in matches:
+        name, symbol, value = match.groups()
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+        filters[f"{name}__{_SYMBOLS[symbol]}"] = value
+    return filters
+
+
+def _where(filters):
+    """SQL ``WHERE`` clause and arguments for ``query``-style keyword filters."""
+    clauses, args = [], []
+    for key, value in filters.items():
+        name, _, op = key.partition("__")
+        name = ALIASES.get(name, name)
+        if name not in COLUMNS:
+            raise ValueError(f"Unknown run column: {name}")
+        if isinstance(value, (tuple, list)):
+            if op:
+                raise ValueError(f"A range for {name} cannot have an operator")
+            low, high = value
+            if low is not None:
+                clauses.append(f"{name} >= ?")
+                args.append(low)
+            if high is not None:
+                clauses.append(f"{name} <= ?")
+                args.append(high)
+            continue
+        if (op or 'eq') not in _OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        if value is None:
+            # "= NULL" matches nothing in SQL
+            if op not in ('', 'eq', 'ne'):
+                raise ValueError(f"Cannot compare {name} with None")
+            clauses.append(f"{name} IS NOT NULL" if op == 'ne' else f"{name} IS NULL")
+            continue
+        clauses.append(f"{name} {_OPERATORS[op or 'eq']} ?")
+        args.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+class RunStore:
+    """Runs in one SQLite file; use as a context manager or call :meth:`close`."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Unsupported run store version {version}")
+        with self.connection:
+            if version in _MIGRATIONS:
+                self.connection.execute(_MIGRATIONS[version])
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def __len__(self):
+        return self.count()
+
+    def add(self, simulation, label=None):
+        """Store a simulation dict; returns ``(run_id, added)``.
+
+        ``added`` is false when an identical run was already stored, in
+        which case ``run_id`` is that run's id.
+        """
+        with self.connection:
+            return self._insert(simulation, label)
+
+    def add_many(self, simulations):
+        """Store several simulations in one transaction; returns their ``(run_id, added)``."""
+        with self.connection:
+            return [self._insert(simulation, None) for simulation in simulations]
+
+    def _insert(self, simulation, label):
+        terrain = simulation.get('terrain')
+        params = make_params(terrain, **simulation['params'])
+        trajectory = simulation['trajectory']
+        key = run_hash(params, trajectory, terrain)
+        summary = summarize(params, trajectory, terrain)
+        cursor = self.connection.execute(
+            f"INSERT OR IGNORE INTO runs ({', '.join(_INSERT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(_INSERT_COLUMNS))})",
+            (key, label or simulation.get('label'), time.time(),
+             terrain.digest if terrain is not None else None,
+             *(params[name] for name in PARAM_COLUMNS),
+             *(summary[name] for name in SUMMARY_COLUMNS))
+        )
+        if not cursor.rowcount:
+            row = self.connection.execute("SELECT id FROM runs WHERE hash = ?", (key,)).fetchone()
+            return row[0], False
+        run_id = cursor.lastrowid
+        meta = {'terrain': storage.terrain_to_json(terrain)} if terrain is not None else None
+        self.connection.execute(
+            "INSERT INTO trajectories (run_id, data) VALUES (?, ?)",
+            (run_id, storage.encode_trajectory(trajectory, meta))
+        )
+        return run_id, True
+
+    def get(self, run_id):
+        """The stored run as a simulation dict, plus ``id``, ``label`` and ``created``.
+
+        ``terrain`` is the ``Terrain`` the run was made over, or ``None``.
+        Raises ``KeyError`` for an unknown id.
+        """
+        row = self.connection.execute(
+            f"SELECT {', '.join(COLUMNS)}, data FROM runs JOIN trajectories ON run_id = id "
+            "WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(run_id)
+        run = _record(row)
+        run['trajectory'], meta = storage.decode_trajectory(row[-1])
+        run['terrain'] = storage.terrain_from_json(meta.get('terrain'))
+        return run
+
+    def query(self, order_by="id", limit=None, **filters):
+        """Metadata of the runs matching every filter, without their trajectories.
+
+        Filters are column names, optionally with an operator suffix
+        (``__lt``, ``__le``, ``__gt``, ``__ge``, ``__ne``); a bare name tests
+        equality and a ``(low, high)`` pair an inclusive range with either
+        end open as ``None``. A ``None`` value tests ``IS NULL`` (or
+        ``IS NOT NULL`` with ``__ne``). ``drag`` is accepted for ``air_resistance``::
+
+            store.query(theta=(40, 50), drag__gt=0.05)
+
+        Each result has ``id``, ``label``, ``created``, ``params`` and
+        ``summary``, and ``terrain``: the profile digest, ``None`` on flat ground.
+        """
+        descending = order_by.startswith("-")
+        column = ALIASES.get(order_by.lstrip("-"), order_by.lstrip("-"))
+        if column not in COLUMNS:
+            raise ValueError(f"Unknown run column: {column}")
+        where, args = _where(filters)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM runs{where} ORDER BY {column}"
+        if descending:
+            sql += " DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        return [_record(row) for row in self.connection.execute(sql, args)]
+
+    def count(self, **filters):
+        where, args = _where(filters)
+        return self.connection.execute(f"SELECT COUNT(*) FROM runs{where}", args).fetchone()[0]
+
+    def delete(self, run_id):
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    def import_files(self, paths, progress=None):
+        """Bulk-import JSON or binary save files in one transaction.
+
+        Files that fail to load are skipped. Returns a dict with the
+        ``added`` and ``duplicates`` counts and ``errors`` as
+        ``(path, message)`` pairs; ``progress(done, total)`` is called
+        after each file.
+        """
+        paths = list(paths)
+        result = {'added': 0, 'duplicates': 0, 'errors': []}
+        with self.connection:
+            for done, path in enumerate(paths, 1):
+                try:
+                    simulation = storage.load_simulation(path, mmap=False)
+                    _, added = self._insert(simulation, os.path.basename(path))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    result['errors'].append((path, str(e)))
+                else:
+                    result['added' if added else 'duplicates'] += 1
+                if progress:
+                    progress(done, len(paths))
+            self.connection.execute("ANALYZE")
+        return result
+
+
+def _record(row):
+    values = dict(zip(COLUMNS, row))
+    return {
+        'id': values['id'],
+        'label': values['label'],
+        'created': values['created'],
+        'terrain': values['terrain'],
+        'params': {name: values[name] for name in PARAM_COLUMNS},
+        'summary': {name: values[name] for name in SUMMARY_COLUMNS},
+    }
+
+
+def format_run(run):
+    params, summary = run['params'], run['summary']
+    return (
+        f"{run['id']:>6}  v0={params['v0']:<8g} θ={params['theta']:<6g} "
+        f"k={params['air_resistance']:<8g} g={params['gravity']:<6g} dt={params['dt']:<8g} "
+        f"range={summary['range']:.2f} m{' over terrain' if run['terrain'] else ''}  "
+        f"{run['label'] or ''}"
+    ).rstrip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search and fill the run history store")
+    parser.add_argument("store", help="SQLite run store file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="import save files or directories of them")
+    importer.add_argument("paths", nargs="+")
+    finder = commands.add_parser("query", help="list runs matching conditions like theta>=40")
+    finder.add_argument("conditions", nargs="*")
+    finder.add_argument("--limit", type=int)
+    finder.add_argument("--order-by", default="id")
+    finder.add_argument("--count", action="store_true", help="print only the number of matches")
+    args = parser.parse_args(argv)
+
+    with RunStore(args.store) as store:
+        if args.command == "import":
+            paths = []
+            for path in args.paths:
+                if os.path.isdir(path):
+                    for extension in (storage.JSON_EXTENSION, storage.BINARY_EXTENSION):
+                        paths += sorted(glob.glob(os.path.join(path, "*" + extension)))
+                else:
+                    paths.append(path)
+            result = store.import_files(paths)
+            for path, message in result['errors']:
+                print(f"skipped {path}: {message}", file=sys.stderr)
+            print(f"{result['added']} added, {result['duplicates']} duplicates, "
+                  f"{len(result['errors'])} failed")
+            return 0
+
+        try:
+            filters = parse_conditions(" ".join(args.conditions))
+            if args.count:
+                print(store.count(**filters))
+                return 0
+            runs = store.query(order_by=args.order_by, limit=args.limit, **filters)
+        except ValueError as e:
+            parser.error(str(e))
+        for run in runs:
+            print(format_run(run))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
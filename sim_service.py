@@ -0,0 +1,449 @@
+"""Local HTTP/JSON simulation service built on asyncio.
+
+    python sim_service.py --port 8765
+    curl -d '{"v0": 30, "theta": 40, "air_resistance": 0.05}' localhost:8765/simulate
+
+Endpoints:
+
+- ``POST /simulate``: one parameter object (keys of
+  ``kinematics_core.DEFAULT_PARAMS``, plus ``"trajectory": true`` to get
+  the sampled ``t``/``x``/``y`` as well), or ``{"runs": [...]}`` for
+  several. Responds with ``params`` and ``summary`` (and ``trajectory``),
+  or ``{"results": [...]}``.
+- ``GET /metrics``: request latency percentiles, throughput, batching and
+  cache statistics.
+- ``GET /health``
+
+Requests arriving within ``batch_window`` seconds of each other are
+collected into one batch and simulated together by
+``compute_summaries``/``compute_trajectories`` in an executor, so the
+event loop only parses and answers requests. Results are cached by
+parameters, and a request for parameters already being simulated waits
+for that run instead of starting another.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+from kinematics_core import (
+    DEFAULT_PARAMS, cache_key, compute_summaries, compute_trajectories, make_params
+)
+from result_cache import SimulationCache
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 256
+DEFAULT_SUMMARY_CACHE = 4096
+MAX_BODY = 1024 * 1024
+MAX_RUNS = 1000
+LATENCY_SAMPLES = 2048
+THROUGHPUT_WINDOW = 10.0
+
+SUMMARY = "summary"
+TRAJECTORY = "trajectory"
+_COMPUTE = {SUMMARY: compute_summaries, TRAJECTORY: compute_trajectories}
+
+
+class RequestError(Exception):
+    """A client error, answered with ``status`` and the message."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+class _SummaryCache:
+    """Bounded LRU of summary dicts."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        summary = self._entries.get(key)
+        if summary is not None:
+            self._entries.move_to_end(key)
+        return summary
+
+    def put(self, key, summary):
+        self._entries[key] = summary
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class ServiceMetrics:
+    """Request latencies and counts, batch sizes and cache outcomes."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.finished = deque()
+        self.batches = 0
+        self.batched_runs = 0
+        self.largest_batch = 0
+        self.compute_seconds = 0.0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.simulated = 0
+
+    def request_done(self, seconds, error=False):
+        now = time.monotonic()
+        self.requests += 1
+        self.errors += bool(error)
+        self.latencies.append(seconds)
+        self.finished.append(now)
+        while self.finished and self.finished[0] < now - THROUGHPUT_WINDOW:
+            self.finished.popleft()
+
+    def batch_done(self, size, seconds):
+        self.batches += 1
+        self.batched_runs += size
+        self.largest_batch = max(self.largest_batch, size)
+        self.compute_seconds += seconds
+
+    def snapshot(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        recent = sum(1 for t in self.finished if t >= now - THROUGHPUT_WINDOW)
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1e3
+
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": {
+                "requests_per_s": self.requests / uptime if uptime else 0.0,
+                "recent_requests_per_s": recent / min(uptime, THROUGHPUT_WINDOW) if uptime else 0.0,
+                "simulations_per_s": self.simulated / uptime if uptime else 0.0,
+            },
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p90": percentile(0.9),
+                "p99": percentile(0.99),
+                "max": latencies[-1] * 1e3 if latencies else None,
+                "mean": sum(latencies) / len(latencies) * 1e3 if latencies else None,
+                "samples": len(latencies),
+            },
+            "batching": {
+                "batches": self.batches,
+                "runs": self.batched_runs,
+                "mean_size": self.batched_runs / self.batches if self.batches else 0.0,
+                "largest": self.largest_batch,
+                "compute_ms": self.compute_seconds * 1e3,
+            },
+            "simulations": {
+                "simulated": self.simulated,
+                "cache_hits": self.cache_hits,
+                "coalesced": self.coalesced,
+            },
+        }
+
+
+class SimulationService:
+    """Batches, caches and coalesces simulation requests on one event loop.
+
+    ``executor`` runs the batches; by default a thread pool owned (and
+    shut down) by the service. A ``ProcessPoolExecutor`` keeps pure-Python
+    integrators from contending for the GIL.
+    """
+
+    def __init__(self, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 executor=None, summary_cache=DEFAULT_SUMMARY_CACHE, trajectory_cache=None):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.executor = executor
+        self._own_executor = executor is None
+        self.summaries = _SummaryCache(summary_cache)
+        self.trajectories = trajectory_cache if trajectory_cache is not None else SimulationCache()
+        self.metrics = ServiceMetrics()
+        self._queues = {SUMMARY: [], TRAJECTORY: []}
+        self._timers = {SUMMARY: None, TRAJECTORY: None}
+        self._inflight = {}
+        self._tasks = set()
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Start listening; ``port=0`` picks a free port (see :attr:`port`)."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(thread_name_prefix="simulation")
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for timer in self._timers.values():
+            if timer is not None:
+                timer.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._own_executor and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def summary(self, params):
+        """Summary of one validated parameter set (see ``kinematics_core.compute_summary``)."""
+        key = cache_key(params)
+        cached = self.summaries.get(key)
+        if cached is not None:
+            self.metrics.cache_hits += 1
+            return dict(cached)
+        return dict(await self._submit(SUMMARY, key, params))
+
+    async def trajectory(self, params):
+        """Trajectory of one validated parameter set (see ``kinematics_core.compute_trajectory``)."""
+        key = cache_key(params)
+        cached = self.trajectories.get(key)
+        if cached is not None:
+            self.metrics.cache_hits += 1
+            return cached
+        return await self._submit(TRAJECTORY, key, params)
+
+    async def simulate(self, values):
+        """Answer one request object: parameters, summary and optionally the trajectory."""
+        if not isinstance(values, dict):
+            raise RequestError("Each run must be a JSON object")
+        unknown = sorted(set(values) - set(DEFAULT_PARAMS) - {TRAJECTORY})
+        if unknown:
+            raise RequestError(f"Unknown parameters: {', '.join(unknown)}")
+        try:
+            params = make_params(**values)
+        except (TypeError, ValueError) as e:
+            raise RequestError(str(e)) from None
+        # "nan" and "inf" convert to floats but cannot be simulated (or sent back as JSON)
+        for key, value in params.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                raise RequestError(f"{key} must be a finite number")
+        result = {'params': params}
+        if values.get('trajectory'):
+            summary, trajectory = await asyncio.gather(
+                self.summary(params), self.trajectory(params)
+            )
+            result['trajectory'] = {
+                't': trajectory.t.tolist(), 'x': trajectory.x.tolist(), 'y': trajectory.y.tolist()
+            }
+        else:
+            summary = await self.summary(params)
+        result['summary'] = summary
+        return result
+
+    def _submit(self, kind, key, params):
+        """Future for ``params``, shared with any identical run already queued or running."""
+        future = self._inflight.get((kind, key))
+        if future is not None:
+            self.metrics.coalesced += 1
+            return asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[(kind, key)] = future
+        queue = self._queues[kind]
+        queue.append((key, params, future))
+        if len(queue) >= self.max_batch:
+            self._flush(kind)
+        elif self._timers[kind] is None:
+            self._timers[kind] = loop.call_later(self.batch_window, self._flush, kind)
+        return asyncio.shield(future)
+
+    def _flush(self, kind):
+        if self._timers[kind] is not None:
+            self._timers[kind].cancel()
+            self._timers[kind] = None
+        batch, self._queues[kind] = self._queues[kind], []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(kind, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, kind, batch):
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(
+                self.executor, _COMPUTE[kind], [params for _, params, _ in batch]
+            )
+        except Exception as e:
+            results = None
+            error = e
+        self.metrics.batch_done(len(batch), time.perf_counter() - start)
+        for i, (key, _, future) in enumerate(batch):
+            del self._inflight[(kind, key)]
+            if results is None:
+                future.set_exception(error)
+                continue
+            self.metrics.simulated += 1
+            if kind == SUMMARY:
+                self.summaries.put(key, results[i])
+            else:
+                self.trajectories.put(key, results[i])
+            future.set_result(results[i])
+
+    async def handle(self, method, path, body):
+        """Return ``(status, payload)`` for one HTTP request."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path == "/metrics":
+            metrics = self.metrics.snapshot()
+            metrics["cache"] = {
+                "summaries": len(self.summaries),
+                "trajectories": self.trajectories.stats(),
+            }
+            return HTTPStatus.OK, metrics
+        if path != "/simulate":
+            raise RequestError(f"No such endpoint: {path}", HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise RequestError("Use POST for /simulate", HTTPStatus.METHOD_NOT_ALLOWED)
+        try:
+            data = json.loads(body or b"null")
+        except ValueError:
+            raise RequestError("Request body is not valid JSON") from None
+        if isinstance(data, dict) and "runs" in data:
+            runs = data["runs"]
+            if not isinstance(runs, list) or len(runs) > MAX_RUNS:
+                raise RequestError(f"'runs' must be a list of at most {MAX_RUNS} objects")
+            return HTTPStatus.OK, {"results": await asyncio.gather(*map(self.simulate, runs))}
+        return HTTPStatus.OK, await self.simulate(data)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                start = time.perf_counter()
+                error = False
+                try:
+                    status, payload = await self.handle(method, path, body)
+                except RequestError as e:
+                    status, payload, error = e.status, {"error": str(e)}, True
+                except Exception as e:
+                    status, payload, error = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}, True
+                # Trajectories can be large; encode them off the event loop
+                if status == HTTPStatus.OK and path.startswith("/simulate"):
+                    content = await asyncio.get_running_loop().run_in_executor(
+                        None, _encode, payload
+                    )
+                else:
+                    content = _encode(payload)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, content, keep_alive))
+                await writer.drain()
+                self.metrics.request_done(time.perf_counter() - start, error)
+                if not keep_alive:
+                    break
+        except RequestError as e:
+            writer.write(_response(e.status, _encode({"error": str(e)}), False))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """``(method, path, headers, body)`` of the next request, or ``None`` at EOF."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError("Malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError("Invalid Content-Length") from None
+    if length < 0:
+        raise RequestError("Invalid Content-Length")
+    if length > MAX_BODY:
+        raise RequestError("Request body too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def _encode(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+def _response(status, content, keep_alive):
+    status = HTTPStatus(status)
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(content)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + content
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """Run a :class:`SimulationService` until cancelled."""
+    service = SimulationService(**options)
+    await service.start(host, port)
+    print(f"Serving on http://{host}:{service.port}", file=sys.stderr)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON projectile simulation service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW * 1e3,
+                        help="milliseconds to wait for more requests before a batch runs")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="runs that start a batch at once")
+    parser.add_argument("--workers", type=int, help="executor workers (default: CPU based)")
+    parser.add_argument("--processes", action="store_true",
+                        help="simulate in worker processes instead of threads")
+    args = parser.parse_args(argv)
+
+    pool = ProcessPoolExecutor if args.processes else ThreadPoolExecutor
+    executor = pool(max_workers=args.workers)
+    try:
+        asyncio.run(serve(
+            args.host, args.port, batch_window=args.batch_window / 1e3,
+            max_batch=args.max_batch, executor=executor
+        ))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Background execution of simulations for the Tk UI.
+
+Tk must only be touched from the main thread, so the worker thread never
+calls back directly: it posts messages on a queue that the UI drains
+from a ``master.after`` timer via :meth:`SimulationWorker.poll`. Nothing
+here imports tkinter.
+"""
+import queue
+import threading
+
+
+class Cancelled(Exception):
+    """Raised inside a job to stop it early."""
+
+
+class Job:
+    """Handle passed to the work function running on the worker thread."""
+
+    def __init__(self, job_id, messages):
+        self.id = job_id
+        self._messages = messages
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Raise :class:`Cancelled` if the job has been cancelled or superseded."""
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def report(self, done, total):
+        """Post progress; also a cancellation point for long loops."""
+        self.check()
+        self._messages.put((self.id, "progress", done / total if total else 1.0))
+
+
+class SimulationWorker:
+    """Runs one job at a time on a daemon thread; newer jobs supersede older ones.
+
+    Submitting while a job is in flight cancels it, and any result it still
+    produces is dropped by :meth:`poll`. Callbacks run on whichever thread
+    calls :meth:`poll`.
+    """
+
+    def __init__(self):
+        self._messages = queue.Queue()
+        self._next_id = 0
+        self._job = None
+        self._callbacks = None
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._job is not None
+
+    def submit(self, work, on_done, on_error=None, on_progress=None):
+        """Start ``work(job)`` in the background, cancelling any job in flight."""
+        self.cancel()
+        self._next_id += 1
+        job = Job(self._next_id, self._messages)
+        self._job = job
+        self._callbacks = (on_done, on_error, on_progress)
+        self._thread = threading.Thread(
+            target=self._run, args=(job, work), name=f"simulation-{job.id}", daemon=True
+        )
+        self._thread.start()
+        return job
+
+    def cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def poll(self):
+        """Deliver queued messages of the current job; stale ones are discarded."""
+        while True:
+            try:
+                job_id, kind, payload = self._messages.get_nowait()
+            except queue.Empty:
+                return
+            if self._job is None or job_id != self._job.id:
+                continue
+            on_done, on_error, on_progress = self._callbacks
+            if kind == "progress":
+                if on_progress:
+                    on_progress(payload)
+                continue
+            self._job = None
+            if kind == "done":
+                on_done(payload)
+            elif on_error:
+                on_error(payload)
+
+    def wait(self, timeout=None):
+        """Block until the current job's thread exits, then deliver its messages."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.poll()
+
+    def _run(self, job, work):
+        try:
+            result = work(job)
+        except Cancelled:
+            return
+        except Exception as e:
+            self._messages.put((job.id, "error", e))
+            return
+        self._messages.put((job.id, "done", result))
@@ -0,0 +1,216 @@
+"""Save and load simulations as JSON or as a compact binary file.
+
+The binary format is an 8-byte magic string, a little-endian uint64
+header length, a UTF-8 JSON header, zero padding to a 64-byte boundary,
+and then one contiguous little-endian float64 block per trajectory
+column. Because the columns are raw arrays at a known offset, loading
+memory-maps them and only the pages that are actually touched get read.
+
+A simulation made over terrain keeps the ground profile it was made on
+under ``"terrain"`` (as ``x`` and ``heights`` lists in either format).
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from adaptive_integrator import AdaptiveResult
+from batch_simulator import DEFAULT_DT
+from instrumentation import INSTRUMENTATION
+from terrain import Terrain
+from trajectory import Trajectory
+
+
+MAGIC = b"KINSIM\x00\x01"
+BINARY_EXTENSION = ".ksim"
+JSON_EXTENSION = ".json"
+_ALIGNMENT = 64
+_COLUMNS = ("t", "x", "y", "vx", "vy")
+_ADAPTIVE_STATS = ("steps", "rejected", "evaluations", "error_estimate")
+
+
+def _prefix(trajectory, meta):
+    """Magic, header and padding of the binary format, plus the column names."""
+    columns = [name for name in _COLUMNS if getattr(trajectory, name) is not None]
+    header = {"columns": columns, "length": len(trajectory), "meta": meta or {}}
+    if isinstance(trajectory, AdaptiveResult):
+        header["adaptive"] = {name: getattr(trajectory, name) for name in _ADAPTIVE_STATS}
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    prefix_length = len(MAGIC) + 8 + len(header_bytes)
+    padding = -prefix_length % _ALIGNMENT
+    prefix = MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes + b"\0" * padding
+    return prefix, columns
+
+
+def _column_bytes(trajectory, name):
+    return np.ascontiguousarray(getattr(trajectory, name), dtype="<f8").tobytes()
+
+
+def _parse_header(data, source):
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"{source} is not a binary simulation file")
+    (header_length,) = struct.unpack("<Q", bytes(data[len(MAGIC):len(MAGIC) + 8]))
+    return header_length
+
+
+def _make_trajectory(header, data):
+    arrays = dict(zip(header["columns"], data))
+    if "adaptive" in header:
+        return AdaptiveResult(**arrays, **header["adaptive"])
+    return Trajectory(**arrays)
+
+
+def write_trajectory(path, trajectory, meta=None):
+    """Write ``trajectory`` and a JSON-serializable ``meta`` dict in binary format."""
+    prefix, columns = _prefix(trajectory, meta)
+
+    # Write to a temporary file first so readers never see a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(prefix)
+        for name in columns:
+            f.write(_column_bytes(trajectory, name))
+    os.replace(tmp_path, path)
+
+
+def read_trajectory(path, mmap=True):
+    """Return ``(trajectory, meta)`` from a binary file.
+
+    With ``mmap`` the trajectory columns are read-only memory-mapped views
+    of the file rather than in-memory copies.
+    """
+    with open(path, "rb") as f:
+        header_length = _parse_header(f.read(len(MAGIC) + 8), path)
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    offset = len(MAGIC) + 8 + header_length
+    offset += -offset % _ALIGNMENT
+
+    shape = (len(header["columns"]), header["length"])
+    if shape[1] == 0:
+        data = np.empty(shape)
+    elif mmap:
+        data = np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=shape)
+    else:
+        data = np.fromfile(path, dtype="<f8", count=shape[0] * shape[1], offset=offset)
+        data = data.reshape(shape)
+    return _make_trajectory(header, data), header["meta"]
+
+
+def encode_trajectory(trajectory, meta=None):
+    """The binary file contents for ``trajectory``, as bytes (e.g. for a database blob)."""
+    prefix, columns = _prefix(trajectory, meta)
+    return b"".join([prefix] + [_column_bytes(trajectory, name) for name in columns])
+
+
+def decode_trajectory(data):
+    """Inverse of :func:`encode_trajectory`; the columns are read-only views of ``data``."""
+    header_length = _parse_header(data, "data")
+    start = len(MAGIC) + 8
+    header = json.loads(bytes(data[start:start + header_length]).decode("utf-8"))
+    offset = start + header_length
+    offset += -offset % _ALIGNMENT
+    shape = (len(header["columns"]), header["length"])
+    columns = np.frombuffer(data, dtype="<f8", count=shape[0] * shape[1], offset=offset)
+    return _make_trajectory(header, columns.reshape(shape)), header["meta"]
+
+
+def terrain_to_json(terrain):
+    """A ``Terrain`` (or ``None``) as JSON-serializable data."""
+    if terrain is None:
+        return None
+    return {"x": terrain.x.tolist(), "heights": terrain.heights.tolist()}
+
+
+def terrain_from_json(data):
+    """Inverse of :func:`terrain_to_json`."""
+    if data is None:
+        return None
+    return Terrain(data["x"], data["heights"])
+
+
+def _meta(simulation):
+    """Everything but the trajectory, with any terrain as JSON data."""
+    meta = {key: value for key, value in simulation.items() if key != "trajectory"}
+    if "terrain" in meta:
+        meta["terrain"] = terrain_to_json(meta["terrain"])
+    return meta
+
+
+def _from_meta(meta, trajectory):
+    simulation = {**meta, "trajectory": trajectory}
+    if "terrain" in simulation:
+        simulation["terrain"] = terrain_from_json(simulation["terrain"])
+    return simulation
+
+
+def is_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def simulation_to_json(simulation):
+    """Return ``simulation`` in the JSON save format.
+
+    Velocities and adaptive step statistics are kept when present, so
+    converting a binary save to JSON and back loses nothing.
+    """
+    trajectory = simulation["trajectory"]
+    data = {
+        **_meta(simulation),
+        "trajectory": trajectory.to_points(),
+        "t": trajectory.t.tolist(),
+    }
+    for name in ("vx", "vy"):
+        if getattr(trajectory, name) is not None:
+            data[name] = getattr(trajectory, name).tolist()
+    if isinstance(trajectory, AdaptiveResult):
+        data["adaptive"] = {name: getattr(trajectory, name) for name in _ADAPTIVE_STATS}
+    return data
+
+
+def simulation_from_json(data, dt=DEFAULT_DT):
+    """Inverse of :func:`simulation_to_json`; older saves without times use ``dt``."""
+    data = dict(data)
+    trajectory = Trajectory.from_points(
+        data["trajectory"], data["params"].get("dt", dt), t=data.pop("t", None)
+    )
+    vx, vy = data.pop("vx", None), data.pop("vy", None)
+    if vx is not None and vy is not None:
+        vx, vy = np.asarray(vx, dtype=np.float64), np.asarray(vy, dtype=np.float64)
+    else:
+        vx = vy = None
+    columns = (trajectory.t, trajectory.x, trajectory.y, vx, vy)
+    adaptive = data.pop("adaptive", None)
+    if adaptive is not None:
+        trajectory = AdaptiveResult(*columns, **adaptive)
+    else:
+        trajectory = Trajectory(*columns)
+    del data["trajectory"]
+    return _from_meta(data, trajectory)
+
+
+def save_simulation(path, simulation):
+    """Save as JSON if ``path`` ends in ``.json``, otherwise in binary format."""
+    with INSTRUMENTATION.span("save"):
+        if path.lower().endswith(JSON_EXTENSION):
+            with open(path, "w") as f:
+                json.dump(simulation_to_json(simulation), f, indent=4)
+        else:
+            write_trajectory(path, simulation["trajectory"], _meta(simulation))
+
+
+def load_simulation(path, dt=DEFAULT_DT, mmap=True):
+    """Load a simulation saved in either format, detected from the file contents."""
+    with INSTRUMENTATION.span("load"):
+        if is_binary(path):
+            trajectory, meta = read_trajectory(path, mmap=mmap)
+            return _from_meta(meta, trajectory)
+        with open(path, "r") as f:
+            return simulation_from_json(json.load(f), dt)
+
+
+def convert(src, dst, dt=DEFAULT_DT):
+    """Convert between the JSON and binary formats (chosen by ``dst``'s extension)."""
+    save_simulation(dst, load_simulation(src, dt=dt, mmap=False))
@@ -0,0 +1,212 @@
+import math
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch_simulator import DEFAULT_DT, DEFAULT_GRAVITY, MAX_STEPS, BatchSimulator
+
+
+GRID_FIELDS = ("v0", "theta", "x0", "y0", "air_resistance", "gravity")
+SUMMARY_FIELDS = ("range", "max_height", "time_of_flight", "landing_x", "points")
+DEFAULT_CHUNK_SIZE = 512
+
+# Per-process views of the shared buffers, set up by _init_worker
+_worker = {}
+
+
+def parameter_grid(v0, theta, x0=0.0, y0=0.0, air_resistance=0.0, gravity=DEFAULT_GRAVITY):
+    """Full factorial grid of launch conditions as flat arrays, in C (row-major) order."""
+    axes = [np.atleast_1d(np.asarray(a, dtype=np.float64)) for a in (v0, theta, x0, y0, air_resistance, gravity)]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return {name: m.ravel() for name, m in zip(GRID_FIELDS, mesh)}
+
+
+class SweepResult:
+    """Summaries (and optionally trajectories) for every shot of a sweep, in grid order.
+
+    ``completed`` marks the shots whose chunk finished; after a
+    cancellation the remaining entries are NaN.
+    """
+
+    def __init__(self, params, summary, completed, cancelled, dt, x=None, y=None):
+        self.params = params
+        self.range, self.max_height, self.time_of_flight, self.landing_x, points = summary
+        self.points = np.where(completed, points, 0).astype(np.int64)
+        self.completed = completed
+        self.cancelled = cancelled
+        self.dt = dt
+        self.x = x
+        self.y = y
+
+    def __len__(self):
+        return len(self.completed)
+
+    @property
+    def truncated(self):
+        """Shots whose stored trajectory was cut off at ``max_points``."""
+        if self.x is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.points > self.x.shape[1]
+
+
+class SweepExecutor:
+    """Runs a parameter grid across a process pool using shared-memory buffers.
+
+    The grid is split into chunks of ``chunk_size`` shots; each worker
+    integrates its chunk with ``BatchSimulator`` and writes the results
+    straight into shared arrays at the chunk's offsets. Only chunk bounds
+    travel through pickling, and the output order is the grid order no
+    matter which worker finishes first.
+    """
+
+    def __init__(self, processes=None, chunk_size=DEFAULT_CHUNK_SIZE, dt=DEFAULT_DT,
+                 max_steps=MAX_STEPS):
+        self.processes = processes or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.dt = dt
+        self.max_steps = max_steps
+
+    def run(self, grid, store_trajectories=False, max_points=None, progress=None, cancel=None):
+        """Simulate every shot of ``grid`` (as returned by :func:`parameter_grid`).
+
+        With ``store_trajectories`` the padded ``x``/``y`` arrays are kept,
+        ``max_points`` samples per shot (default: enough for the longest
+        drag-free flight). ``progress(done, total)`` is called as chunks
+        finish; setting ``cancel`` (a ``threading.Event``) stops the sweep.
+        Raises ``ValueError`` if any shot starts below the ground.
+        """
+        params = np.stack([np.asarray(grid[name], dtype=np.float64) for name in GRID_FIELDS])
+        if np.any(params[GRID_FIELDS.index("y0")] < 0):
+            raise ValueError("Initial Y position cannot be negative")
+        n = params.shape[1]
+        if store_trajectories and max_points is None:
+            max_points = self._default_max_points(params)
+        points = max_points if store_trajectories else 0
+
+        blocks = {
+            "params": ((len(GRID_FIELDS), n), params),
+            "summary": ((len(SUMMARY_FIELDS), n), np.nan),
+            "x": ((n, points), np.nan),
+            "y": ((n, points), np.nan),
+        }
+        shms = {}
+        try:
+            views = {}
+            for name, (shape, fill) in blocks.items():
+                size = max(int(np.prod(shape)) * 8, 1)
+                shms[name] = shared_memory.SharedMemory(create=True, size=size)
+                views[name] = np.ndarray(shape, dtype=np.float64, buffer=shms[name].buf)
+                views[name][...] = fill
+
+            chunks = [(start, min(start + self.chunk_size, n)) for start in range(0, n, self.chunk_size)]
+            completed = np.zeros(n, dtype=bool)
+            cancelled = self._execute(shms, n, points, chunks, completed, progress, cancel)
+
+            x = y = None
+            if store_trajectories:
+                x, y = views["x"].copy(), views["y"].copy()
+            result = SweepResult(
+                {name: params[i] for i, name in enumerate(GRID_FIELDS)},
+                views["summary"].copy(), completed, cancelled, self.dt, x, y
+            )
+            del views
+            return result
+        finally:
+            for shm in shms.values():
+                shm.close()
+                shm.unlink()
+
+    def _execute(self, shms, n, points, chunks, completed, progress, cancel):
+        init_args = ({name: shm.name for name, shm in shms.items()}, n, points, self.dt, self.max_steps)
+        done = 0
+
+        def finish(bounds):
+            nonlocal done
+            completed[bounds[0]:bounds[1]] = True
+            done += bounds[1] - bounds[0]
+            if progress:
+                progress(done, n)
+
+        if self.processes == 1 or len(chunks) <= 1:
+            _init_worker(*init_args)
+            try:
+                for bounds in chunks:
+                    if cancel is not None and cancel.is_set():
+                        return True
+                    finish(_run_chunk(bounds))
+            finally:
+                _release_worker()
+            return False
+
+        pool = multiprocessing.Pool(
+            min(self.processes, len(chunks)), initializer=_init_worker, initargs=init_args
+        )
+        try:
+            for bounds in pool.imap_unordered(_run_chunk, chunks):
+                finish(bounds)
+                if cancel is not None and cancel.is_set():
+                    pool.terminate()
+                    return True
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+        return False
+
+    def _default_max_points(self, params):
+        v0, theta, _, y0, _, gravity = params
+        vy = v0 * np.sin(np.radians(theta))
+        # Drag-free flight time; drag only shortens the flight on these trajectories
+        flight = (vy + np.sqrt(vy * vy + 2 * gravity * y0)) / gravity
+        return int(math.ceil(float(flight.max()) / self.dt)) + 2 if len(flight) else 1
+
+
+def _init_worker(names, n, points, dt, max_steps):
+    shapes = {
+        "params": (len(GRID_FIELDS), n),
+        "summary": (len(SUMMARY_FIELDS), n),
+        "x": (n, points),
+        "y": (n, points),
+    }
+    for name, shm_name in names.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker[name + "_shm"] = shm
+        _worker[name] = np.ndarray(shapes[name], dtype=np.float64, buffer=shm.buf)
+    _worker["points"] = points
+    _worker["simulator"] = BatchSimulator(dt=dt)
+    _worker["max_steps"] = max_steps
+
+
+def _release_worker():
+    shms = [value for key, value in _worker.items() if key.endswith("_shm")]
+    _worker.clear()
+    for shm in shms:
+        shm.close()
+
+
+def _run_chunk(bounds):
+    start, stop = bounds
+    v0, theta, x0, y0, drag, gravity = _worker["params"][:, start:stop]
+    simulator = _worker["simulator"]
+    batch = simulator.simulate_projectile_motion_batch(
+        v0, theta, x0, y0, air_resistance_coeff=drag, gravity=gravity,
+        max_steps=_worker["max_steps"]
+    )
+
+    rows = np.arange(stop - start)
+    last = np.maximum(batch.lengths - 1, 0)
+    landing_x = batch.x[rows, last]
+    summary = _worker["summary"]
+    summary[0, start:stop] = landing_x - x0
+    summary[1, start:stop] = np.nanmax(batch.y, axis=1)
+    summary[2, start:stop] = last * simulator.dt
+    summary[3, start:stop] = landing_x
+    summary[4, start:stop] = batch.lengths
+
+    points = min(_worker["points"], batch.x.shape[1])
+    if points:
+        _worker["x"][start:stop, :points] = batch.x[:, :points]
+        _worker["y"][start:stop, :points] = batch.y[:, :points]
+    return bounds
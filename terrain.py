@@ -0,0 +1,300 @@
+"""Ground profiles for launches over uneven terrain.
+
+A :class:`Terrain` is a polyline of ``(x, height)`` samples, built from
+explicit points or from a heightmap with uniform spacing; beyond its ends
+the ground continues level at the edge heights. Impact detection never
+scans the whole profile: a max-height pyramid (a segment tree over the
+polyline's segments) rejects path steps that pass above every segment in
+their x-range, and only the few segments under a step that could be hit
+are intersected exactly.
+"""
+import bisect
+import hashlib
+
+import numpy as np
+
+from batch_simulator import MAX_STEPS
+from trajectory import Trajectory
+
+
+CHUNK_STEPS = 1024
+SOLVER = "Fixed Step over terrain"
+# Level of the pyramid used to pre-filter whole chunks of path steps
+_BLOCK_LEVEL = 6
+# Stand-in for infinity for the level extensions past the profile's ends
+_FAR = 1e12
+
+
+class Impact:
+    """Where and when a flight met the ground; ``segment`` indexes the profile's segments
+    (-1 and ``len(x) - 1`` are the level extensions before and after it)."""
+
+    def __init__(self, t, x, y, vx, vy, segment):
+        self.t = t
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.segment = segment
+
+    @property
+    def speed(self):
+        return float(np.hypot(self.vx, self.vy))
+
+
+class Terrain:
+    """Piecewise-linear ground through ``(x[i], heights[i])``."""
+
+    def __init__(self, x, heights):
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        heights = np.ascontiguousarray(heights, dtype=np.float64)
+        if x.ndim != 1 or x.shape != heights.shape or len(x) < 2:
+            raise ValueError("Terrain needs at least two (x, height) samples")
+        if not (np.isfinite(x).all() and np.isfinite(heights).all()):
+            raise ValueError("Terrain samples must be finite")
+        if np.any(np.diff(x) <= 0):
+            raise ValueError("Terrain x positions must be strictly increasing")
+        self.x = x
+        self.heights = heights
+        self.peak = float(heights.max())
+        self.lowest = float(heights.min())
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(x.tobytes())
+        digest.update(heights.tobytes())
+        self.digest = digest.hexdigest()
+
+        # Profile with level extensions, so every x falls on some segment
+        self._x = np.concatenate(([x[0] - _FAR], x, [x[-1] + _FAR]))
+        self._h = np.concatenate(([heights[0]], heights, [heights[-1]]))
+        self._x_list = self._x.tolist()
+        self._h_list = self._h.tolist()
+        # Max-height pyramid: level 0 holds each segment's higher end,
+        # every next level the maximum of pairs from the level below
+        level = np.maximum(self._h[:-1], self._h[1:])
+        self._levels = [level]
+        while len(level) > 1:
+            if len(level) % 2:
+                level = np.append(level, -np.inf)
+            level = np.maximum(level[0::2], level[1::2])
+            self._levels.append(level)
+        self._level_lists = [level.tolist() for level in self._levels]
+
+    @classmethod
+    def from_heightmap(cls, heights, spacing=1.0, x0=0.0):
+        """Terrain from heights sampled every ``spacing`` metres from ``x0``."""
+        if spacing <= 0:
+            raise ValueError("Heightmap spacing must be positive")
+        heights = np.asarray(heights, dtype=np.float64)
+        return cls(x0 + spacing * np.arange(len(heights)), heights)
+
+    @classmethod
+    def flat(cls, height=0.0, x0=-1.0, x1=1.0):
+        return cls([x0, x1], [height, height])
+
+    def __len__(self):
+        return len(self.x)
+
+    def height(self, x):
+        """Ground height at ``x`` (scalar or array)."""
+        return np.interp(x, self.x, self.heights)
+
+    def max_height_between(self, x0, x1):
+        """Highest ground between ``x0`` and ``x1``."""
+        lo, hi = min(x0, x1), max(x0, x1)
+        # Samples strictly inside are the ends of the segments between the end segments
+        inner = self._range_max(self._segment(lo) + 1, self._segment(hi) - 1)
+        return max(float(self.height(lo)), float(self.height(hi)), inner)
+
+    def first_impact(self, x0, y0, x1, y1):
+        """First point where the straight step ``(x0, y0) → (x1, y1)`` goes below ground.
+
+        Returns ``(s, x, y, segment)`` with ``s`` the fraction of the step,
+        or ``None``. Touching the ground while rising is not an impact, so
+        a launch from the surface does not stop at once.
+        """
+        floor = min(y0, y1)
+        if floor > self.peak:
+            return None
+        i, j = self._segment(min(x0, x1)), self._segment(max(x0, x1))
+        if floor > self._range_max(i, j):
+            return None
+        if j - i > 8:
+            candidates = (np.flatnonzero(self._levels[0][i:j + 1] >= floor) + i).tolist()
+        else:
+            level = self._level_lists[0]
+            candidates = [k for k in range(i, j + 1) if level[k] >= floor]
+        if x1 < x0:
+            candidates.reverse()
+        for k in candidates:
+            hit = self._cross(k, x0, y0, x1, y1)
+            if hit is not None:
+                return hit[0], hit[1], hit[2], k - 1
+        return None
+
+    def impact_along(self, x, y):
+        """First impact along the sampled path ``(x[i], y[i])``.
+
+        Returns ``(i, s, x, y, segment)`` for a hit ``s`` of the way from
+        sample ``i`` to ``i + 1``, or ``None``. Steps are pre-filtered in
+        bulk against per-block maxima; only the remaining ones are
+        intersected one by one, in order.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) < 2:
+            return None
+        floor = np.minimum(y[:-1], y[1:])
+        steps = np.flatnonzero(floor <= self.peak)
+        if len(steps):
+            lo = np.minimum(x[steps], x[steps + 1])
+            hi = np.maximum(x[steps], x[steps + 1])
+            segments = np.searchsorted(self._x, np.concatenate((lo, hi)), side='right') - 1
+            segments = np.clip(segments, 0, len(self._levels[0]) - 1) >> _BLOCK_LEVEL
+            first, last = np.split(segments, 2)
+            blocks = self._levels[min(_BLOCK_LEVEL, len(self._levels) - 1)]
+            # Steps over more than two blocks are rare; leave them to the exact test
+            reach = np.maximum(blocks[np.minimum(first, len(blocks) - 1)],
+                               blocks[np.minimum(last, len(blocks) - 1)])
+            steps = steps[(floor[steps] <= reach) | (last - first > 1)]
+        for i in steps.tolist():
+            hit = self.first_impact(x[i], y[i], x[i + 1], y[i + 1])
+            if hit is not None:
+                return (i,) + hit
+        return None
+
+    def _segment(self, x):
+        """Index of the (extended) segment containing ``x``."""
+        i = bisect.bisect_right(self._x_list, x) - 1
+        return min(max(i, 0), len(self._x_list) - 2)
+
+    def _range_max(self, i, j):
+        """Highest point of segments ``i`` to ``j`` inclusive."""
+        best = -np.inf
+        j += 1
+        for level in self._level_lists:
+            if i >= j:
+                break
+            if i & 1:
+                best = max(best, level[i])
+                i += 1
+            if j & 1:
+                j -= 1
+                best = max(best, level[j])
+            i >>= 1
+            j >>= 1
+        return best
+
+    def _cross(self, k, x0, y0, x1, y1):
+        xa, xb = self._x_list[k], self._x_list[k + 1]
+        ha, hb = self._h_list[k], self._h_list[k + 1]
+        slope = (hb - ha) / (xb - xa)
+        dx, dy = x1 - x0, y1 - y0
+        # Part of the step above this segment, as fractions of the step
+        if dx:
+            s_start, s_end = sorted(((xa - x0) / dx, (xb - x0) / dx))
+            s_start, s_end = max(s_start, 0.0), min(s_end, 1.0)
+        elif xa <= x0 <= xb:
+            s_start, s_end = 0.0, 1.0
+        else:
+            return None
+        # Height above the ground line, linear along the step
+        gap = y0 - ha - slope * (x0 - xa)
+        closing = dy - slope * dx
+        if closing >= 0:
+            return None
+        s = max(-gap / closing, s_start)
+        if s > s_end:
+            return None
+        return s, x0 + s * dx, y0 + s * dy
+
+
+def simulate_over_terrain(params, terrain, max_steps=MAX_STEPS):
+    """Fixed-step flight over ``terrain``, ending at the impact point.
+
+    Drag-free flights are sampled from the exact solution; with drag the
+    launch is stepped like ``BatchSimulator``. Samples are produced and
+    checked ``CHUNK_STEPS`` at a time. Returns the trajectory, whose last
+    sample is the interpolated impact, and the :class:`Impact` (``None``
+    if ``max_steps`` ran out first).
+    """
+    v0, theta = params['v0'], params['theta']
+    x0, y0 = params['x0'], params['y0']
+    g, k, dt = params['gravity'], params['air_resistance'], params['dt']
+    theta_rad = np.radians(theta)
+    vx0, vy0 = v0 * np.cos(theta_rad), v0 * np.sin(theta_rad)
+    state = [x0, y0, vx0, vy0]
+
+    def drag_free(start, n):
+        t = (start + np.arange(n)) * dt
+        return x0 + vx0 * t, y0 + vy0 * t - 0.5 * g * t * t, np.full(n, vx0), vy0 - g * t
+
+    def stepped(start, n):
+        x, y, vx, vy = state
+        columns = np.empty((4, n))
+        for i in range(n):
+            columns[:, i] = x, y, vx, vy
+            speed = (vx * vx + vy * vy) ** 0.5
+            vx = vx - k * speed * vx * dt
+            vy = vy + (-g - k * speed * vy) * dt
+            x += vx * dt
+            y += vy * dt
+        state[:] = x, y, vx, vy
+        return columns
+
+    sample = drag_free if k == 0 else stepped
+    chunks = []
+    last = None
+    impact = None
+    step = 0
+    while step < max_steps:
+        n = min(CHUNK_STEPS, max_steps - step)
+        chunk = ((step + np.arange(n)) * dt, *sample(step, n))
+        # Prepend the previous chunk's last sample so the step between them is checked
+        path = chunk if last is None else tuple(
+            np.concatenate(([value], column)) for value, column in zip(last, chunk)
+        )
+        hit = terrain.impact_along(path[1], path[2])
+        if hit is None:
+            chunks.append(chunk)
+            last = tuple(column[-1] for column in chunk)
+            step += n
+            continue
+        i, s, hit_x, hit_y, segment = hit
+        t, _, _, vx, vy = path
+        impact = Impact(
+            float(t[i] + s * dt), hit_x, hit_y,
+            float(vx[i] + s * (vx[i + 1] - vx[i])), float(vy[i] + s * (vy[i + 1] - vy[i])),
+            segment
+        )
+        keep = i + 1 - (last is not None)
+        values = (impact.t, impact.x, impact.y, impact.vx, impact.vy)
+        chunks.append(tuple(np.append(column[:keep], value) for column, value in zip(chunk, values)))
+        break
+    return Trajectory(*(np.concatenate(columns) for columns in zip(*chunks))), impact
+
+
+def read_profile(path):
+    """``(x, heights)`` from a ``.npy`` or text/CSV file; ``x`` is ``None`` for a heightmap.
+
+    One column (or a 1-D array) is a heightmap; two columns are
+    ``x, height`` pairs. A non-numeric header line is skipped.
+    """
+    if path.lower().endswith(".npy"):
+        data = np.load(path)
+    else:
+        with open(path) as f:
+            first = f.readline()
+        try:
+            [float(value) for value in first.replace(",", " ").split()]
+            skip = 0
+        except ValueError:
+            skip = 1
+        data = np.loadtxt(path, delimiter="," if "," in first else None, skiprows=skip, ndmin=2)
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 2 and data.shape[1] == 1:
+        data = data[:, 0]
+    if data.ndim == 1:
+        return None, data
+    if data.ndim == 2 and data.shape[1] == 2:
+        return data[:, 0], data[:, 1]
+    raise ValueError("A terrain file needs one column of heights or two columns of x, height")
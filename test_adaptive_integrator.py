@@ -0,0 +1,56 @@
+import math
+import unittest
+
+from adaptive_integrator import AdaptiveSimulator
+from batch_simulator import BatchSimulator
+
+
+class TestAdaptiveSimulator(unittest.TestCase):
+    def test_drag_free_matches_closed_form(self):
+        v0, theta, g = 20.0, 45.0, 9.81
+        result = AdaptiveSimulator(gravity=g).simulate_projectile_motion_adaptive(v0, theta)
+
+        theta_rad = math.radians(theta)
+        self.assertAlmostEqual(result.range, v0 ** 2 * math.sin(2 * theta_rad) / g, places=8)
+        self.assertAlmostEqual(result.max_height, (v0 * math.sin(theta_rad)) ** 2 / (2 * g), places=8)
+        self.assertAlmostEqual(result.time_of_flight, 2 * v0 * math.sin(theta_rad) / g, places=8)
+        self.assertEqual(result.landing[1], 0.0)
+
+    def test_drag_landing_agrees_with_fine_fixed_step(self):
+        adaptive = AdaptiveSimulator(air_resistance_coeff=0.05, rtol=1e-8, atol=1e-8)
+        result = adaptive.simulate_projectile_motion_adaptive(30.0, 40.0, 0.0, 5.0)
+
+        fixed = BatchSimulator(air_resistance_coeff=0.05, dt=1e-4)
+        reference = fixed.simulate_projectile_motion_batch(30.0, 40.0, 0.0, 5.0)
+        n = reference.lengths[0]
+
+        self.assertAlmostEqual(result.range, reference.x[0, n - 1], delta=1e-2)
+        self.assertAlmostEqual(result.time_of_flight, n * fixed.dt, delta=1e-3)
+        # Far fewer right-hand-side evaluations than the fixed-step run
+        self.assertLess(result.evaluations, n / 100)
+
+    def test_reports_step_statistics(self):
+        loose = AdaptiveSimulator(air_resistance_coeff=0.1, rtol=1e-3, atol=1e-3)
+        tight = AdaptiveSimulator(air_resistance_coeff=0.1, rtol=1e-9, atol=1e-9)
+        r_loose = loose.simulate_projectile_motion_adaptive(25.0, 60.0)
+        r_tight = tight.simulate_projectile_motion_adaptive(25.0, 60.0)
+
+        self.assertGreater(r_tight.steps, r_loose.steps)
+        self.assertLess(r_tight.error_estimate, r_loose.error_estimate)
+        self.assertEqual(len(r_tight), len(r_tight.x))
+        self.assertEqual(r_tight.vx.shape, r_tight.x.shape)
+
+    def test_max_steps_bounds_rejected_steps(self):
+        # A tolerance this tight rejects step after step
+        strict = AdaptiveSimulator(rtol=1e-300, atol=1e-300)
+        result = strict.simulate_projectile_motion_adaptive(20.0, 45.0, max_steps=50)
+        self.assertGreater(result.rejected, 0)
+        self.assertLessEqual(result.steps + result.rejected, 50)
+
+    def test_rejects_launch_below_ground(self):
+        with self.assertRaises(ValueError):
+            AdaptiveSimulator().simulate_projectile_motion_adaptive(10.0, 45.0, 0.0, -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import math
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+
+
+def scalar_trajectory(v0, theta, x0, y0, k, g, dt):
+    """Reference one-shot loop using the simulator's update rule."""
+    theta_rad = math.radians(theta)
+    vx, vy = v0 * math.cos(theta_rad), v0 * math.sin(theta_rad)
+    x, y = x0, y0
+    trajectory = []
+    while y >= 0:
+        trajectory.append((x, y))
+        speed = math.hypot(vx, vy)
+        vx += -k * speed * vx * dt
+        vy += (-g - k * speed * vy) * dt
+        x += vx * dt
+        y += vy * dt
+    return trajectory
+
+
+class TestBatchSimulator(unittest.TestCase):
+    def test_matches_scalar_path(self):
+        v0 = np.array([20.0, 35.0, 5.0, 50.0])
+        theta = np.array([45.0, 30.0, 80.0, 10.0])
+        x0 = np.array([0.0, 1.0, -2.0, 0.0])
+        y0 = np.array([0.0, 3.0, 0.0, 10.0])
+        drag = np.array([0.0, 0.05, 0.1, 0.01])
+        gravity = np.array([9.81, 9.81, 1.62, 9.81])
+
+        sim = BatchSimulator(dt=0.01)
+        result = sim.simulate_projectile_motion_batch(
+            v0, theta, x0, y0, air_resistance_coeff=drag, gravity=gravity
+        )
+
+        self.assertEqual(result.x.shape, (4, result.lengths.max()))
+        for i in range(4):
+            expected = scalar_trajectory(
+                v0[i], theta[i], x0[i], y0[i], drag[i], gravity[i], sim.dt
+            )
+            self.assertEqual(result.lengths[i], len(expected))
+            np.testing.assert_allclose(
+                result.trajectory(i).points(), np.reshape(expected, (-1, 2)), rtol=1e-9, atol=1e-9
+            )
+            self.assertTrue(np.isnan(result.x[i, result.lengths[i]:]).all())
+
+    def test_scalar_parameters_broadcast(self):
+        sim = BatchSimulator(air_resistance_coeff=0.02)
+        result = sim.simulate_projectile_motion_batch(
+            np.linspace(10, 30, 5), 45.0
+        )
+        self.assertEqual(len(result), 5)
+        self.assertTrue(np.all(np.diff(result.lengths) > 0))
+        np.testing.assert_allclose(result.time_of_flight, (result.lengths - 1) * sim.dt)
+        self.assertAlmostEqual(result.time_of_flight[2], result.trajectory(2).time_of_flight)
+
+    def test_shot_below_ground_records_nothing(self):
+        result = BatchSimulator().simulate_projectile_motion_batch(
+            [10.0, 10.0], 45.0, y0=[-1.0, 0.0]
+        )
+        self.assertEqual(result.lengths[0], 0)
+        self.assertEqual(len(result.trajectory(0)), 0)
+        self.assertGreater(result.lengths[1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_compare_respects_direction_and_threshold(self):
+        baseline = {"results": {
+            "speed": benchmarks.metric(100.0, "steps/s"),
+            "latency": benchmarks.metric(10.0, "ms", higher_is_better=False),
+            "gone": benchmarks.metric(1.0, "ms"),
+        }}
+        current = {"results": {
+            "speed": benchmarks.metric(85.0, "steps/s"),
+            "latency": benchmarks.metric(9.0, "ms", higher_is_better=False),
+            "new": benchmarks.metric(1.0, "ms"),
+        }}
+        rows = {name: (change, regressed) for name, change, regressed in
+                benchmarks.compare(current, baseline, threshold=0.1)}
+
+        self.assertEqual(set(rows), {"speed", "latency"})
+        self.assertAlmostEqual(rows["speed"][0], -0.15)
+        self.assertTrue(rows["speed"][1])
+        self.assertFalse(rows["latency"][1])
+        self.assertFalse(benchmarks.compare(current, baseline, threshold=0.2)[0][2])
+
+    def test_results_file_and_baseline_exit_status(self):
+        status = benchmarks.main(["--quick", "-r", "1", "-o", self.path("run.json"), "simulate", "export"])
+        self.assertEqual(status, 0)
+        with open(self.path("run.json")) as f:
+            results = json.load(f)
+        self.assertIn("simulate[dt=0.01,drag=0.05]", results["results"])
+        self.assertEqual(results["results"]["export[csv]"]["unit"], "rows/s")
+
+        # A baseline ten times faster than anything achievable must fail the run
+        for result in results["results"].values():
+            result["value"] *= 10 if result["higher_is_better"] else 0.1
+        with open(self.path("fast.json"), "w") as f:
+            json.dump(results, f)
+        self.assertEqual(benchmarks.main(["--quick", "-r", "1", "-b", self.path("fast.json"), "export"]), 1)
+
+
+    def test_rendering_metrics_are_measured(self):
+        results = benchmarks.run_benchmarks(["rendering"], repeat=1, quick=True)
+        self.assertEqual(results["meta"]["skipped"], {})
+        self.assertEqual(results["results"]["plot_trajectory"]["unit"], "ms")
+        self.assertGreater(results["results"]["update_animation"]["value"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import cli
+from export import read_columnar
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_csv_input_to_json_summary_and_trajectories(self):
+        with open(self.path("runs.csv"), "w", newline='') as f:
+            f.write("v0,theta,air_resistance,integrator\n20,45,,\n30,30,0.05,adaptive\n")
+
+        status = cli.main([
+            self.path("runs.csv"), "-s", self.path("summary.json"),
+            "-t", self.path("runs.kcol"), "--dt", "0.005"
+        ])
+
+        self.assertEqual(status, 0)
+        with open(self.path("summary.json")) as f:
+            summaries = json.load(f)
+        self.assertEqual([s['solver'] for s in summaries], ["closed form", "Adaptive (RK45)"])
+        self.assertEqual(summaries[0]['dt'], 0.005)
+
+        columns = read_columnar(self.path("runs.kcol"))
+        self.assertEqual(sorted(set(columns['run_id'])), [0, 1])
+        self.assertEqual(len(columns['t']), sum(s['points'] for s in summaries))
+
+    def test_json_input_and_csv_summary(self):
+        with open(self.path("runs.json"), "w") as f:
+            json.dump({"runs": [{"v0": 10}, {"v0": 15, "air_resistance": 0.02}]}, f)
+
+        self.assertEqual(cli.main([self.path("runs.json"), "-s", self.path("summary.csv")]), 0)
+        with open(self.path("summary.csv"), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['run_id'] for row in rows], ["0", "1"])
+        self.assertEqual(rows[1]['solver'], "Fixed Step")
+
+    def test_summary_only(self):
+        with open(self.path("runs.json"), "w") as f:
+            json.dump([{"v0": 20, "air_resistance": 0.05, "dt": 0.001}], f)
+
+        self.assertEqual(cli.main([self.path("runs.json"), "--summary-only",
+                                   "-s", self.path("summary.json")]), 0)
+        with open(self.path("summary.json")) as f:
+            summary, = json.load(f)
+        self.assertIn('impact_angle', summary)
+        self.assertNotIn('points', summary)
+        with self.assertRaises(SystemExit):
+            cli.main([self.path("runs.json"), "--summary-only", "-t", self.path("runs.csv")])
+
+    def test_terrain(self):
+        with open(self.path("runs.json"), "w") as f:
+            json.dump([{"v0": 20, "y0": 3}, {"v0": 20, "y0": 3, "air_resistance": 0.05}], f)
+        with open(self.path("hill.csv"), "w") as f:
+            f.write("height\n2\n2\n6\n1\n")
+
+        self.assertEqual(cli.main([self.path("runs.json"), "--terrain", self.path("hill.csv"),
+                                   "--terrain-spacing", "10", "-s", self.path("summary.json")]), 0)
+        with open(self.path("summary.json")) as f:
+            summaries = json.load(f)
+        self.assertEqual({s['solver'] for s in summaries}, {"Fixed Step over terrain"})
+        self.assertTrue(all(s['impact_y'] >= 1 for s in summaries))
+        with self.assertRaises(SystemExit):
+            cli.main([self.path("runs.json"), "--summary-only", "--terrain", self.path("hill.csv")])
+
+    def test_invalid_run_reports_error(self):
+        with open(self.path("bad.json"), "w") as f:
+            json.dump([{"v0": 10}, {"theta": 120}], f)
+        self.assertEqual(cli.main([self.path("bad.json"), "-s", self.path("s.csv")]), 1)
+
+    def test_cold_start_skips_gui_libraries(self):
+        code = "import sys, cli; print('tkinter' in sys.modules, 'matplotlib' in sys.modules)"
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(os.path.abspath(cli.__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.split(), ["False", "False"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import math
+import unittest
+
+import numpy as np
+
+from adaptive_integrator import AdaptiveSimulator
+from closed_form import DragFreeSolution
+
+
+class TestDragFreeSolution(unittest.TestCase):
+    def test_level_ground_formulas(self):
+        v0, theta, g = 20.0, 45.0, 9.81
+        solution = DragFreeSolution(v0, theta, gravity=g)
+        theta_rad = math.radians(theta)
+
+        self.assertAlmostEqual(solution.range, v0 ** 2 * math.sin(2 * theta_rad) / g)
+        self.assertAlmostEqual(solution.max_height, (v0 * math.sin(theta_rad)) ** 2 / (2 * g))
+        self.assertAlmostEqual(solution.time_of_flight, 2 * v0 * math.sin(theta_rad) / g)
+
+    def test_elevated_launch_matches_integrator(self):
+        solution = DragFreeSolution(15.0, 30.0, 2.0, 10.0, gravity=3.71)
+        result = AdaptiveSimulator(gravity=3.71).simulate_projectile_motion_adaptive(
+            15.0, 30.0, 2.0, 10.0
+        )
+        self.assertAlmostEqual(solution.range, result.range, places=6)
+        self.assertAlmostEqual(solution.max_height, result.max_height, places=6)
+        self.assertAlmostEqual(solution.time_of_flight, result.time_of_flight, places=6)
+
+    def test_horizontal_launch_apex_is_start(self):
+        solution = DragFreeSolution(10.0, 0.0, 0.0, 5.0)
+        self.assertEqual(solution.apex_time, 0.0)
+        self.assertEqual(solution.max_height, 5.0)
+
+    def test_vectorized_parameters(self):
+        theta = np.array([15.0, 45.0, 75.0])
+        solution = DragFreeSolution(20.0, theta)
+        np.testing.assert_allclose(solution.range[0], solution.range[2])
+        self.assertEqual(solution.range.argmax(), 1)
+
+    def test_sampling_on_request(self):
+        solution = DragFreeSolution(20.0, 45.0)
+        t, x, y = solution.sample(dt=0.01)
+        self.assertTrue(np.all(y >= 0))
+        np.testing.assert_allclose(np.diff(t), 0.01)
+
+        t, x, y = solution.sample(num_points=50)
+        self.assertEqual(len(t), 50)
+        self.assertAlmostEqual(t[-1], solution.time_of_flight)
+        self.assertEqual(y[-1], 0.0)
+        trajectory = solution.trajectory(num_points=50)
+        self.assertEqual(len(trajectory), 50)
+        self.assertAlmostEqual(trajectory.range, solution.range)
+        self.assertAlmostEqual(trajectory.vy[-1], -trajectory.vy[0])
+
+        with self.assertRaises(ValueError):
+            solution.sample()
+
+
+if __name__ == "__main__":
+    unittest.main()
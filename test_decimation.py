@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from decimation import minmax_indices, visible_range
+
+
+class TestDecimation(unittest.TestCase):
+    def setUp(self):
+        self.t = np.linspace(0.0, 3.0, 100_001)
+        self.y = 15.0 * self.t - 4.905 * self.t ** 2
+
+    def test_budget_and_key_points(self):
+        apex = int(np.argmax(self.y))
+        idx = minmax_indices(self.y, 1000, keep=[apex])
+
+        self.assertLessEqual(len(idx), 1000)
+        self.assertEqual(idx[0], 0)
+        self.assertEqual(idx[-1], len(self.y) - 1)
+        self.assertIn(apex, idx)
+        self.assertTrue(np.all(np.diff(idx) > 0))
+
+    def test_preserves_spikes(self):
+        y = np.zeros(50_000)
+        y[12_345] = 10.0
+        y[40_000] = -5.0
+        idx = minmax_indices(y, 200)
+        self.assertIn(12_345, idx)
+        self.assertIn(40_000, idx)
+
+    def test_short_input_is_untouched(self):
+        np.testing.assert_array_equal(minmax_indices(self.y[:50], 100), np.arange(50))
+
+    def test_visible_range(self):
+        x = np.arange(10.0)
+        self.assertEqual(visible_range(x, 2.5, 5.5), (2, 7))
+        self.assertEqual(visible_range(x, -5.0, 50.0), (0, 10))
+        self.assertEqual(visible_range(x, 20.0, 30.0), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+from export import StreamingExporter, export_trajectories, read_columnar
+from trajectory import Trajectory
+
+
+class TestStreamingExporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.batch = BatchSimulator(air_resistance_coeff=0.02).simulate_projectile_motion_batch(
+            np.array([10.0, 20.0, 30.0]), 45.0
+        )
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_single_run_csv_matches_rows(self):
+        trajectory = self.batch.trajectory(1)
+        rows = export_trajectories(self.path("run.csv"), [(0, trajectory)], run_ids=False)
+
+        with open(self.path("run.csv"), newline='') as f:
+            data = list(csv.reader(f))
+        self.assertEqual(data[0], ["Time (s)", "X-Position (m)", "Y-Position (m)"])
+        self.assertEqual(rows, len(trajectory))
+        # Lossless: every float64 reads back bit for bit
+        np.testing.assert_array_equal(
+            np.array(data[1:], dtype=float), np.column_stack((trajectory.t, trajectory.x, trajectory.y))
+        )
+
+    def test_sweep_in_small_chunks_with_gzip(self):
+        with StreamingExporter(self.path("sweep.csv.gz"), compress=True, chunk_rows=37) as exporter:
+            exporter.write_batch(self.batch, run_ids=[7, 8, 9])
+
+        with gzip.open(self.path("sweep.csv.gz"), "rt") as f:
+            data = list(csv.reader(f))
+        self.assertEqual(data[0][0], "Run ID")
+        run_ids = np.array([row[0] for row in data[1:]], dtype=int)
+        np.testing.assert_array_equal(np.bincount(run_ids)[7:], self.batch.lengths)
+
+    def test_columnar_round_trip(self):
+        runs = [(i, self.batch.trajectory(i)) for i in range(len(self.batch))]
+        for name in ("sweep.kcol", "sweep.kcol.gz"):
+            export_trajectories(self.path(name), runs, chunk_rows=50)
+            columns = read_columnar(self.path(name))
+
+            shot = columns['run_id'] == 2
+            np.testing.assert_array_equal(columns['x'][shot], self.batch.trajectory(2).x)
+            self.assertEqual(len(columns['t']), self.batch.lengths.sum())
+
+    def test_empty_trajectory(self):
+        empty = Trajectory([], [], [])
+        self.assertEqual(export_trajectories(self.path("empty.kcol"), [(0, empty)]), 0)
+        self.assertEqual(len(read_columnar(self.path("empty.kcol"))['x']), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import math
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+from flight_summary import (
+    adaptive_summary, closed_form_summary, fixed_step_summary, fixed_step_summary_batch
+)
+
+
+class TestFlightSummary(unittest.TestCase):
+    def test_closed_form(self):
+        summary = closed_form_summary(20.0, 45.0)
+        self.assertAlmostEqual(summary.range, 400 / 9.81)
+        self.assertAlmostEqual(summary.apex_time, summary.time_of_flight / 2)
+        self.assertAlmostEqual(summary.apex_x, summary.range / 2)
+        # Level ground: the projectile lands as fast and as steeply as it left
+        self.assertAlmostEqual(summary.impact_speed, 20.0)
+        self.assertAlmostEqual(summary.impact_angle, 45.0)
+
+    def test_fixed_step_matches_stored_trajectory(self):
+        simulator = BatchSimulator(air_resistance_coeff=0.05, dt=0.01)
+        points = simulator.simulate_projectile_motion(20.0, 45.0, 0.0, 0.0)
+        x, y = np.array(points).T
+        summary = fixed_step_summary(20.0, 45.0, air_resistance_coeff=0.05, dt=0.01)
+
+        # Refined apex and landing lie between the samples and the next step
+        self.assertGreaterEqual(summary.max_height, y.max())
+        self.assertLess(summary.max_height - y.max(), 1e-3)
+        self.assertAlmostEqual(summary.apex_x, x[np.argmax(y)], delta=0.1)
+        self.assertGreaterEqual(summary.landing_x, x[-1])
+        self.assertLess(summary.landing_x - x[-1], 0.1)
+        self.assertGreaterEqual(summary.time_of_flight, (len(points) - 1) * 0.01)
+        self.assertGreater(summary.impact_angle, 45.0)
+
+    def test_fixed_step_converges_to_exact(self):
+        exact = closed_form_summary(15.0, 30.0, 2.0, 10.0, gravity=3.71)
+        summary = fixed_step_summary(15.0, 30.0, 2.0, 10.0, gravity=3.71, dt=1e-4)
+        for name in ("apex_time", "apex_x", "max_height", "landing_time", "landing_x",
+                     "impact_speed", "impact_angle"):
+            self.assertAlmostEqual(getattr(summary, name), getattr(exact, name), delta=5e-3)
+
+    def test_adaptive_keeps_only_key_samples(self):
+        summary, result = adaptive_summary(20.0, 45.0, air_resistance_coeff=0.05, tolerance=1e-9)
+        self.assertEqual(len(result), 3)
+        fine = fixed_step_summary(20.0, 45.0, air_resistance_coeff=0.05, dt=1e-4)
+        # The fixed-step update is first order, so agreement is to about dt
+        self.assertAlmostEqual(summary.range, fine.range, delta=5e-3)
+        self.assertAlmostEqual(summary.max_height, fine.max_height, delta=5e-3)
+        self.assertAlmostEqual(summary.impact_speed, fine.impact_speed, delta=5e-3)
+
+    def test_batch_matches_scalar(self):
+        v0, theta, drag, y0 = [5.0, 20.0, 40.0], [0.0, 45.0, 80.0], [0.05, 0.0, 0.01], [3.0, 0.0, 0.0]
+        batch = fixed_step_summary_batch(v0, theta, 0.0, y0, drag, dt=0.005)
+        for i in range(3):
+            summary = fixed_step_summary(v0[i], theta[i], 0.0, y0[i], drag[i], dt=0.005)
+            for name in ("apex_time", "apex_x", "max_height", "landing_time", "landing_x",
+                         "impact_speed", "impact_angle"):
+                self.assertAlmostEqual(getattr(batch, name)[i], getattr(summary, name), places=12)
+
+    def test_horizontal_launch(self):
+        summary = fixed_step_summary(10.0, 0.0, 0.0, 5.0, dt=0.001)
+        self.assertEqual(summary.apex_time, 0.0)
+        self.assertEqual(summary.max_height, 5.0)
+        self.assertAlmostEqual(summary.time_of_flight, math.sqrt(2 * 5.0 / 9.81), places=3)
+
+    def test_negative_height_rejected(self):
+        with self.assertRaisesRegex(ValueError, "cannot be negative"):
+            fixed_step_summary(10.0, 45.0, 0.0, -1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from instrumentation import Instrumentation, format_report
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_is_a_no_op(self):
+        instrumentation = Instrumentation()
+        with instrumentation.span("integrate"):
+            pass
+        instrumentation.count("points", 10)
+        instrumentation.begin_run("simulate")
+        self.assertIsNone(instrumentation.end_run())
+        self.assertEqual(instrumentation.snapshot(), {"spans": {}, "counters": {}})
+        # Every disabled span is the same shared object
+        self.assertIs(instrumentation.span("a"), instrumentation.span("b"))
+
+    def test_spans_and_counters(self):
+        instrumentation = Instrumentation(enabled=True)
+        for _ in range(3):
+            with instrumentation.span("integrate"):
+                pass
+        instrumentation.record("canvas_draw", 0.25)
+        instrumentation.count("points", 5)
+        instrumentation.count("points", 7)
+
+        snapshot = instrumentation.snapshot()
+        self.assertEqual(snapshot["spans"]["integrate"]["count"], 3)
+        self.assertEqual(snapshot["spans"]["canvas_draw"]["total_ms"], 250.0)
+        self.assertEqual(snapshot["counters"], {"points": 12})
+
+        instrumentation.reset()
+        self.assertEqual(instrumentation.snapshot(), {"spans": {}, "counters": {}})
+
+    def test_run_record(self):
+        instrumentation = Instrumentation(enabled=True)
+        instrumentation.record("integrate", 0.5)
+        instrumentation.begin_run("simulate")
+        instrumentation.record("integrate", 0.25)
+        instrumentation.record("integrate", 0.75)
+        instrumentation.count("points", 3)
+        record = instrumentation.end_run()
+
+        # Only what happened during the run is in its record
+        self.assertEqual(record["label"], "simulate")
+        self.assertEqual(record["spans"]["integrate"],
+                         {"count": 2, "total_ms": 1000.0, "max_ms": 750.0})
+        self.assertEqual(record["counters"], {"points": 3})
+        self.assertGreaterEqual(record["wall_ms"], 0)
+        self.assertEqual(instrumentation.snapshot()["spans"]["integrate"]["count"], 3)
+        self.assertIsNone(instrumentation.end_run())
+
+        instrumentation.begin_run("cancelled")
+        instrumentation.discard_run()
+        self.assertIsNone(instrumentation.end_run())
+
+        report = format_report(record, "Last run:")
+        self.assertEqual(report[0], "Last run:")
+        self.assertIn("integrate", report[2])
+
+    def test_bound_thread_stays_out_of_later_runs(self):
+        instrumentation = Instrumentation(enabled=True)
+        superseded = threading.Event()
+
+        def work(run):
+            with instrumentation.bind_run(run):
+                instrumentation.record("integrate", 0.5)
+                superseded.wait()
+                instrumentation.record("integrate", 0.5)
+                instrumentation.count("points", 100)
+
+        thread = threading.Thread(target=work, args=(instrumentation.begin_run("old"),))
+        thread.start()
+        instrumentation.discard_run()
+        instrumentation.begin_run("new")
+        superseded.set()
+        thread.join()
+        instrumentation.record("render_text", 0.1)
+        record = instrumentation.end_run()
+
+        self.assertEqual(list(record["spans"]), ["render_text"])
+        self.assertEqual(record["counters"], {})
+        # The work did happen, so it still counts in the totals
+        self.assertEqual(instrumentation.snapshot()["spans"]["integrate"]["count"], 2)
+
+        run = instrumentation.begin_run("current")
+        with instrumentation.bind_run(run):
+            instrumentation.record("integrate", 0.25)
+        self.assertIn("integrate", instrumentation.end_run()["spans"])
+
+    def test_runs_are_logged_as_json_lines(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "timings.jsonl")
+            instrumentation = Instrumentation(enabled=True, log_path=path)
+            for label in ("simulate", "save"):
+                instrumentation.begin_run(label)
+                instrumentation.record(label, 0.001)
+                instrumentation.end_run()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([r["label"] for r in records], ["simulate", "save"])
+            self.assertIn("save", records[1]["spans"])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import math
+import unittest
+
+import numpy as np
+
+from closed_form import DragFreeSolution
+from inverse_solver import InverseSolver, _brent, _height_at
+from kinematics_core import ADAPTIVE
+
+
+class TestInverseSolver(unittest.TestCase):
+    def test_drag_free_angles_match_analytic(self):
+        solver = InverseSolver(dict(v0=20.0))
+        solution = solver.solve_angle(30.0)
+
+        # Range is v0**2 sin(2 theta) / g, so the two arcs are complementary
+        low = math.degrees(math.asin(30.0 * 9.81 / 400)) / 2
+        self.assertAlmostEqual(solution.low, low, places=5)
+        self.assertAlmostEqual(solution.high, 90 - low, places=5)
+        self.assertAlmostEqual(solution.optimal_angle, 45.0, places=5)
+        self.assertAlmostEqual(solution.max_range, 400 / 9.81, places=6)
+        self.assertEqual(solution.calls, solver.calls)
+
+    def test_target_point_under_drag(self):
+        solver = InverseSolver(dict(air_resistance=0.05, integrator=ADAPTIVE, tolerance=1e-9))
+        solution = solver.solve_angle(10.0, 2.0)
+
+        self.assertEqual(len(solution.angles), 2)
+        self.assertLess(solution.optimal_angle, 45.0)
+        for theta in solution.angles:
+            self.assertAlmostEqual(_height_at(solver.shoot(20.0, theta), 10.0), 2.0, places=4)
+
+    def test_unreachable_target(self):
+        solution = InverseSolver().solve_angle(50.0)
+        self.assertFalse(solution.reachable)
+        self.assertIsNone(solution.low)
+        with self.assertRaisesRegex(ValueError, "in front of the launch point"):
+            InverseSolver(dict(x0=5.0)).solve_angle(2.0)
+
+    def test_earlier_shots_are_reused(self):
+        solver = InverseSolver(dict(air_resistance=0.02))
+        first = solver.solve_angle(15.0)
+        second = solver.solve_angle(16.0)
+        self.assertLess(second.calls, first.calls)
+        # Repeating a solve needs no new simulations at all
+        self.assertEqual(solver.solve_angle(15.0).calls, 0)
+
+    def test_minimum_speed(self):
+        solution = InverseSolver().solve_speed(30.0)
+        self.assertAlmostEqual(solution.v0, math.sqrt(9.81 * 30.0), places=4)
+        self.assertAlmostEqual(solution.theta, 45.0, places=2)
+
+        # Drag costs speed, and the optimal angle drops below 45 degrees
+        dragged = InverseSolver(dict(air_resistance=0.05, integrator=ADAPTIVE)).solve_speed(10.0)
+        self.assertGreater(dragged.v0, math.sqrt(9.81 * 10.0))
+        self.assertLess(dragged.theta, 45.0)
+
+    def test_height_past_landing_keeps_falling(self):
+        trajectory = DragFreeSolution(10.0, 45.0).trajectory(dt=0.01)
+        heights = [_height_at(trajectory, x) for x in np.linspace(9.0, 12.0, 7)]
+        self.assertTrue(np.all(np.diff(heights) < 0))
+        self.assertAlmostEqual(_height_at(trajectory, 100 / 9.81), 0.0, places=9)
+
+    def test_brent(self):
+        root = _brent(lambda x: x ** 3 - 2, 0.0, 2.0, -2.0, 6.0, 1e-12)
+        self.assertAlmostEqual(root, 2 ** (1 / 3), places=11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from adaptive_integrator import AdaptiveResult
+from batch_simulator import BatchSimulator
+from kinematics_core import (
+    ADAPTIVE, cache_key, compute_summaries, compute_summary, compute_trajectories,
+    compute_trajectory, format_results, make_params, summarize
+)
+
+
+class TestKinematicsCore(unittest.TestCase):
+    def test_make_params_fills_defaults_and_converts(self):
+        params = make_params(v0="30", theta="60", unknown="ignored")
+        self.assertEqual(params['v0'], 30.0)
+        self.assertEqual(params['gravity'], 9.81)
+        self.assertNotIn('unknown', params)
+
+    def test_validation_messages(self):
+        with self.assertRaisesRegex(ValueError, "Initial velocity must be positive"):
+            make_params(v0=0)
+        with self.assertRaisesRegex(ValueError, "Angle must be between"):
+            make_params(theta=95)
+        with self.assertRaisesRegex(ValueError, "Unknown integrator"):
+            make_params(integrator="Verlet")
+
+    def test_dispatch_by_drag_and_integrator(self):
+        drag_free = make_params()
+        summary = summarize(drag_free, compute_trajectory(drag_free))
+        self.assertEqual(summary['solver'], "closed form")
+        self.assertAlmostEqual(summary['range'], 400 / 9.81)
+
+        adaptive = make_params(air_resistance=0.05, integrator=ADAPTIVE)
+        self.assertIsInstance(compute_trajectory(adaptive), AdaptiveResult)
+
+        fixed = make_params(air_resistance=0.05, dt=0.005)
+        simulator = BatchSimulator()
+        trajectory = compute_trajectory(fixed, simulator)
+        self.assertEqual(simulator.dt, 0.005)
+        self.assertAlmostEqual(trajectory.t[1], 0.005)
+
+    def test_summary_only_matches_full_run(self):
+        for params in (make_params(), make_params(air_resistance=0.05, integrator=ADAPTIVE)):
+            full = summarize(params, compute_trajectory(params))
+            summary = compute_summary(params)
+            self.assertEqual(summary['solver'], full['solver'])
+            for key in ('max_height', 'range', 'time_of_flight'):
+                self.assertAlmostEqual(summary[key], full[key], places=9)
+        lines = format_results(params, summary)
+        self.assertTrue(any(line.startswith("- Impact:") for line in lines))
+
+        fixed = make_params(air_resistance=0.05)
+        summary = compute_summary(fixed)
+        self.assertNotIn('points', summary)
+        self.assertGreater(summary['landing_x'], compute_trajectory(fixed).x[-1])
+
+    def test_batched_runs_match_single_runs(self):
+        param_sets = [
+            make_params(theta=theta, air_resistance=drag, dt=dt)
+            for theta in (10, 45, 80) for drag in (0.0, 0.02, 0.1) for dt in (0.01, 0.005)
+        ] + [make_params(air_resistance=0.05, integrator=ADAPTIVE)]
+        for params, summary in zip(param_sets, compute_summaries(param_sets)):
+            expected = compute_summary(params)
+            self.assertEqual(summary.keys(), expected.keys())
+            for key in ('max_height', 'range', 'apex_time', 'impact_angle'):
+                self.assertAlmostEqual(summary[key], expected[key], places=12)
+        for params, trajectory in zip(param_sets, compute_trajectories(param_sets)):
+            expected = compute_trajectory(params)
+            self.assertEqual(len(trajectory), len(expected))
+            self.assertAlmostEqual(trajectory.x[-1], expected.x[-1], places=12)
+
+    def test_cache_key_ignores_unused_settings(self):
+        self.assertEqual(cache_key(make_params(tolerance=1e-3)), cache_key(make_params(tolerance=1e-9)))
+        self.assertNotEqual(
+            cache_key(make_params(air_resistance=0.1, integrator=ADAPTIVE, tolerance=1e-3)),
+            cache_key(make_params(air_resistance=0.1, integrator=ADAPTIVE, tolerance=1e-9)),
+        )
+
+    def test_format_results(self):
+        params = make_params(air_resistance=0.1, integrator=ADAPTIVE)
+        lines = format_results(params, summarize(params, compute_trajectory(params)))
+        self.assertIn("- Air Resistance: 0.1000", lines)
+        self.assertTrue(any(line.startswith("- Steps Taken:") for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from flight_summary import fixed_step_summary
+from kinematics_core import compute_summary, make_params
+from lookup_table import LINEAR, OUTPUTS, LookupTable, build_table
+
+
+class TestLookupTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = build_table(
+            np.linspace(10.0, 40.0, 31), np.linspace(10.0, 80.0, 36), np.linspace(0.0, 0.1, 11)
+        )
+
+    def truth(self, v0, theta, drag):
+        summary = fixed_step_summary(v0, theta, 0.0, 0.0, drag)
+        return {name: getattr(summary, name) for name in OUTPUTS}
+
+    def test_grid_nodes_are_exact(self):
+        result = self.table.query(20.0, 46.0, 0.05, max_error=0.0)
+        self.assertEqual(result['source'], "table")
+        for name, value in self.truth(20.0, 46.0, 0.05).items():
+            self.assertAlmostEqual(result[name], value, places=9)
+            self.assertAlmostEqual(result['error_estimate'][name], 0.0, places=9)
+
+    def test_interpolation_within_tolerance(self):
+        rng = np.random.default_rng(0)
+        hits = self.table.hits
+        for v0, theta, drag in rng.uniform([15, 20, 0.0], [35, 70, 0.1], (20, 3)):
+            result = self.table.query(v0, theta, drag, max_error=1e-2)
+            truth = self.truth(v0, theta, drag)
+            for name in OUTPUTS:
+                self.assertAlmostEqual(result[name], truth[name], delta=1e-2 * abs(truth[name]))
+        self.assertGreater(self.table.hits - hits, 10)
+
+    def test_vectorized_matches_scalar(self):
+        v0, theta, drag = np.array([12.3, 25.0, 39.9]), np.array([15.0, 44.4, 79.0]), 0.033
+        values, errors = self.table.interpolate(v0, theta, drag, method=LINEAR)
+        for i in range(3):
+            result = self.table.query(v0[i], theta[i], drag, max_error=1.0, method=LINEAR)
+            for name in OUTPUTS:
+                self.assertAlmostEqual(result[name], values[name][i], places=9)
+                self.assertAlmostEqual(result['error_estimate'][name], errors[name][i], places=9)
+        self.assertTrue(np.all(self.table.contains(v0, theta, drag)))
+
+    def test_fallback_outside_grid_or_loose_estimate(self):
+        # The fallback answers exactly as a direct run, closed form included
+        for v0, theta, drag in ((60.0, 45.0, 0.05), (60.0, 45.0, 0.0)):
+            outside = self.table.query(v0, theta, drag)
+            self.assertEqual(outside['source'], "simulator")
+            direct = compute_summary(make_params(v0=v0, theta=theta, air_resistance=drag))
+            for name in OUTPUTS:
+                self.assertEqual(outside[name], direct[name])
+
+        # No interpolated answer has a zero error estimate between nodes
+        fallbacks = self.table.fallbacks
+        self.assertEqual(self.table.query(20.5, 45.5, 0.055, max_error=0.0)['source'], "simulator")
+        self.assertEqual(self.table.fallbacks, fallbacks + 1)
+
+        with self.assertRaisesRegex(ValueError, "Initial velocity must be positive"):
+            self.table.query(-1.0, 45.0, 0.05)
+
+    def test_save_and_load(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "table.npz")
+            self.table.save(path)
+            loaded = LookupTable.load(path)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(loaded.shape, self.table.shape)
+        self.assertEqual((loaded.gravity, loaded.dt), (self.table.gravity, self.table.dt))
+        self.assertEqual(loaded.query(22.2, 33.3, 0.044), self.table.query(22.2, 33.3, 0.044))
+
+    def test_invalid_axes(self):
+        values = {name: np.zeros((2, 2, 2)) for name in OUTPUTS}
+        with self.assertRaisesRegex(ValueError, "strictly increasing"):
+            LookupTable([1.0, 1.0], [0.0, 1.0], [0.0, 1.0], values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,10 @@
+import unittest
+
+# The Tk UI tests live next to the UI in main.py (``python main.py --test``);
+# importing them here runs them with the rest of the suite. They are
+# skipped when no display is available.
+from main import TestKinematicsSimulator  # noqa: F401
+
+
+if __name__ == "__main__":
+    unittest.main()
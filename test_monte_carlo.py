@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+from monte_carlo import (
+    MonteCarloSimulator, Normal, RunningStats, StreamingHistogram, Uniform
+)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def test_fixed_inputs_match_batch_simulator(self):
+        result = MonteCarloSimulator(chunk_size=3).run(20.0, 45.0, 0.02, shots=10)
+        trajectory = BatchSimulator(air_resistance_coeff=0.02).simulate_projectile_motion_batch(
+            20.0, 45.0
+        ).trajectory(0)
+
+        self.assertEqual(result.stats['landing_x'].count, 10)
+        self.assertAlmostEqual(result.stats['landing_x'].mean, trajectory.x[-1])
+        self.assertAlmostEqual(result.stats['max_height'].mean, trajectory.max_height)
+        self.assertAlmostEqual(result.stats['time_of_flight'].mean, trajectory.time_of_flight)
+        self.assertAlmostEqual(result.stats['landing_x'].std, 0.0)
+
+        # Bands reproduce the single trajectory wherever it passes
+        bands = result.bands
+        seen = bands.count > 0
+        np.testing.assert_allclose(
+            bands.mean[seen], np.interp(bands.x[seen], trajectory.x, trajectory.y), atol=1e-9
+        )
+        np.testing.assert_array_equal(bands.count[seen], 10)
+
+    def test_dispersion_matches_per_shot_results(self):
+        mc = MonteCarloSimulator(chunk_size=64, seed=3)
+        result = mc.run(Normal(20.0, 0.5), Normal(45.0, 1.0), Uniform(0.0, 0.04), shots=300)
+
+        # Replay the same draws through the batch simulator
+        rng = np.random.default_rng(3)
+        landing = []
+        for n in (64, 64, 64, 64, 44):
+            v0 = rng.normal(20.0, 0.5, n)
+            theta = rng.normal(45.0, 1.0, n)
+            k = rng.uniform(0.0, 0.04, n)
+            batch = BatchSimulator().simulate_projectile_motion_batch(v0, theta, air_resistance_coeff=k)
+            landing.append(batch.x[np.arange(n), batch.lengths - 1])
+        landing = np.concatenate(landing)
+
+        stats = result.stats['landing_x']
+        self.assertAlmostEqual(stats.mean, landing.mean())
+        self.assertAlmostEqual(stats.std, landing.std(ddof=1))
+        self.assertEqual(result.histograms['landing_x'].counts.sum(), 300)
+
+    def test_rejects_single_band_point(self):
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator(band_points=1)
+
+    def test_running_stats_merge(self):
+        values = np.random.default_rng(0).normal(5.0, 2.0, 1000)
+        stats = RunningStats()
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance, values.var(ddof=1))
+        self.assertEqual((stats.min, stats.max), (values.min(), values.max()))
+
+    def test_histogram_quantiles_and_overflow(self):
+        histogram = StreamingHistogram(bins=100)
+        histogram.update(np.linspace(0.0, 1.0, 1001))
+        histogram.update([5.0])
+        self.assertEqual(histogram.overflow, 1)
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.5, places=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
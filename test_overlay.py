@@ -0,0 +1,76 @@
+import unittest
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from closed_form import DragFreeSolution
+from kinematics_core import make_params
+from overlay import TrajectoryOverlay
+
+
+class TestTrajectoryOverlay(unittest.TestCase):
+    def setUp(self):
+        fig = Figure()
+        self.canvas = FigureCanvasAgg(fig)
+        self.ax = fig.add_subplot()
+        self.overlay = TrajectoryOverlay(self.ax, budget=50)
+        self.overlay.attach()
+        for theta in (30.0, 45.0, 60.0):
+            params = make_params(theta=theta)
+            trajectory = DragFreeSolution(20.0, theta).trajectory(num_points=500)
+            self.overlay.add(params, trajectory)
+        self.overlay.refresh()
+
+    def test_one_collection_coloured_by_parameter(self):
+        self.assertEqual(len(self.ax.collections), 1)
+        self.assertEqual(len(self.overlay.collection.get_segments()), 3)
+        self.assertEqual(list(self.overlay.collection.get_array()), [30.0, 45.0, 60.0])
+        # Runs are decimated to the vertex budget
+        self.assertTrue(all(len(s) <= 50 for s in self.overlay.collection.get_segments()))
+        self.canvas.draw()
+
+    def test_toggle_keeps_colour_scale(self):
+        self.overlay.toggle(2)
+        self.overlay.refresh()
+        self.assertEqual(list(self.overlay.collection.get_array()), [30.0, 45.0])
+        self.assertEqual((self.overlay.norm.vmin, self.overlay.norm.vmax), (30.0, 60.0))
+
+        self.overlay.set_color_by('v0')
+        self.overlay.refresh()
+        self.assertEqual(list(self.overlay.collection.get_array()), [20.0, 20.0])
+
+    def test_highlight(self):
+        self.overlay.highlight(1)
+        x, y = self.overlay.highlight_line.get_data()
+        self.assertGreater(len(x), 0)
+        self.assertAlmostEqual(max(y), DragFreeSolution(20.0, 45.0).max_height, places=3)
+        # Hiding the highlighted run drops the highlight
+        self.overlay.set_visible(1, False)
+        self.overlay.refresh()
+        self.assertIsNone(self.overlay.highlighted)
+        self.assertEqual(len(self.overlay.highlight_line.get_xdata()), 0)
+
+    def test_view_redecimates_visible_range(self):
+        self.overlay.fit_view()
+        self.ax.set_xlim(10.0, 12.0)
+        self.overlay.update_view()
+        for segment in self.overlay.collection.get_segments():
+            inside = segment[(segment[:, 0] >= 10.0) & (segment[:, 0] <= 12.0)]
+            self.assertGreater(len(inside), 5)
+
+    def test_find_by_key(self):
+        trajectory = DragFreeSolution(20.0, 10.0).trajectory(num_points=50)
+        index = self.overlay.add(make_params(theta=10.0), trajectory, key="k")
+        self.assertEqual(self.overlay.find("k"), index)
+        self.assertIsNone(self.overlay.find("other"))
+        self.assertIsNone(self.overlay.find(None))
+
+    def test_clear(self):
+        self.overlay.highlight(0)
+        self.overlay.clear()
+        self.assertEqual(len(self.overlay), 0)
+        self.assertEqual(len(self.overlay.collection.get_segments()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
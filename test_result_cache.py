@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from adaptive_integrator import AdaptiveSimulator
+from result_cache import SimulationCache, simulation_key, trajectory_nbytes
+from trajectory import Trajectory
+
+
+def make_trajectory(n):
+    t = np.arange(n) * 0.01
+    return Trajectory(t, t * 2.0, t * (1.0 - t))
+
+
+class TestSimulationCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = SimulationCache()
+        key = simulation_key(20, 45, 0, 0, 0.1, 9.81, 0.01, "Fixed Step")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return make_trajectory(100)
+
+        first = cache.get_or_compute(key, compute)
+        second = cache.get_or_compute(key, compute)
+
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(first.x.flags.writeable)
+
+    def test_key_normalizes_numeric_types(self):
+        self.assertEqual(
+            simulation_key(20, 45, 0, 0, 0, 9.81, 0.01, "a"),
+            simulation_key(20.0, np.float64(45), 0.0, 0.0, 0.0, 9.81, 0.01, "a"),
+        )
+
+    def test_lru_eviction_by_count(self):
+        cache = SimulationCache(max_entries=2)
+        for i in range(3):
+            cache.put(("run", i), make_trajectory(10))
+        cache.get(("run", 1))
+        cache.put(("run", 3), make_trajectory(10))
+
+        self.assertNotIn(("run", 0), cache)
+        self.assertNotIn(("run", 2), cache)
+        self.assertIn(("run", 1), cache)
+        self.assertEqual(cache.evictions, 2)
+
+    def test_eviction_by_memory(self):
+        size = trajectory_nbytes(make_trajectory(1000))
+        cache = SimulationCache(max_bytes=int(2.5 * size))
+        for i in range(4):
+            cache.put(i, make_trajectory(1000))
+
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+    def test_disk_persistence(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        key = simulation_key(25, 60, 0, 0, 0.1, 9.81, 0.01, "Adaptive (RK45)")
+        result = AdaptiveSimulator(air_resistance_coeff=0.1).simulate_projectile_motion_adaptive(25, 60)
+        SimulationCache(cache_dir=cache_dir).put(key, result)
+
+        fresh = SimulationCache(cache_dir=cache_dir)
+        loaded = fresh.get(key)
+
+        self.assertEqual(fresh.disk_hits, 1)
+        np.testing.assert_array_equal(loaded.y, result.y)
+        self.assertEqual(loaded.steps, result.steps)
+        self.assertIsNone(fresh.get(("missing",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+
+import run_store
+import storage
+from closed_form import DragFreeSolution
+from kinematics_core import compute_trajectory, make_params
+from run_store import RunStore, main, parse_conditions
+from terrain import Terrain
+from trajectory import Trajectory
+
+
+def simulation(**values):
+    params = make_params(**values)
+    return {'params': params, 'trajectory': compute_trajectory(params)}
+
+
+class TestRunStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.store = RunStore(self.path("runs.sqlite"))
+        self.addCleanup(self.store.close)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_round_trip(self):
+        run = simulation(v0=30, theta=50, air_resistance=0.1)
+        run_id, added = self.store.add(run, label="first")
+        self.assertTrue(added)
+
+        stored = self.store.get(run_id)
+        self.assertEqual(stored['params'], run['params'])
+        self.assertEqual(stored['label'], "first")
+        np.testing.assert_array_equal(stored['trajectory'].y, run['trajectory'].y)
+        with self.assertRaises(KeyError):
+            self.store.get(run_id + 1)
+
+    def test_identical_runs_are_stored_once(self):
+        run = simulation(theta=30)
+        first, _ = self.store.add(run)
+        again, added = self.store.add(simulation(theta=30))
+        self.assertFalse(added)
+        self.assertEqual(again, first)
+        self.assertEqual(len(self.store), 1)
+
+        _, added = self.store.add(simulation(theta=30, gravity=9.8))
+        self.assertTrue(added)
+        self.assertEqual(len(self.store), 2)
+
+    def test_range_queries(self):
+        runs = [
+            simulation(theta=theta, air_resistance=drag)
+            for theta in (30, 40, 45, 50, 60) for drag in (0.0, 0.05, 0.1)
+        ]
+        self.store.add_many(runs)
+
+        matches = self.store.query(theta=(40, 50), drag__gt=0.05)
+        self.assertEqual(
+            [(run['params']['theta'], run['params']['air_resistance']) for run in matches],
+            [(40, 0.1), (45, 0.1), (50, 0.1)]
+        )
+        self.assertEqual(self.store.count(theta__ge=40, theta__le=50), 9)
+        self.assertEqual(self.store.count(theta=(None, 40)), 6)
+        self.assertEqual(self.store.count(**parse_conditions("theta>=40 theta<=50 drag>0.05")), 3)
+
+        longest = self.store.query(order_by="-range", limit=1)[0]
+        self.assertEqual(longest['params']['theta'], 45)
+        self.assertEqual(longest['params']['air_resistance'], 0.0)
+        self.assertAlmostEqual(longest['summary']['range'], 20.0 ** 2 / 9.81)
+
+    def test_range_query_uses_an_index(self):
+        plan = self.store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM runs WHERE theta >= 40 AND theta <= 50"
+        ).fetchall()
+        self.assertIn("USING", plan[0][-1])
+        self.assertIn("INDEX", plan[0][-1])
+
+    def test_invalid_filters(self):
+        with self.assertRaises(ValueError):
+            self.store.query(speed__gt=3)
+        with self.assertRaises(ValueError):
+            self.store.query(theta__about=3)
+        with self.assertRaises(ValueError):
+            parse_conditions("theta is big")
+        with self.assertRaises(ValueError):
+            self.store.query(theta__gt=None)
+
+    def test_null_filters(self):
+        self.store.add(simulation(theta=30), label="kept")
+        self.store.add(simulation(theta=40))
+        self.assertEqual([run['params']['theta'] for run in self.store.query(label=None)], [40])
+        self.assertEqual([run['label'] for run in self.store.query(label__ne=None)], ["kept"])
+
+    def test_import_files(self):
+        run = {'params': make_params(v0=15), 'trajectory': DragFreeSolution(15.0, 45.0).trajectory(dt=0.01)}
+        storage.save_simulation(self.path("a.json"), run)
+        storage.save_simulation(self.path("a.ksim"), run)
+        with open(self.path("old.json"), 'w') as f:
+            json.dump({'trajectory': [[0, 0], [1, 1], [2, 0]], 'params': {'v0': 1}}, f)
+        with open(self.path("broken.json"), 'w') as f:
+            f.write("{")
+
+        result = self.store.import_files(
+            [self.path(name) for name in ("a.json", "a.ksim", "old.json", "broken.json")]
+        )
+        self.assertEqual(result['added'], 2)
+        self.assertEqual(result['duplicates'], 1)
+        self.assertEqual([os.path.basename(path) for path, _ in result['errors']], ["broken.json"])
+        self.assertEqual(self.store.query(v0=1)[0]['label'], "old.json")
+
+    def test_terrain_runs(self):
+        hill = Terrain([0.0, 20.0, 60.0], [0.0, 6.0, 2.0])
+        params = make_params(hill, v0=20, theta=45)
+        over_hill = {'params': params, 'trajectory': compute_trajectory(params, terrain=hill),
+                     'terrain': hill}
+        run_id, _ = self.store.add(over_hill)
+        flat_id, added = self.store.add(dict(over_hill, terrain=None))
+        self.assertTrue(added)
+
+        # Drag-free, but summarized from the flight that ended on the hill
+        run = self.store.get(run_id)
+        self.assertEqual(run['summary']['range'], over_hill['trajectory'].range)
+        self.assertLess(run['summary']['range'], 20.0 ** 2 / 9.81)
+        self.assertEqual(run['terrain'].digest, hill.digest)
+        self.assertIsNone(self.store.get(flat_id)['terrain'])
+        self.assertEqual([run['id'] for run in self.store.query(terrain=None)], [flat_id])
+        self.assertEqual(self.store.query(terrain=hill.digest)[0]['id'], run_id)
+
+    def test_opens_version_1_store(self):
+        path = self.path("old.sqlite")
+        connection = sqlite3.connect(path)
+        connection.executescript(run_store._SCHEMA.replace("terrain TEXT,", ""))
+        connection.execute("PRAGMA user_version = 1")
+        connection.close()
+        with RunStore(path) as store:
+            store.add(simulation(theta=30))
+            self.assertEqual(store.query(terrain=None)[0]['params']['theta'], 30)
+
+    def test_cli(self):
+        self.store.add({'params': make_params(theta=45), 'trajectory': Trajectory([0, 1], [0, 1], [0, 0])})
+        self.store.add(simulation(theta=30))
+        self.store.close()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main([self.path("runs.sqlite"), "query", "theta>40", "--count"]), 0)
+        self.assertEqual(output.getvalue().strip(), "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
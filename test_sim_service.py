@@ -0,0 +1,120 @@
+import asyncio
+import json
+import unittest
+import urllib.request
+
+from kinematics_core import compute_summary, compute_trajectory, make_params
+from sim_service import SimulationService
+
+
+async def fetch(port, method, path, payload=None, body=None):
+    """Send one request and return ``(status, decoded JSON)``."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if body is None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, content = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+
+class TestSimulationService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = SimulationService(batch_window=0.05)
+        await self.service.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+
+    async def simulate(self, payload):
+        return await fetch(self.service.port, "POST", "/simulate", payload)
+
+    async def test_concurrent_requests_share_a_batch(self):
+        launches = [{'v0': 20 + i, 'theta': 30 + i, 'air_resistance': 0.05} for i in range(20)]
+        responses = await asyncio.gather(*map(self.simulate, launches))
+
+        self.assertEqual(self.service.metrics.batches, 1)
+        self.assertEqual(self.service.metrics.largest_batch, 20)
+        for launch, (status, result) in zip(launches, responses):
+            self.assertEqual(status, 200)
+            expected = compute_summary(make_params(**launch))
+            for key in ('max_height', 'range', 'time_of_flight', 'impact_speed'):
+                self.assertAlmostEqual(result['summary'][key], expected[key], places=9)
+
+    async def test_identical_requests_are_coalesced_then_cached(self):
+        launch = {'theta': 60, 'air_resistance': 0.1}
+        first, second = await asyncio.gather(self.simulate(launch), self.simulate(launch))
+        self.assertEqual(first, second)
+        metrics = self.service.metrics
+        self.assertEqual((metrics.simulated, metrics.coalesced), (1, 1))
+
+        _, third = await self.simulate(launch)
+        self.assertEqual(third, first[1])
+        self.assertEqual((metrics.simulated, metrics.cache_hits), (1, 1))
+
+    async def test_trajectories_and_multiple_runs(self):
+        status, data = await self.simulate({'runs': [
+            {'theta': 30},
+            {'theta': 50, 'air_resistance': 0.05, 'dt': 0.005, 'trajectory': True},
+        ]})
+        self.assertEqual(status, 200)
+        first, second = data['results']
+        self.assertNotIn('trajectory', first)
+        self.assertAlmostEqual(first['summary']['range'], 400 * 0.8660254037844386 / 9.81)
+        expected = compute_trajectory(make_params(theta=50, air_resistance=0.05, dt=0.005))
+        self.assertEqual(second['trajectory']['x'], expected.x.tolist())
+
+    async def test_errors(self):
+        port = self.service.port
+        self.assertEqual((await self.simulate({'theta': 95}))[0], 400)
+        self.assertEqual((await fetch(port, "POST", "/simulate", body=b"{"))[0], 400)
+        self.assertEqual((await self.simulate({'runs': 3}))[0], 400)
+        self.assertEqual((await fetch(port, "GET", "/simulate"))[0], 405)
+        self.assertEqual((await fetch(port, "GET", "/nowhere"))[0], 404)
+        self.assertEqual((await self.simulate({'v0': 20, 'speed': 3}))[0], 400)
+        for value in ("nan", "inf", float("nan")):
+            status, data = await self.simulate({'v0': value})
+            self.assertEqual(status, 400)
+            self.assertIn("finite", data['error'])
+        self.assertEqual(self.service.metrics.errors, 9)
+
+    async def test_malformed_content_length(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.service.port)
+        writer.write(b"POST /simulate HTTP/1.1\r\nContent-Length: ten\r\n\r\n{}")
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        head, _, content = data.partition(b"\r\n\r\n")
+        self.assertEqual(int(head.split()[1]), 400)
+        self.assertEqual(json.loads(content), {"error": "Invalid Content-Length"})
+
+    async def test_metrics(self):
+        await self.simulate({'v0': 30})
+        status, metrics = await fetch(self.service.port, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics['requests'], 1)
+        self.assertEqual(metrics['latency_ms']['samples'], 1)
+        self.assertGreater(metrics['throughput']['requests_per_s'], 0)
+        self.assertEqual(metrics['batching']['runs'], 1)
+        self.assertEqual(metrics['cache']['summaries'], 1)
+
+    async def test_standard_http_client(self):
+        def post():
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{self.service.port}/simulate",
+                data=json.dumps({'theta': 45}).encode(), method="POST"
+            )
+            with urllib.request.urlopen(request) as response:
+                return json.load(response)
+
+        result = await asyncio.get_running_loop().run_in_executor(None, post)
+        self.assertAlmostEqual(result['summary']['range'], 400 / 9.81)
+
+
+if __name__ == "__main__":
+    unittest.main()
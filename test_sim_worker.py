@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+from sim_worker import SimulationWorker
+
+
+class TestSimulationWorker(unittest.TestCase):
+    def setUp(self):
+        self.worker = SimulationWorker()
+        self.results = []
+        self.errors = []
+        self.progress = []
+
+    def submit(self, work):
+        return self.worker.submit(
+            work, self.results.append, self.errors.append, self.progress.append
+        )
+
+    def test_result_is_delivered_on_poll(self):
+        self.submit(lambda job: 42)
+        self.worker._thread.join()
+        self.assertEqual(self.results, [])  # nothing happens until polled
+        self.worker.poll()
+        self.assertEqual(self.results, [42])
+        self.assertFalse(self.worker.busy)
+
+    def test_progress_and_errors(self):
+        def work(job):
+            for i in range(3):
+                job.report(i + 1, 3)
+            raise ValueError("boom")
+
+        self.submit(work)
+        self.worker.wait()
+        self.assertEqual(self.progress, [1 / 3, 2 / 3, 1.0])
+        self.assertEqual(str(self.errors[0]), "boom")
+        self.assertEqual(self.results, [])
+
+    def test_newer_job_supersedes_older(self):
+        release = threading.Event()
+
+        def slow(job):
+            release.wait()
+            return "old"
+
+        old = self.submit(slow)
+        old_thread = self.worker._thread
+        self.submit(lambda job: "new")
+        self.assertTrue(old.cancelled)
+
+        # The old job finishes after the new one; its result is still dropped
+        self.worker.wait()
+        release.set()
+        old_thread.join()
+        self.worker.poll()
+        self.assertEqual(self.results, ["new"])
+
+    def test_cancel_stops_reporting_job(self):
+        started = threading.Event()
+
+        def work(job):
+            started.set()
+            while True:
+                job.report(0, 1)
+
+        self.submit(work)
+        started.wait()
+        self.worker.cancel()
+        self.assertFalse(self.worker.busy)
+        self.worker.wait()
+        self.assertEqual(self.results, [])
+        self.assertEqual(self.errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
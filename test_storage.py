@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import storage
+from adaptive_integrator import AdaptiveSimulator
+from closed_form import DragFreeSolution
+from terrain import Terrain
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.simulation = {
+            'trajectory': DragFreeSolution(20.0, 45.0).trajectory(dt=0.001),
+            'params': {'v0': 20.0, 'theta': 45.0, 'air_resistance': 0.0, 'dt': 0.001},
+            'note': 'sweep 3',
+        }
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def test_binary_round_trip_is_memory_mapped(self):
+        path = self.path("run.ksim")
+        storage.save_simulation(path, self.simulation)
+        loaded = storage.load_simulation(path)
+
+        trajectory = loaded['trajectory']
+        self.assertIsInstance(trajectory.x.base, np.memmap)
+        self.assertFalse(trajectory.x.flags.writeable)
+        np.testing.assert_array_equal(trajectory.y, self.simulation['trajectory'].y)
+        np.testing.assert_array_equal(trajectory.vy, self.simulation['trajectory'].vy)
+        self.assertEqual(loaded['params'], self.simulation['params'])
+        self.assertEqual(loaded['note'], 'sweep 3')
+
+    def test_binary_is_smaller_than_json(self):
+        storage.save_simulation(self.path("run.ksim"), self.simulation)
+        storage.save_simulation(self.path("run.json"), self.simulation)
+        self.assertLess(
+            os.path.getsize(self.path("run.ksim")), os.path.getsize(self.path("run.json"))
+        )
+
+    def test_adaptive_statistics_survive(self):
+        result = AdaptiveSimulator(air_resistance_coeff=0.1).simulate_projectile_motion_adaptive(25, 60)
+        storage.write_trajectory(self.path("adaptive.ksim"), result)
+        loaded, meta = storage.read_trajectory(self.path("adaptive.ksim"), mmap=False)
+
+        self.assertEqual(loaded.steps, result.steps)
+        self.assertEqual(loaded.error_estimate, result.error_estimate)
+        self.assertEqual(meta, {})
+
+    def test_encoded_bytes_match_file(self):
+        path = self.path("run.ksim")
+        storage.write_trajectory(path, self.simulation['trajectory'], {'note': 'x'})
+        data = storage.encode_trajectory(self.simulation['trajectory'], {'note': 'x'})
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+        decoded, meta = storage.decode_trajectory(data)
+        np.testing.assert_array_equal(decoded.vx, self.simulation['trajectory'].vx)
+        self.assertEqual(meta, {'note': 'x'})
+
+    def test_convert_both_ways(self):
+        storage.save_simulation(self.path("run.ksim"), self.simulation)
+        storage.convert(self.path("run.ksim"), self.path("run.json"))
+        storage.convert(self.path("run.json"), self.path("again.ksim"))
+
+        with open(self.path("run.json")) as f:
+            self.assertEqual(json.load(f)['note'], 'sweep 3')
+        again = storage.load_simulation(self.path("again.ksim"))
+        np.testing.assert_array_equal(again['trajectory'].t, self.simulation['trajectory'].t)
+        np.testing.assert_array_equal(again['trajectory'].vx, self.simulation['trajectory'].vx)
+        np.testing.assert_array_equal(again['trajectory'].vy, self.simulation['trajectory'].vy)
+
+    def test_convert_keeps_adaptive_statistics(self):
+        result = AdaptiveSimulator(air_resistance_coeff=0.1).simulate_projectile_motion_adaptive(25, 60)
+        storage.save_simulation(self.path("run.ksim"), {'trajectory': result, 'params': {}})
+        storage.convert(self.path("run.ksim"), self.path("run.json"))
+        storage.convert(self.path("run.json"), self.path("again.ksim"))
+
+        for name in ("run.json", "again.ksim"):
+            loaded = storage.load_simulation(self.path(name))['trajectory']
+            self.assertEqual(loaded.steps, result.steps)
+            self.assertEqual(loaded.rejected, result.rejected)
+            self.assertEqual(loaded.error_estimate, result.error_estimate)
+            np.testing.assert_array_equal(loaded.vx, result.vx)
+
+    def test_terrain_profile_survives(self):
+        terrain = Terrain([0.0, 10.0, 25.0], [1.0, 3.5, -2.0])
+        self.simulation['terrain'] = terrain
+        storage.save_simulation(self.path("run.ksim"), self.simulation)
+        storage.convert(self.path("run.ksim"), self.path("run.json"))
+
+        for name in ("run.ksim", "run.json"):
+            loaded = storage.load_simulation(self.path(name))['terrain']
+            self.assertIsInstance(loaded, Terrain)
+            self.assertEqual(loaded.digest, terrain.digest)
+        self.simulation['terrain'] = None
+        storage.save_simulation(self.path("flat.json"), self.simulation)
+        self.assertIsNone(storage.load_simulation(self.path("flat.json"))['terrain'])
+
+    def test_legacy_json_without_times(self):
+        with open(self.path("old.json"), 'w') as f:
+            json.dump({'trajectory': [[0, 0], [1, 1], [2, 0]], 'params': {'v0': 1}}, f)
+        loaded = storage.load_simulation(self.path("old.json"), dt=0.5)
+        np.testing.assert_array_equal(loaded['trajectory'].t, [0.0, 0.5, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+from sweep import SweepExecutor, parameter_grid
+
+
+class TestSweepExecutor(unittest.TestCase):
+    def setUp(self):
+        self.grid = parameter_grid(
+            v0=np.linspace(10, 40, 6), theta=[20, 45, 70], air_resistance=[0.0, 0.05], gravity=[9.81, 3.71]
+        )
+        self.reference = BatchSimulator().simulate_projectile_motion_batch(
+            self.grid['v0'], self.grid['theta'], self.grid['x0'], self.grid['y0'],
+            air_resistance_coeff=self.grid['air_resistance'], gravity=self.grid['gravity']
+        )
+
+    def test_grid_order(self):
+        self.assertEqual(len(self.grid['v0']), 6 * 3 * 2 * 2)
+        self.assertEqual(self.grid['theta'][:4].tolist(), [20, 20, 20, 20])
+        self.assertEqual(self.grid['gravity'][:2].tolist(), [9.81, 3.71])
+
+    def test_pool_matches_single_batch_in_grid_order(self):
+        result = SweepExecutor(processes=2, chunk_size=7).run(self.grid)
+
+        self.assertTrue(result.completed.all())
+        self.assertFalse(result.cancelled)
+        np.testing.assert_array_equal(result.points, self.reference.lengths)
+        np.testing.assert_allclose(result.max_height, np.nanmax(self.reference.y, axis=1))
+        np.testing.assert_allclose(result.time_of_flight, self.reference.time_of_flight)
+        last = self.reference.lengths - 1
+        np.testing.assert_allclose(result.landing_x, self.reference.x[np.arange(len(last)), last])
+
+    def test_rejects_launch_below_ground(self):
+        grid = parameter_grid(20.0, 45.0, y0=[-1.0, -2.0])
+        with self.assertRaises(ValueError):
+            SweepExecutor(processes=1).run(grid)
+
+    def test_stored_trajectories(self):
+        result = SweepExecutor(processes=2, chunk_size=10).run(self.grid, store_trajectories=True)
+        self.assertFalse(result.truncated.any())
+        n = result.points[5]
+        np.testing.assert_array_equal(result.y[5, :n], self.reference.y[5, :n])
+
+        short = SweepExecutor(processes=1).run(self.grid, store_trajectories=True, max_points=20)
+        self.assertEqual(short.x.shape, (len(self.grid['v0']), 20))
+        self.assertTrue(short.truncated.all())
+
+    def test_progress_and_cancellation(self):
+        reports = []
+        SweepExecutor(processes=1, chunk_size=10).run(
+            self.grid, progress=lambda done, total: reports.append((done, total))
+        )
+        self.assertEqual(reports[-1], (72, 72))
+        self.assertEqual(len(reports), 8)
+
+        cancel = threading.Event()
+
+        def stop_after_first_chunk(done, total):
+            cancel.set()
+
+        result = SweepExecutor(processes=1, chunk_size=10).run(
+            self.grid, progress=stop_after_first_chunk, cancel=cancel
+        )
+        self.assertTrue(result.cancelled)
+        self.assertEqual(result.completed.sum(), 10)
+        self.assertTrue(np.isnan(result.range[~result.completed]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from flight_summary import closed_form_summary, fixed_step_summary
+from kinematics_core import cache_key, compute_trajectory, make_params, summarize
+from terrain import Terrain, read_profile, simulate_over_terrain
+
+
+def brute_force_impact(terrain, x, y):
+    """First ``(i, s)`` where the path goes below ground, from dense resampling."""
+    for i in range(len(x) - 1):
+        s = np.linspace(0, 1, 2001)
+        px, py = x[i] + s * (x[i + 1] - x[i]), y[i] + s * (y[i + 1] - y[i])
+        below = np.flatnonzero(py < terrain.height(px) - 1e-9)
+        if len(below):
+            return i, s[below[0]]
+    return None
+
+
+class TestTerrain(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.terrain = Terrain(np.cumsum(rng.uniform(0.2, 1.0, 300)), rng.normal(0, 2, 300))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            Terrain([0.0], [1.0])
+        with self.assertRaises(ValueError):
+            Terrain([0.0, 2.0, 1.0], [0.0, 0.0, 0.0])
+        with self.assertRaises(ValueError):
+            Terrain([0.0, 1.0], [0.0, np.nan])
+        with self.assertRaises(ValueError):
+            Terrain.from_heightmap([1.0, 2.0], spacing=0)
+
+    def test_max_height_between(self):
+        terrain = self.terrain
+        for lo, hi in ((-5, 3), (10, 10.1), (40, 200), (0, 1000)):
+            inside = (terrain.x >= lo) & (terrain.x <= hi)
+            expected = max([terrain.height(lo), terrain.height(hi)] + terrain.heights[inside].tolist())
+            self.assertAlmostEqual(terrain.max_height_between(lo, hi), float(expected))
+
+    def test_impact_along_matches_brute_force(self):
+        rng = np.random.default_rng(4)
+        for _ in range(20):
+            x = np.sort(rng.uniform(-10, self.terrain.x[-1] + 10, 40))
+            if rng.random() < 0.3:
+                x = x[::-1]
+            y = rng.uniform(-4, 8, 40)
+            y[0] = self.terrain.height(x[0]) + 1
+            hit = self.terrain.impact_along(x, y)
+            expected = brute_force_impact(self.terrain, x, y)
+            if expected is None:
+                self.assertIsNone(hit)
+                continue
+            i, s, hit_x, hit_y, _ = hit
+            self.assertEqual(i, expected[0])
+            self.assertLessEqual(s, expected[1] + 1e-9)
+            self.assertGreaterEqual(s, expected[1] - 1e-3)
+            self.assertAlmostEqual(hit_y, float(self.terrain.height(hit_x)), places=9)
+
+    def test_level_beyond_profile_ends(self):
+        terrain = Terrain([0.0, 10.0], [2.0, 5.0])
+        self.assertEqual(terrain.height(-100.0), 2.0)
+        s, x, y, segment = terrain.first_impact(20.0, 7.0, 30.0, 3.0)
+        self.assertAlmostEqual(x, 25.0)
+        self.assertAlmostEqual(y, 5.0)
+        self.assertEqual(segment, len(terrain) - 1)
+        self.assertIsNone(terrain.first_impact(-20.0, 2.5, -10.0, 2.1))
+
+    def test_flat_terrain_matches_flat_ground_summaries(self):
+        ground = Terrain.flat(0.0, -1e3, 1e3)
+        params = make_params(v0=25, theta=35, y0=2, air_resistance=0.05, dt=0.001)
+        trajectory, impact = simulate_over_terrain(params, ground)
+        expected = fixed_step_summary(25, 35, 0, 2, 0.05, dt=0.001)
+        self.assertAlmostEqual(impact.x, expected.range, places=9)
+        self.assertAlmostEqual(impact.t, expected.time_of_flight, places=9)
+        self.assertEqual(trajectory.x[-1], impact.x)
+
+        # Drag-free flights are sampled from the exact solution
+        params = make_params(v0=25, theta=35, y0=2, dt=0.001)
+        _, impact = simulate_over_terrain(params, ground)
+        expected = closed_form_summary(25, 35, 0, 2)
+        self.assertAlmostEqual(impact.x, expected.range, places=4)
+        self.assertAlmostEqual(impact.t, expected.time_of_flight, places=5)
+
+    def test_flight_ends_at_impact_and_stays_above_ground(self):
+        x = np.linspace(0, 300, 50_001)
+        terrain = Terrain(x, 20 * np.sin(x / 30) + 0.05 * np.sin(x * 7))
+        params = make_params(terrain, v0=40, theta=60, y0=float(terrain.height(0.0)),
+                             air_resistance=0.01)
+        trajectory, impact = simulate_over_terrain(params, terrain)
+        # A launch from the surface does not stop at once
+        self.assertGreater(len(trajectory), 100)
+        self.assertTrue(np.all(trajectory.y[:-1] >= terrain.height(trajectory.x[:-1]) - 1e-9))
+        self.assertAlmostEqual(impact.y, float(terrain.height(impact.x)), places=9)
+        self.assertLess(impact.vy, 0)
+
+        summary = summarize(params, trajectory, terrain)
+        self.assertEqual(summary['impact_x'], impact.x)
+        self.assertAlmostEqual(summary['impact_speed'], impact.speed)
+
+    def test_params_and_cache_key(self):
+        hill = Terrain([-10.0, 10.0], [-5.0, 5.0])
+        # Below y = 0, but above this ground
+        params = make_params(hill, x0=-6.0, y0=-1.0)
+        with self.assertRaises(ValueError):
+            make_params(hill, y0=-1.0, x0=5.0)
+        with self.assertRaises(ValueError):
+            make_params(y0=-1.0)
+        self.assertNotEqual(cache_key(params, hill), cache_key(params, Terrain.flat(-5.0)))
+        self.assertEqual(cache_key(params, hill), cache_key(params, Terrain([-10.0, 10.0], [-5.0, 5.0])))
+        self.assertEqual(compute_trajectory(params, terrain=hill).y[-1],
+                         simulate_over_terrain(params, hill)[0].y[-1])
+
+    def test_read_profile(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        pairs = os.path.join(tmp_dir, "pairs.csv")
+        with open(pairs, "w") as f:
+            f.write("x,height\n0,1\n2,3\n5,4\n")
+        x, heights = read_profile(pairs)
+        np.testing.assert_array_equal(x, [0, 2, 5])
+        np.testing.assert_array_equal(heights, [1, 3, 4])
+
+        heightmap = os.path.join(tmp_dir, "heights.txt")
+        with open(heightmap, "w") as f:
+            f.write("1.5\n2.5\n2.0\n")
+        x, heights = read_profile(heightmap)
+        self.assertIsNone(x)
+        np.testing.assert_array_equal(Terrain.from_heightmap(heights, 0.5, x0=1).x, [1, 1.5, 2])
+
+        array = os.path.join(tmp_dir, "heights.npy")
+        np.save(array, np.zeros((4, 3)))
+        with self.assertRaises(ValueError):
+            read_profile(array)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from trajectory import Trajectory
+
+
+class TestTrajectory(unittest.TestCase):
+    def setUp(self):
+        self.points = [(0.0, 0.0), (1.0, 2.0), (2.0, 3.0), (3.0, 2.5), (4.0, 0.5)]
+        self.trajectory = Trajectory.from_points(self.points, 0.1)
+
+    def test_columns_are_contiguous_float64(self):
+        for column in (self.trajectory.t, self.trajectory.x, self.trajectory.y):
+            self.assertEqual(column.dtype, np.float64)
+            self.assertTrue(column.flags['C_CONTIGUOUS'])
+        np.testing.assert_allclose(self.trajectory.t, np.arange(5) * 0.1)
+
+    def test_summary_statistics(self):
+        self.assertEqual(self.trajectory.apex_index, 2)
+        self.assertEqual(self.trajectory.apex, (2.0, 3.0))
+        self.assertEqual(self.trajectory.max_height, 3.0)
+        self.assertEqual(self.trajectory.range, 4.0)
+        self.assertAlmostEqual(self.trajectory.time_of_flight, 0.4)
+        self.assertEqual(self.trajectory.landing, (4.0, 0.5))
+
+    def test_list_compatibility(self):
+        self.assertEqual(len(self.trajectory), 5)
+        self.assertEqual(list(self.trajectory), self.points)
+        self.assertEqual(list(self.trajectory[:2]), self.points[:2])
+        self.assertEqual(self.trajectory.to_points(), [list(p) for p in self.points])
+
+    def test_explicit_times_and_validation(self):
+        trajectory = Trajectory.from_points(self.points, None, t=[0, 0.1, 0.15, 0.3, 0.32])
+        self.assertAlmostEqual(trajectory.time_of_flight, 0.32)
+        with self.assertRaises(ValueError):
+            Trajectory([0.0, 1.0], [0.0], [0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class Trajectory:
+    """Columnar trajectory: contiguous float64 ``t``, ``x``, ``y`` arrays.
+
+    Velocities ``vx``/``vy`` are optional. Summary statistics (apex,
+    range, time of flight) are computed once on first access and cached.
+    Iterating yields ``(x, y)`` tuples so code written against the old
+    list-of-tuples representation keeps working.
+    """
+
+    def __init__(self, t, x, y, vx=None, vy=None):
+        self.t = _column(t)
+        self.x = _column(x)
+        self.y = _column(y)
+        self.vx = None if vx is None else _column(vx)
+        self.vy = None if vy is None else _column(vy)
+        if not (len(self.t) == len(self.x) == len(self.y)):
+            raise ValueError("Trajectory columns must have the same length")
+        self._apex_index = None
+
+    @classmethod
+    def from_points(cls, points, dt, t=None):
+        """Build from ``(x, y)`` pairs sampled every ``dt`` seconds, or at times ``t``."""
+        xy = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if t is None:
+            t = np.arange(len(xy)) * dt
+        return cls(t, xy[:, 0], xy[:, 1])
+
+    def __len__(self):
+        return len(self.t)
+
+    def __iter__(self):
+        return zip(self.x.tolist(), self.y.tolist())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Trajectory(
+                self.t[index], self.x[index], self.y[index],
+                None if self.vx is None else self.vx[index],
+                None if self.vy is None else self.vy[index],
+            )
+        return float(self.x[index]), float(self.y[index])
+
+    def points(self):
+        """Return an ``(N, 2)`` array of ``(x, y)`` rows."""
+        return np.column_stack((self.x, self.y))
+
+    def to_points(self):
+        """Return ``[[x, y], ...]`` for the JSON save format."""
+        return self.points().tolist()
+
+    @property
+    def apex_index(self):
+        if self._apex_index is None:
+            self._apex_index = int(np.argmax(self.y))
+        return self._apex_index
+
+    @property
+    def max_height(self):
+        return float(self.y[self.apex_index])
+
+    @property
+    def apex(self):
+        return self[self.apex_index]
+
+    @property
+    def start(self):
+        return self[0]
+
+    @property
+    def landing(self):
+        return self[-1]
+
+    @property
+    def range(self):
+        return float(self.x[-1] - self.x[0])
+
+    @property
+    def time_of_flight(self):
+        return float(self.t[-1] - self.t[0])
+
+
+def _column(values):
+    return np.ascontiguousarray(values, dtype=np.float64)